@@ -0,0 +1,414 @@
+# Utils
+from decimal import Decimal
+import struct
+
+# Typing
+from typing import Callable, Optional
+
+from .QueryStringLimits import QueryStringLimits, QueryStringLimitError
+
+class BinaryPayload:
+    """
+    A compact, self-describing binary encoding for the values of base64 encoded query strings, used instead of
+    JSON by `QueryStringManager.generate_base64_query_string()` with `binary=True`. It holds the same values as
+    the JSON payload, with integers as varints, strings and containers prefixed with their length and decimals
+    stored exactly as their digits and exponent.
+
+    A payload starts with a table of the dictionary keys that appear more than once (a varint count followed by
+    each key as a varint length and UTF-8 bytes), so a repeated key is stored once. The value follows, as a tag
+    byte and its data:
+
+    - 0x00, 0x01, 0x02 - null, false and true
+    - 0x03, 0x04 - A non-negative integer n, or a negative integer -n - 1, as a varint
+    - 0x05 - A decimal: its exponent as a zigzag varint, then its coefficient shifted left by one, with the sign in
+    the lowest bit, as a varint
+    - 0x06 - A float as 8 big-endian bytes
+    - 0x07 - A string: a varint length and UTF-8 bytes
+    - 0x08, 0x09 - A list or dictionary: a varint count and the items. Each dictionary item is a key and a value.
+    A key is a varint n, followed by n / 2 bytes of UTF-8 if n is even, or the key at index (n - 1) / 2 of the
+    table if n is odd
+    - 0x20 to 0x3F - A string of up to 31 bytes, followed by the bytes
+    - 0x40 to 0x4F, 0x50 to 0x5F - A list or dictionary of up to 15 items, followed by the items
+    - 0x80 to 0xFF - An integer from 0 to 127
+
+    Varints are little-endian base 128, with the high bit of each byte set if another byte follows
+    """
+
+    NULL, FALSE, TRUE, INT, NEGATIVE_INT, DECIMAL, FLOAT, STRING, LIST, DICT = range(10)
+    SHORT_STRING, SHORT_LIST, SHORT_DICT, SMALL_INT = 0x20, 0x40, 0x50, 0x80
+
+    # The largest varint decoded, in bits. This is about 4300 decimal digits, the most `int()` converts from text
+    MAX_VARINT_BITS = 14336
+
+    _FLOAT = struct.Struct(">d")
+
+    @classmethod
+    def dumps(cls, value, key_table:bool=True) -> bytes:
+        """
+        Encode a value. Like JSON, tuples are encoded as lists, and dictionary keys that are integers, floats,
+        booleans or None are converted to the strings JSON would use. Other values are converted with `float()`
+
+        Arguments:
+            value -- The value to encode
+
+        Keyword Arguments:
+            key_table {bool} -- If dictionary keys that appear more than once should be stored once in the key
+            table (default: {True})
+
+        Raises:
+            TypeError: If the value cannot be encoded
+
+        Returns:
+            bytes -- The encoded payload
+        """
+
+        # Keys are numbered from the most to the least frequent, so the most frequent keys have the shortest index
+        counts = {}
+        if key_table:
+            cls._count_keys(value, counts)
+
+        table = [key for (key, count) in sorted(counts.items(), key=lambda item: -item[1]) if count > 1]
+
+        data = bytearray()
+        cls._write_varint(data, len(table))
+
+        for key in table:
+            encoded = key.encode("UTF-8", "surrogatepass")
+            cls._write_varint(data, len(encoded))
+            data += encoded
+
+        cls._write_value(data, value, {key: index for (index, key) in enumerate(table)})
+        return bytes(data)
+
+
+    @classmethod
+    def loads(cls, data:bytes, parse_float:Callable=Decimal, limits:Optional[QueryStringLimits]=None):
+        """
+        Decode a payload. Floats and decimals are converted like fractional numbers in JSON are
+
+        Arguments:
+            data {bytes} -- The payload
+
+        Keyword Arguments:
+            parse_float {Callable} -- The type to convert floats and decimals to: `decimal.Decimal`, `float` or
+            `str` (default: {Decimal})
+            limits {Optional[QueryStringLimits]} -- The max_depth and max_digits limits are checked as the payload
+            is decoded (default: {None})
+
+        Raises:
+            ValueError: If the data is not a valid payload
+            QueryStringLimitError: If the payload exceeds a limit
+
+        Returns:
+            The decoded value
+        """
+
+        data = bytes(data)
+        size = len(data)
+
+        max_depth = limits.max_depth if limits is not None else None
+        max_digits = limits.max_digits if limits is not None else None
+        max_number = 10 ** max_digits if max_digits is not None else None
+
+        def malformatted(reason:str):
+            return ValueError(f"Cannot decode binary payload. {reason}")
+
+        def read_varint(position:int) -> tuple:
+            result = data[position]
+            position += 1
+
+            if result < 0x80:
+                return result, position
+
+            result &= 0x7F
+            shift = 7
+
+            while True:
+                byte = data[position]
+                position += 1
+                result |= (byte & 0x7F) << shift
+
+                if byte < 0x80:
+                    return result, position
+
+                shift += 7
+                if shift > cls.MAX_VARINT_BITS:
+                    raise malformatted("A number is too large")
+
+        def read_text(position:int, length:int) -> tuple:
+            end = position + length
+            if end > size:
+                raise malformatted("The data is incomplete")
+
+            return data[position:end].decode("UTF-8", "surrogatepass"), end
+
+        def read_number(number:int) -> int:
+            if max_number is not None and number >= max_number:
+                limits.raise_digits()
+
+            return number
+
+        def read_items(position:int, count:int, is_dict:bool, depth:int) -> tuple:
+            if count > size - position:
+                raise malformatted("The data is incomplete")
+
+            if max_depth is not None and depth >= max_depth:
+                raise QueryStringLimitError(f"Cannot decode base64 encoded value. It is nested deeper than the "
+                    f"limit of {max_depth}", "max_depth")
+
+            if not is_dict:
+                items = []
+
+                for _ in range(count):
+                    item, position = read_value(position, depth + 1)
+                    items.append(item)
+
+                return items, position
+
+            items = {}
+
+            for _ in range(count):
+                reference, position = read_varint(position)
+
+                if reference & 1:
+                    key = table[reference >> 1]
+                else:
+                    key, position = read_text(position, reference >> 1)
+
+                items[key], position = read_value(position, depth + 1)
+
+            return items, position
+
+        def read_value(position:int, depth:int) -> tuple:
+            tag = data[position]
+            position += 1
+
+            if tag >= cls.SMALL_INT:
+                return tag - cls.SMALL_INT, position
+
+            if tag >= cls.SHORT_DICT + 16:
+                raise malformatted(f"Unknown tag {tag:#04x}")
+
+            if tag >= cls.SHORT_LIST:
+                return read_items(position, tag & 0x0F, tag >= cls.SHORT_DICT, depth)
+
+            if tag >= cls.SHORT_STRING:
+                return read_text(position, tag - cls.SHORT_STRING)
+
+            if tag <= cls.TRUE:
+                return (None, False, True)[tag], position
+
+            if tag in (cls.STRING, cls.LIST, cls.DICT):
+                length, position = read_varint(position)
+
+                if tag == cls.STRING:
+                    return read_text(position, length)
+
+                return read_items(position, length, tag == cls.DICT, depth)
+
+            if tag in (cls.INT, cls.NEGATIVE_INT):
+                number, position = read_varint(position)
+                number = read_number(number)
+                return (number if tag == cls.INT else -number - 1), position
+
+            if tag == cls.DECIMAL:
+                exponent, position = read_varint(position)
+                coefficient, position = read_varint(position)
+
+                digits = read_number(coefficient >> 1)
+                exponent = exponent >> 1 if not exponent & 1 else -(exponent >> 1) - 1
+                sign = "-" if coefficient & 1 else ""
+
+                # Integral decimals are written in JSON with a fractional part (see `JsonBackend._format_decimal()`),
+                # so they are given one here to decode to the same text in every numeric mode
+                decimal = Decimal(f"{sign}{digits}.0" if exponent == 0 else f"{sign}{digits}E{exponent}")
+
+                return (decimal if parse_float is Decimal else parse_float(str(decimal))), position
+
+            if tag == cls.FLOAT:
+                if position + 8 > size:
+                    raise malformatted("The data is incomplete")
+
+                number = cls._FLOAT.unpack_from(data, position)[0]
+
+                # Finite floats are converted from the text JSON would hold, other floats stay floats like
+                # NaN and Infinity in JSON
+                if number - number == 0:
+                    number = parse_float(repr(number))
+
+                return number, position + 8
+
+            raise malformatted(f"Unknown tag {tag:#04x}")
+
+        try:
+            count, position = read_varint(0)
+
+            if count > size - position:
+                raise malformatted("The data is incomplete")
+
+            table = []
+            for _ in range(count):
+                length, position = read_varint(position)
+                key, position = read_text(position, length)
+                table.append(key)
+
+            value, position = read_value(position, 0)
+        except (IndexError, UnicodeDecodeError):
+            raise malformatted("The data is incomplete or not UTF-8")
+        except RecursionError:
+            raise malformatted("The data is nested too deeply")
+
+        if position != size:
+            raise malformatted("Unexpected data after the value")
+
+        return value
+
+
+    @classmethod
+    def _write_value(cls, data:bytearray, value, table:dict) -> None:
+        """
+        Append the tag and data of a value to a payload
+
+        Arguments:
+            data {bytearray} -- The payload
+            value -- The value to encode
+            table {dict} -- The index of each key in the key table
+
+        Raises:
+            TypeError: If the value cannot be encoded
+        """
+
+        if value is None or value is True or value is False:
+            data.append(cls.NULL if value is None else cls.TRUE if value else cls.FALSE)
+
+        elif isinstance(value, int):
+            if 0 <= value < 0x80:
+                data.append(cls.SMALL_INT + value)
+            elif value >= 0:
+                data.append(cls.INT)
+                cls._write_varint(data, value)
+            else:
+                data.append(cls.NEGATIVE_INT)
+                cls._write_varint(data, -value - 1)
+
+        elif isinstance(value, str):
+            encoded = value.encode("UTF-8", "surrogatepass")
+
+            if len(encoded) < 32:
+                data.append(cls.SHORT_STRING + len(encoded))
+            else:
+                data.append(cls.STRING)
+                cls._write_varint(data, len(encoded))
+
+            data += encoded
+
+        elif isinstance(value, (list, tuple, dict)):
+            if len(value) < 16:
+                data.append((cls.SHORT_DICT if isinstance(value, dict) else cls.SHORT_LIST) + len(value))
+            else:
+                data.append(cls.DICT if isinstance(value, dict) else cls.LIST)
+                cls._write_varint(data, len(value))
+
+            if not isinstance(value, dict):
+                for item in value:
+                    cls._write_value(data, item, table)
+                return
+
+            for (key, item) in value.items():
+                key = cls._get_key(key)
+                index = table.get(key)
+
+                if index is not None:
+                    cls._write_varint(data, index << 1 | 1)
+                else:
+                    encoded = key.encode("UTF-8", "surrogatepass")
+                    cls._write_varint(data, len(encoded) << 1)
+                    data += encoded
+
+                cls._write_value(data, item, table)
+
+        elif isinstance(value, Decimal) and value.is_finite():
+            sign, digits, exponent = value.as_tuple()
+            coefficient = int("".join(map(str, digits)))
+
+            data.append(cls.DECIMAL)
+            cls._write_varint(data, exponent << 1 if exponent >= 0 else (-exponent - 1) << 1 | 1)
+            cls._write_varint(data, coefficient << 1 | sign)
+
+        else:
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+            data.append(cls.FLOAT)
+            data += cls._FLOAT.pack(number)
+
+
+    @classmethod
+    def _count_keys(cls, value, counts:dict) -> None:
+        """
+        Count how many times each dictionary key appears in a value
+
+        Arguments:
+            value -- The value
+            counts {dict} -- The count of each key, updated in place
+        """
+
+        if isinstance(value, dict):
+            for (key, item) in value.items():
+                key = cls._get_key(key)
+                counts[key] = counts.get(key, 0) + 1
+
+                if isinstance(item, (list, tuple, dict)):
+                    cls._count_keys(item, counts)
+
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, (list, tuple, dict)):
+                    cls._count_keys(item, counts)
+
+
+    @staticmethod
+    def _get_key(key) -> str:
+        """
+        Arguments:
+            key -- A dictionary key
+
+        Raises:
+            TypeError: If the key is not a string, integer, float, boolean or None
+
+        Returns:
+            str -- The key as JSON stores it
+        """
+
+        if isinstance(key, str):
+            return key
+
+        if key is None or key is True or key is False:
+            return "null" if key is None else "true" if key else "false"
+
+        if isinstance(key, int):
+            return int.__repr__(key)
+
+        if isinstance(key, float):
+            return float.__repr__(key) if key - key == 0 else "NaN" if key != key else "Infinity" if key > 0 else "-Infinity"
+
+        raise TypeError(f"Keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+    @staticmethod
+    def _write_varint(data:bytearray, number:int) -> None:
+        """
+        Append a non-negative integer to a payload as a varint
+
+        Arguments:
+            data {bytearray} -- The payload
+            number {int} -- The integer
+        """
+
+        while number > 0x7F:
+            data.append(number & 0x7F | 0x80)
+            number >>= 7
+
+        data.append(number)
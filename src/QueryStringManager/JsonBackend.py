@@ -0,0 +1,393 @@
+# Utils
+import json, os, re
+
+# Typing
+from typing import Callable, Iterator, Optional
+from decimal import Decimal
+
+class JsonBackend:
+    """
+    A JSON library used to encode and decode base64 encoded values. Backends are registered by name with a factory
+    that raises `ImportError` if the library is not installed, in order of preference:
+
+    - "orjson" - Encodes compact JSON (no spaces after separators, `NaN` encoded as `null`). orjson cannot decode
+    fractional numbers exactly, so it only decodes documents that have none or that request them as floats. It
+    converts integers over 64 bits to floats, so documents that may hold one (a run of 19 or more digits) are
+    decoded by "json", as are documents orjson rejects (like `NaN`)
+    - "json" - The standard library `json` module
+
+    `decimal.Decimal` values are encoded with their exact digits by every backend, and fractional numbers are decoded
+    to exact `decimal.Decimal` values unless they are requested as floats
+    """
+
+    # Registered backend factories by name, in order of preference
+    _factories = {}
+
+    # Backends that have been loaded by name
+    _backends = {}
+
+    # The backend that encodes canonical JSON, created the first time it is used
+    _canonical = None
+
+    # Maps digits to "0", the characters that follow the digits of a fractional number to "." and other bytes to
+    # a space, so integers over 64 bits (19 digits or more) and fractional numbers, which orjson cannot decode 
+    # exactly, are found with a substring search. Digits in strings also match, which only costs speed
+    _ORJSON_NUMBER_TABLE = bytes(0x30 if byte in b"0123456789" else 0x2e if byte in b".eE" else 0x20 
+        for byte in range(256))
+
+    # Decimals are encoded as a placeholder string that is replaced with their exact digits once the rest of the
+    # value is encoded. The random token keeps the placeholder from matching a string in the value
+    _DECIMAL_TOKEN = f"__decimal_{os.urandom(8).hex()}_"
+    _DECIMAL_PLACEHOLDER = re.compile(f'"{_DECIMAL_TOKEN}(\\d+)"'.encode("UTF-8"))
+
+    def __init__(self, name:str, dumps:Callable, loads:Callable, matches_stdlib:bool=False):
+        """
+        Create a backend from the functions of a JSON library
+
+        Arguments:
+            name {str} -- The name of the backend
+            dumps {Callable} -- Encodes a value to UTF-8 JSON bytes. Called with the value and a `default` function
+            for values the library cannot encode, which returns an encodable value
+            loads {Callable} -- Decodes JSON bytes. Called with the bytes and the type to convert fractional
+            numbers to (`decimal.Decimal`, `float` or `str`)
+
+        Keyword Arguments:
+            matches_stdlib {bool} -- If the backend encodes values to the same bytes as "json". Only these backends
+            are chosen automatically for encoding, so generated query strings do not depend on what is installed
+            (default: {False})
+        """
+
+        self.name = name
+        self.matches_stdlib = matches_stdlib
+        self._dumps = dumps
+        self._loads = loads
+
+        # The separators the library writes between items and after keys, used to join values encoded in parts
+        self._item_separator = self._dumps([0, 0], None)[2:-2]
+        self._key_separator = self._dumps({"": 0}, None)[3:-2]
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+    def dumps(self, value) -> bytes:
+        """
+        Encode a value to JSON. `decimal.Decimal` values are encoded with their exact digits, other values the library
+        cannot encode are converted with `float()`
+
+        Arguments:
+            value -- The value to encode
+
+        Raises:
+            TypeError: If the value cannot be encoded
+
+        Returns:
+            bytes -- The UTF-8 encoded JSON
+        """
+
+        decimals = []
+
+        def default(unknown_value):
+            if isinstance(unknown_value, Decimal) and unknown_value.is_finite():
+                decimals.append(self._format_decimal(unknown_value))
+                return f"{self._DECIMAL_TOKEN}{len(decimals) - 1}"
+
+            return float(unknown_value)
+
+        data = self._dumps(value, default)
+
+        if not decimals:
+            return data
+
+        return self._DECIMAL_PLACEHOLDER.sub(lambda match: decimals[int(match.group(1))], data)
+
+
+    def iterdumps(self, value, batch_size:int=256) -> Iterator[bytes]:
+        """
+        Encode a value to JSON in parts, which joined are the bytes `dumps()` returns. Lists and dictionaries
+        (with string keys) are encoded `batch_size` items at a time, and items that are themselves large lists or
+        dictionaries are encoded in parts, so the whole document is never held in memory
+
+        Arguments:
+            value -- The value to encode
+
+        Keyword Arguments:
+            batch_size {int} -- The number of items encoded at once (default: {256})
+
+        Raises:
+            TypeError: If the value cannot be encoded
+
+        Returns:
+            Iterator[bytes] -- The parts of the UTF-8 encoded JSON
+        """
+
+        if isinstance(value, (list, tuple)):
+            yield b"["
+            yield from self._iterdumps_items(value, False, batch_size)
+            yield b"]"
+
+        elif isinstance(value, dict) and all(type(key) is str for key in value):
+            yield b"{"
+            yield from self._iterdumps_items(value.items(), True, batch_size)
+            yield b"}"
+
+        else:
+            yield self.dumps(value)
+
+
+    def _iterdumps_items(self, items:Iterator, is_dict:bool, batch_size:int) -> Iterator[bytes]:
+        """
+        Encode the items of a list or dictionary in parts for `iterdumps()`, without the surrounding brackets
+
+        Arguments:
+            items {Iterator} -- The list elements, or the (key, value) items of the dictionary
+            is_dict {bool} -- If the items are dictionary items
+            batch_size {int} -- The number of items encoded at once
+
+        Returns:
+            Iterator[bytes] -- The parts of the encoded items
+        """
+
+        batch = []
+        first = True
+
+        for item in items:
+            nested = item[1] if is_dict else item
+            large = isinstance(nested, (list, tuple, dict)) and len(nested) > batch_size
+
+            if not large:
+                batch.append(item)
+
+                if len(batch) < batch_size:
+                    continue
+
+            if batch:
+                # Encode the batch as a whole list or dictionary and remove the brackets
+                encoded = self.dumps(dict(batch) if is_dict else batch)[1:-1]
+                yield encoded if first else self._item_separator + encoded
+
+                first = False
+                batch.clear()
+
+            if large:
+                if not first:
+                    yield self._item_separator
+
+                if is_dict:
+                    yield self.dumps(item[0]) + self._key_separator
+
+                yield from self.iterdumps(nested, batch_size)
+                first = False
+
+        if batch:
+            encoded = self.dumps(dict(batch) if is_dict else batch)[1:-1]
+            yield encoded if first else self._item_separator + encoded
+
+
+    def loads(self, data:bytes, parse_float:Callable=Decimal):
+        """
+        Decode JSON
+
+        Arguments:
+            data {bytes} -- The JSON to decode
+
+        Keyword Arguments:
+            parse_float {Callable} -- The type to convert fractional numbers to: `decimal.Decimal`, `float` or
+            `str` (default: {Decimal})
+
+        Raises:
+            ValueError: If the data is not valid JSON
+
+        Returns:
+            The decoded value
+        """
+
+        return self._loads(data, parse_float)
+
+
+    @classmethod
+    def register(cls, name:str, factory:Callable[[], "JsonBackend"], preferred:bool=True) -> None:
+        """
+        Register a backend. Registering an existing name replaces that backend
+
+        Arguments:
+            name {str} -- The name of the backend
+            factory {Callable} -- Creates the backend, raising `ImportError` if its library is not installed
+
+        Keyword Arguments:
+            preferred {bool} -- If the backend should be preferred over the backends already registered
+            (default: {True})
+        """
+
+        cls._factories.pop(name, None)
+        cls._backends.pop(name, None)
+
+        if preferred:
+            cls._factories = {name: factory, **cls._factories}
+        else:
+            cls._factories[name] = factory
+
+
+    @classmethod
+    def get(cls, name:str) -> "JsonBackend":
+        """
+        Get a registered backend by name
+
+        Arguments:
+            name {str} -- The name of the backend
+
+        Raises:
+            ValueError: If the backend is not registered or its library is not installed
+
+        Returns:
+            JsonBackend -- The backend
+        """
+
+        if name not in cls._factories:
+            raise ValueError(f"Unknown JSON backend {name!r}, expected one of {', '.join(map(repr, cls._factories))}")
+
+        backend = cls._load(name)
+        if backend is None:
+            raise ValueError(f"The library for JSON backend {name!r} is not installed")
+
+        return backend
+
+
+    @classmethod
+    def best(cls, matches_stdlib:bool=False) -> "JsonBackend":
+        """
+        Get the most preferred backend that is installed
+
+        Keyword Arguments:
+            matches_stdlib {bool} -- If only backends that encode to the same bytes as "json" should be considered
+            (default: {False})
+
+        Returns:
+            JsonBackend -- The backend
+        """
+
+        for name in cls._factories:
+            backend = cls._load(name)
+
+            if backend is not None and (backend.matches_stdlib or not matches_stdlib):
+                return backend
+
+        return cls.get("json")
+
+
+    @classmethod
+    def canonical(cls) -> "JsonBackend":
+        """
+        Get the backend that encodes canonical JSON: compact, with the keys of dictionaries sorted and text 
+        encoded as UTF-8 rather than escaped. The bytes do not depend on the libraries installed
+
+        Returns:
+            JsonBackend -- The canonical backend, which decodes like "json"
+        """
+
+        if cls._canonical is None:
+            cls._canonical = cls("canonical",
+                lambda value, default: json.dumps(value, default=default, separators=(",", ":"), sort_keys=True,
+                    ensure_ascii=False).encode("UTF-8"),
+                lambda data, parse_float: json.loads(data, parse_float=parse_float))
+
+        return cls._canonical
+
+
+    @classmethod
+    def available(cls) -> list:
+        """
+        Returns:
+            list -- The names of the registered backends that are installed, in order of preference
+        """
+
+        return [name for name in cls._factories if cls._load(name) is not None]
+
+
+    @classmethod
+    def _load(cls, name:str) -> Optional["JsonBackend"]:
+        """
+        Create a registered backend the first time it is used
+
+        Arguments:
+            name {str} -- The name of the backend
+
+        Returns:
+            Optional[JsonBackend] -- The backend, or None if its library is not installed
+        """
+
+        if name not in cls._backends:
+            try:
+                cls._backends[name] = cls._factories[name]()
+            except ImportError:
+                cls._backends[name] = None
+
+        return cls._backends[name]
+
+
+    @staticmethod
+    def _format_decimal(value:Decimal) -> bytes:
+        """
+        Format a finite decimal as a JSON number with its exact digits. Integral decimals are given a fractional
+        part, so they are decoded as decimals and encode the same as they did when converted to a float
+
+        Arguments:
+            value {Decimal} -- The decimal to format
+
+        Returns:
+            bytes -- The JSON number
+        """
+
+        text = str(value)
+
+        if "." not in text and "E" not in text and "e" not in text:
+            text += ".0"
+
+        return text.encode("UTF-8")
+
+
+    @classmethod
+    def _create_json(cls) -> "JsonBackend":
+        """
+        Returns:
+            JsonBackend -- The standard library `json` backend
+        """
+
+        return cls("json",
+            lambda value, default: json.dumps(value, default=default).encode("UTF-8"),
+            lambda data, parse_float: json.loads(data, parse_float=parse_float),
+            matches_stdlib=True)
+
+
+    @classmethod
+    def _create_orjson(cls) -> "JsonBackend":
+        """
+        Raises:
+            ImportError: If orjson is not installed
+
+        Returns:
+            JsonBackend -- The orjson backend
+        """
+
+        import orjson
+
+        def loads(data:bytes, parse_float:Callable):
+            # orjson only decodes fractional numbers to floats, and large integers inexactly
+            numbers = data.translate(cls._ORJSON_NUMBER_TABLE)
+
+            if b"0" * 19 not in numbers and (parse_float is float or b"0." not in numbers):
+                try:
+                    return orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    pass
+
+            return json.loads(data, parse_float=parse_float)
+
+        return cls("orjson",
+            lambda value, default: orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS),
+            loads)
+
+
+JsonBackend.register("json", JsonBackend._create_json)
+JsonBackend.register("orjson", JsonBackend._create_orjson)
@@ -0,0 +1,131 @@
+# Utils
+from collections.abc import Mapping
+
+# Typing
+from typing import Callable, Iterable, Iterator
+
+# Placeholder for a value that has not been decoded yet
+_PENDING = object()
+
+class LazyDict(Mapping):
+    """
+    A read-only mapping of parsed query string fields that decodes each value the first time it is read.
+    The decoded value is kept, so each value is decoded at most once. Fields that are never read are never 
+    decoded, which also means an invalid value only raises a ValueError when it is read
+    """
+
+    __slots__ = ("_values", "_pending")
+
+    def __init__(self):
+        """
+        Create an empty mapping. Fields are added with `_add()` and `_add_pending()` while parsing
+        """
+
+        self._values = {}
+        self._pending = {}
+
+
+    @classmethod
+    def from_pairs(cls, pairs:Iterable[tuple]) -> "LazyDict":
+        """
+        Create a mapping from fields that are already split. Each field is either a decoded (key, value) pair, or
+        a (key, decoder, raw_value) triple to decode when it is first read. A field replaces any earlier field 
+        with the same name, but keeps its position
+
+        Arguments:
+            pairs {Iterable[tuple]} -- The (key, value) and (key, decoder, raw_value) fields
+
+        Returns:
+            LazyDict -- The mapping of the fields
+        """
+
+        lazy_dict = cls()
+
+        for pair in pairs:
+            if len(pair) == 3:
+                lazy_dict._add_pending(*pair)
+            else:
+                lazy_dict._add(*pair)
+
+        return lazy_dict
+
+
+    def __getitem__(self, key:str):
+        value = self._values[key]
+
+        if value is _PENDING:
+            decoder, raw_value = self._pending[key]
+            value = self._values[key] = decoder(raw_value)
+            self._pending.pop(key, None)
+
+        return value
+
+
+    def __contains__(self, key:str) -> bool:
+        # Checking for a field does not decode it
+        return key in self._values
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key!r}: <pending>" if value is _PENDING else f"{key!r}: {value!r}" 
+            for (key, value) in self._values.items())
+        return f"{type(self).__name__}({{{fields}}})"
+
+
+    def is_decoded(self, key:str) -> bool:
+        """
+        Arguments:
+            key {str} -- The field name
+
+        Raises:
+            KeyError: If the field is not in the mapping
+
+        Returns:
+            bool -- If the value of the field has been decoded
+        """
+
+        return self._values[key] is not _PENDING
+
+
+    def pending_fields(self) -> dict:
+        """
+        Returns:
+            dict -- The (decoder, raw_value) of each field that has not been decoded, by name
+        """
+
+        return dict(self._pending)
+
+
+    def _add(self, key:str, value) -> None:
+        """
+        Add a field that is already decoded, replacing any field with the same name
+
+        Arguments:
+            key {str} -- The field name
+            value -- The decoded value
+        """
+
+        self._values[key] = value
+        self._pending.pop(key, None)
+
+
+    def _add_pending(self, key:str, decoder:Callable, raw_value:str) -> None:
+        """
+        Add a field to decode when it is first read, replacing any field with the same name
+
+        Arguments:
+            key {str} -- The field name
+            decoder {Callable} -- The function to decode the raw value with
+            raw_value {str} -- The raw value from the query string
+        """
+
+        self._values[key] = _PENDING
+        self._pending[key] = (decoder, raw_value)
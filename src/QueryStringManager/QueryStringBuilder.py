@@ -0,0 +1,195 @@
+# Typing
+from typing import Iterator, Optional, Union
+from decimal import Decimal
+
+from .QueryStringManager import QueryStringManager
+from .QuoteTable import QuoteTable
+
+class QueryStringBuilder:
+    """
+    A mutable query string that holds the encoded "key=value" segment of each field. Setting or deleting a field
+    only encodes that field, so changing one parameter of a query string carrying large base64 encoded values does
+    not re-encode the others. Rendering joins the segments
+    """
+
+    # Types that are encoded in standard format when no format is passed to `set()`
+    STANDARD_TYPES = QueryStringManager.STANDARD_TYPES
+
+    def __init__(self, params:dict=None, safe_chars:str=None):
+        """
+        Create a builder
+
+        Keyword Arguments:
+            params {dict} -- Fields to set, see `set()` (default: {None})
+            safe_chars {str} -- An optional string of characters to not replace in standard format fields and
+            the separators between fields. For example "!?@=" (default: {None})
+
+        Raises:
+            ValueError: If a value in params cannot be encoded
+        """
+
+        self.safe_chars = safe_chars or QueryStringManager.URLLIB_SAFE_CHARS
+        self._segments = {}
+
+        # The separator is quoted like it is by `generate_query_string()` for custom safe_chars
+        self._table = QuoteTable.get(self.safe_chars)
+        self._separator = self._table.separator
+        self._rendered = None
+
+        for (key, value) in (params or {}).items():
+            self.set(key, value)
+
+
+    @classmethod
+    def from_query_string(cls, query_string:Union[str, bytes], safe_chars:str=None) -> "QueryStringBuilder":
+        """
+        Create a builder from an existing query string in either format. Only the keys are decoded, the segments
+        of fields that are not changed are rendered as they were passed. If a key is repeated the last field is kept
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string
+
+        Keyword Arguments:
+            safe_chars {str} -- See `__init__()` (default: {None})
+
+        Raises:
+            ValueError: If the query string is malformatted
+
+        Returns:
+            QueryStringBuilder -- The builder
+        """
+
+        if isinstance(query_string, (bytes, bytearray, memoryview)):
+            query_string = bytes(query_string).decode("UTF-8", "replace")
+
+        builder = cls(safe_chars=safe_chars)
+
+        for key_value in QueryStringManager._split_query_string(query_string):
+            key_value = QueryStringManager._strip_detected_field(key_value)
+
+            # The encoding of a field with a key of "=" decides the key
+            if key_value[0:2] == "==":
+                key = QueryStringManager._decode_detected_pair(key_value)[0]
+            else:
+                key = QueryStringManager._split_pair(key_value)[0]
+
+            builder._segments[key] = key_value
+
+        return builder
+
+
+    def __contains__(self, key:str) -> bool:
+        return key in self._segments
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._segments)
+
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+
+    def __str__(self) -> str:
+        return self.render()
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.render()!r})"
+
+
+    def set(self, key:str, value:Union[int, str, bool, float, Decimal, list, dict], base64_encoded:Optional[bool]=None,
+        compress:bool=False) -> "QueryStringBuilder":
+        """
+        Set the value of a field, encoding only that field. A field that already exists keeps its position
+
+        Arguments:
+            key {str} -- The key of the field
+            value {Union[int, str, bool, float, Decimal, list, dict]} -- The value of the field
+
+        Keyword Arguments:
+            base64_encoded {Optional[bool]} -- If the value should be encoded as base64 encoded JSON like
+            `generate_base64_query_string()` or in standard format like `generate_query_string()`. By default values
+            of a `STANDARD_TYPES` type are encoded in standard format (default: {None})
+            compress {bool} -- If a base64 encoded value should be compressed (default: {False})
+
+        Raises:
+            ValueError: If the value cannot be encoded in the format
+
+        Returns:
+            QueryStringBuilder -- The builder, so calls can be chained
+        """
+
+        if base64_encoded is None:
+            base64_encoded = not isinstance(value, self.STANDARD_TYPES)
+
+        if base64_encoded:
+            # Remove the "?" prefix
+            segment = QueryStringManager.generate_base64_query_string(value, key, compress=compress)[1:]
+        elif isinstance(value, self.STANDARD_TYPES):
+            table = self._table
+            segment = table.quote_key(key) + table.equals + table.quote(f"{QueryStringManager._normalize_value(value)}")
+        else:
+            raise ValueError("Cannot encode a standard format field. Passed value is a nested dictionary, a list "
+                "or an datatype that is not (int, float, bool, str)")
+
+        self._segments[key] = segment
+        self._rendered = None
+
+        return self
+
+
+    def delete(self, key:str) -> "QueryStringBuilder":
+        """
+        Delete a field
+
+        Arguments:
+            key {str} -- The key of the field
+
+        Raises:
+            KeyError: If the field does not exist
+
+        Returns:
+            QueryStringBuilder -- The builder, so calls can be chained
+        """
+
+        del self._segments[key]
+        self._rendered = None
+
+        return self
+
+
+    def get(self, key:str, default=None):
+        """
+        Decode the value of a field the way `QueryStringManager.parse()` would
+
+        Arguments:
+            key {str} -- The key of the field
+
+        Keyword Arguments:
+            default -- The value to return if the field does not exist (default: {None})
+
+        Raises:
+            ValueError: If the field cannot be decoded
+
+        Returns:
+            The decoded value
+        """
+
+        segment = self._segments.get(key)
+        if segment is None:
+            return default
+
+        return QueryStringManager._decode_detected_pair(segment)[1]
+
+
+    def render(self) -> str:
+        """
+        Returns:
+            str -- The query string with a "?" prefix, or an empty string if there are no fields
+        """
+
+        if self._rendered is None:
+            self._rendered = "?" + self._separator.join(self._segments.values()) if self._segments else ""
+
+        return self._rendered
@@ -0,0 +1,178 @@
+# Utils
+from collections import OrderedDict
+from threading import Lock
+
+# Typing
+from typing import Callable, Hashable
+
+class FrozenDict(dict):
+    """
+    A read-only dictionary returned for cached results. It can be shared between callers safely
+    and compares equal to a `dict` with the same content. `copy()` returns a mutable `dict` sharing
+    the (also read-only) values, so a cached result can be modified without a deep copy
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Cached query string results are read-only. Use copy() to modify them")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def copy(self) -> dict:
+        """
+        Returns:
+            dict -- A mutable shallow copy of the dictionary
+        """
+
+        return dict(self)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """
+    A read-only list returned for lists nested in cached results. It is a `list`, so type checks on results
+    do not depend on the cache, and compares equal to a `list` with the same content. `copy()` returns a 
+    mutable `list` sharing the (also read-only) values
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Cached query string results are read-only. Use copy() to modify them")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = clear = extend = insert = pop = remove = \
+        reverse = sort = _read_only
+
+    def copy(self) -> list:
+        """
+        Returns:
+            list -- A mutable shallow copy of the list
+        """
+
+        return list(self)
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list.__repr__(self)})"
+
+
+class QueryStringCache:
+    """
+    A bounded, thread safe cache of parsed query strings with least recently used eviction. Results
+    are stored frozen (see `FrozenDict` and `FrozenList`) so the same object can be returned to every caller
+    """
+
+    def __init__(self, max_size:int=1024):
+        """
+        Create an empty cache
+
+        Keyword Arguments:
+            max_size {int} -- The maximum number of results to hold before evicting (default: {1024})
+
+        Raises:
+            ValueError: If the maximum size is not a positive integer
+        """
+
+        if not isinstance(max_size, int) or isinstance(max_size, bool) or max_size < 1:
+            raise ValueError("Cannot create a query string cache. Passed max_size argument is not a positive integer")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+
+    def get_or_parse(self, key:Hashable, parser:Callable, *args) -> FrozenDict:
+        """
+        Get a cached result, or parse and cache it if it is not cached. Errors raised by the parser
+        are not cached
+
+        Arguments:
+            key {Hashable} -- The cache key, which must identify the raw query string and all parsing options
+            parser {Callable} -- The parser to call on a miss
+            *args -- The arguments to call the parser with
+
+        Returns:
+            FrozenDict -- The (shared) parsed result
+        """
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+
+            self.misses += 1
+
+        # Parse outside the lock so slow parses don't block hits
+        result = self.freeze(parser(*args))
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+
+            if len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+        return result
+
+
+    def clear(self) -> None:
+        """
+        Remove all cached results and reset the statistics
+        """
+
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict -- The number of hits, misses and evictions, and the current and maximum size of the cache
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._results),
+                "max_size": self.max_size,
+            }
+
+
+    @classmethod
+    def freeze(cls, value):
+        """
+        Recursively convert dictionaries and lists to their read-only equivalents
+
+        Arguments:
+            value -- The value to freeze
+
+        Returns:
+            The frozen value
+        """
+
+        if isinstance(value, dict):
+            return value if isinstance(value, FrozenDict) else \
+                FrozenDict((key, cls.freeze(item)) for (key, item) in value.items())
+
+        if isinstance(value, list):
+            return value if isinstance(value, FrozenList) else FrozenList(cls.freeze(item) for item in value)
+
+        return value
@@ -0,0 +1,155 @@
+# Utils
+from array import array
+
+# Typing
+from typing import Union
+
+class QueryStringColumn:
+    """
+    The values of a single field across many parsed query strings, as returned by `QueryStringManager.parse_many()`.
+
+    Integer and boolean columns are stored in a compact `array.array` and other columns in a list. The null mask is a
+    `bytearray` holding 1 for each row where the field was missing (the value at that position is a placeholder).
+    A column holds one of the following types:
+
+    - "null" - The field was missing from every row
+    - "int" - `int` values stored in an `array.array` of type "q"
+    - "bool" - `bool` values stored in an `array.array` of type "b"
+    - "float" - `float` values stored in an `array.array` of type "d" (only with the "float" numeric mode)
+    - "decimal" - `decimal.Decimal` values stored in a list
+    - "str" - `str` values stored in a list
+    - "object" - Values of mixed types (including base64 decoded data) stored in a list
+    """
+
+    # Types stored in an `array.array`, mapped to the array type code
+    ARRAY_TYPES = {"int": "q", "bool": "b", "float": "d"}
+
+    def __init__(self, name:str, rows:int=0):
+        """
+        Create a column of missing values
+
+        Arguments:
+            name {str} -- The name of the field
+
+        Keyword Arguments:
+            rows {int} -- The number of (missing) rows to start with (default: {0})
+        """
+
+        self.name = name
+        self.dtype = "null"
+        self.values = [None] * rows
+        self.mask = bytearray(b"\x01" * rows)
+
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, dtype={self.dtype!r}, rows={len(self)})"
+
+
+    def extend(self, dtype:str, values:Union[array, list], mask:bytearray) -> None:
+        """
+        Append a chunk of rows to the column. If the type of the chunk differs from the column the column
+        is converted to an "object" column
+
+        Arguments:
+            dtype {str} -- The type of the chunk
+            values {Union[array, list]} -- The values of the chunk, stored for its type
+            mask {bytearray} -- The null mask of the chunk
+        """
+
+        if dtype != self.dtype and dtype != "null":
+            if self.dtype == "null":
+                # The first values seen decide the type of the column
+                self.values = self._placeholders(dtype, len(self))
+                self.dtype = dtype
+            else:
+                # Types differ between chunks, so fall back to Python objects
+                self.values = self._to_objects(self.dtype, self.values)
+                self.dtype = "object"
+
+        if dtype == "null":
+            values = self._placeholders(self.dtype, len(mask))
+        elif dtype != self.dtype:
+            values = self._to_objects(dtype, values)
+
+        self.values.extend(values)
+        self.mask.extend(mask)
+
+
+    def to_list(self) -> list:
+        """
+        Returns:
+            list -- The values of the column as Python objects, with None for missing rows
+        """
+
+        return [None if missing else value for (value, missing) in zip(self._to_objects(self.dtype, self.values), self.mask)]
+
+
+    def to_numpy(self):
+        """
+        Convert the column to a NumPy masked array. Integer and float columns are converted without copying. This requires
+        NumPy to be installed
+
+        Raises:
+            ImportError: If NumPy is not installed
+
+        Returns:
+            numpy.ma.MaskedArray -- The values of the column, masked where the field was missing
+        """
+
+        import numpy
+
+        mask = numpy.frombuffer(self.mask, dtype=numpy.bool_)
+
+        if self.dtype == "int":
+            values = numpy.frombuffer(self.values, dtype=f"i{self.values.itemsize}")
+        elif self.dtype == "float":
+            values = numpy.frombuffer(self.values, dtype=numpy.float64)
+        elif self.dtype == "bool":
+            values = numpy.frombuffer(self.values, dtype=numpy.int8).astype(numpy.bool_)
+        else:
+            values = numpy.empty(len(self.values), dtype=object)
+            values[:] = self.values
+
+        return numpy.ma.MaskedArray(values, mask=mask)
+
+
+    @classmethod
+    def _placeholders(cls, dtype:str, rows:int) -> Union[array, list]:
+        """
+        Create the placeholder values stored for missing rows
+
+        Arguments:
+            dtype {str} -- The type to store the placeholders for
+            rows {int} -- The number of placeholders
+
+        Returns:
+            Union[array, list] -- Zeros for types stored in an array, otherwise Nones
+        """
+
+        if dtype in cls.ARRAY_TYPES:
+            return array(cls.ARRAY_TYPES[dtype], bytes(rows * array(cls.ARRAY_TYPES[dtype]).itemsize))
+
+        return [None] * rows
+
+
+    @staticmethod
+    def _to_objects(dtype:str, values:Union[array, list]) -> list:
+        """
+        Convert stored values to a list of Python objects
+
+        Arguments:
+            dtype {str} -- The type the values are stored for
+            values {Union[array, list]} -- The stored values
+
+        Returns:
+            list -- The values as Python objects
+        """
+
+        if dtype == "bool":
+            return [bool(value) for value in values]
+
+        return list(values)
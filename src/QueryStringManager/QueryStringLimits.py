@@ -0,0 +1,271 @@
+# Utils
+import json, re
+
+# Typing
+from typing import Optional, Union
+
+class QueryStringLimitError(ValueError):
+    """
+    Raised when a query string exceeds one of the `QueryStringLimits`. It is a `ValueError`, so code that handles
+    malformatted query strings also handles it, and it is never treated as a value to fall back on like other
+    decoding errors are
+    """
+
+    def __init__(self, message:str, limit:str):
+        """
+        Arguments:
+            message {str} -- The error message
+            limit {str} -- The name of the limit that was exceeded, such as "max_length"
+        """
+
+        super().__init__(message)
+        self.limit = limit
+
+
+class QueryStringLimits:
+    """
+    Limits on the size of the query strings accepted by the decoders of `QueryStringManager`, set with
+    `QueryStringManager.set_limits()`. Each limit is checked before the work it guards, so a hostile query
+    string is rejected before it is split, decoded or converted:
+
+    - max_length - The length of the query string, checked before it is split
+    - max_pairs - The number of fields, checked by counting separators before splitting
+    - max_key_length, max_value_length - The raw (percent-encoded) length of each key and value, checked before
+    they are unquoted or decoded
+    - max_decoded_bytes - The size of a base64 encoded value once decoded or decompressed. Base64 values are
+    checked before they are decoded, and compressed values stop inflating at the limit
+    - max_depth - How deeply lists and dictionaries are nested in a base64 encoded value, checked before the
+    JSON is parsed
+    - max_digits - The number of digits in a number, checked before it is converted
+
+    A limit of None is not checked
+    """
+
+    NAMES = ("max_length", "max_pairs", "max_key_length", "max_value_length", "max_decoded_bytes", "max_depth",
+        "max_digits")
+
+    # Strings, brackets and runs of digits in JSON. Strings are matched whole so their content is skipped
+    _JSON_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[{]|[\]}]|\d+')
+
+    def __init__(self, max_length:Optional[int]=None, max_pairs:Optional[int]=None, max_key_length:Optional[int]=None,
+        max_value_length:Optional[int]=None, max_decoded_bytes:Optional[int]=None, max_depth:Optional[int]=None,
+        max_digits:Optional[int]=None):
+        """
+        Create limits. See the class for what each limit checks
+
+        Keyword Arguments:
+            max_length {Optional[int]} -- The maximum length of a query string (default: {None})
+            max_pairs {Optional[int]} -- The maximum number of fields in a query string (default: {None})
+            max_key_length {Optional[int]} -- The maximum raw length of a key (default: {None})
+            max_value_length {Optional[int]} -- The maximum raw length of a value (default: {None})
+            max_decoded_bytes {Optional[int]} -- The maximum size of a decoded base64 value in bytes (default: {None})
+            max_depth {Optional[int]} -- The maximum nesting depth of a base64 encoded value (default: {None})
+            max_digits {Optional[int]} -- The maximum number of digits in a number (default: {None})
+
+        Raises:
+            ValueError: If a limit is not a positive integer or None
+        """
+
+        for name in self.NAMES:
+            limit = locals()[name]
+
+            if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+                raise ValueError(f"Cannot set query string limits. Passed {name} argument is not a positive integer")
+
+            setattr(self, name, limit)
+
+        # The smallest key or value limit, so fields shorter than it are not split to be checked
+        field_limits = [limit for limit in (max_key_length, max_value_length) if limit is not None]
+        self._min_field_length = min(field_limits) if field_limits else None
+
+        self._digit_run = re.compile(rb"\d{%d}" % (max_digits + 1)) if max_digits is not None else None
+
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict -- Each limit by name
+        """
+
+        return {name: getattr(self, name) for name in self.NAMES}
+
+
+    def check_query_string(self, query_string:Union[str, bytes]) -> None:
+        """
+        Check the length and number of fields of a query string before it is split
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string
+
+        Raises:
+            QueryStringLimitError: If the query string is too long or has too many fields
+        """
+
+        if self.max_length is not None and len(query_string) > self.max_length:
+            self.raise_length()
+
+        if self.max_pairs is not None and \
+            query_string.count("&" if isinstance(query_string, str) else b"&") >= self.max_pairs:
+            self.raise_pairs()
+
+
+    def check_fields(self, fields:list) -> None:
+        """
+        Check the raw length of the key and value of each "key=value" field
+
+        Arguments:
+            fields {list} -- The fields of a query string
+
+        Raises:
+            QueryStringLimitError: If a key or value is too long
+        """
+
+        if self._min_field_length is None or not fields or max(map(len, fields)) <= self._min_field_length:
+            return
+
+        for field in fields:
+            if len(field) <= self._min_field_length:
+                continue
+
+            key, _, value = field.partition("=" if isinstance(field, str) else b"=")
+
+            if self.max_key_length is not None and len(key) > self.max_key_length:
+                raise QueryStringLimitError(f"Cannot parse query string. A key exceeds the limit of "
+                    f"{self.max_key_length} characters", "max_key_length")
+
+            if self.max_value_length is not None and len(value) > self.max_value_length:
+                raise QueryStringLimitError(f"Cannot parse query string. A value exceeds the limit of "
+                    f"{self.max_value_length} characters", "max_value_length")
+
+
+    def check_encoded_size(self, value:Union[str, bytes]) -> None:
+        """
+        Check the size a base64 encoded value decodes to before decoding it
+
+        Arguments:
+            value {Union[str, bytes]} -- The base64 encoded value
+
+        Raises:
+            QueryStringLimitError: If the value would decode to more than `max_decoded_bytes`
+        """
+
+        if self.max_decoded_bytes is not None and len(value) // 4 * 3 > self.max_decoded_bytes:
+            self.raise_decoded_size(self.max_decoded_bytes)
+
+
+    def check_json(self, data:bytes) -> None:
+        """
+        Check the nesting depth and the digits of the numbers in JSON before it is parsed. Data that cannot
+        exceed the limits (because it has too few brackets or no long run of digits) is not scanned. JSON in
+        UTF-16 or UTF-32, which `json` also decodes, is scanned once it is converted to UTF-8
+
+        Arguments:
+            data {bytes} -- The JSON
+
+        Raises:
+            QueryStringLimitError: If the JSON is nested too deeply or holds a number with too many digits
+        """
+
+        # The encoding is detected from the first bytes as `json.loads()` detects it
+        encoding = json.detect_encoding(data)
+        if encoding not in ("utf-8", "utf-8-sig"):
+            try:
+                data = data.decode(encoding).encode("UTF-8")
+            except UnicodeDecodeError:
+                # The JSON decoder rejects it without parsing it
+                return
+
+        check_depth = self.max_depth is not None and data.count(b"[") + data.count(b"{") > self.max_depth
+        check_digits = self._digit_run is not None and self._digit_run.search(data) is not None
+
+        if not check_depth and not check_digits:
+            return
+
+        depth = 0
+
+        for match in self._JSON_TOKENS.finditer(data):
+            first = data[match.start()]
+
+            if first == 0x22:
+                continue
+
+            if first in (0x5b, 0x7b):
+                depth += 1
+
+                if check_depth and depth > self.max_depth:
+                    raise QueryStringLimitError(f"Cannot decode base64 encoded value. It is nested deeper than the "
+                        f"limit of {self.max_depth}", "max_depth")
+
+            elif first in (0x5d, 0x7d):
+                depth -= 1
+
+            elif check_digits and match.end() - match.start() > self.max_digits:
+                self.raise_digits()
+
+
+    def check_number(self, value:Union[str, bytes]) -> None:
+        """
+        Check the digits of a raw value that may be converted to a number
+
+        Arguments:
+            value {Union[str, bytes]} -- The value
+
+        Raises:
+            QueryStringLimitError: If the value is a number with more than `max_digits` digits
+        """
+
+        if self.max_digits is None or len(value) <= self.max_digits:
+            return
+
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value).decode("latin-1")
+
+        digits = value[1:] if value[:1] in ("-", "+") else value
+        digits = digits.replace(".", "", 1)
+
+        if len(digits) > self.max_digits and digits.isdecimal():
+            self.raise_digits()
+
+
+    def raise_length(self) -> None:
+        """
+        Raises:
+            QueryStringLimitError: For a query string longer than `max_length`
+        """
+
+        raise QueryStringLimitError(f"Cannot parse query string. It exceeds the limit of {self.max_length} "
+            "characters", "max_length")
+
+
+    def raise_pairs(self) -> None:
+        """
+        Raises:
+            QueryStringLimitError: For a query string with more than `max_pairs` fields
+        """
+
+        raise QueryStringLimitError(f"Cannot parse query string. It exceeds the limit of {self.max_pairs} "
+            "fields", "max_pairs")
+
+
+    def raise_digits(self) -> None:
+        """
+        Raises:
+            QueryStringLimitError: For a number with more than `max_digits` digits
+        """
+
+        raise QueryStringLimitError(f"Cannot parse query string. A number exceeds the limit of {self.max_digits} "
+            "digits", "max_digits")
+
+
+    @staticmethod
+    def raise_decoded_size(limit:int) -> None:
+        """
+        Arguments:
+            limit {int} -- The size that was exceeded
+
+        Raises:
+            QueryStringLimitError: For a base64 encoded value that decodes to more than the limit
+        """
+
+        raise QueryStringLimitError(f"Cannot decode base64 encoded value. It exceeds the limit of {limit} bytes",
+            "max_decoded_bytes")
@@ -1,19 +1,116 @@
 # Utils
-from urllib.parse import quote, unquote
-import json, base64
+from urllib.parse import unquote, unquote_to_bytes
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from functools import lru_cache, partial
+from itertools import product
+from array import array
+import base64, hashlib, io, mmap, os, re, zlib
 
 # Typing
-from typing import Union
-from decimal import Decimal
+from typing import Callable, Iterable, Iterator, Optional, Union
+from decimal import Context, Decimal
+
+from .QueryStringCache import QueryStringCache
+from .QueryStringColumn import QueryStringColumn
+from .LazyDict import LazyDict
+from .JsonBackend import JsonBackend
+from .QueryStringMetrics import QueryStringMetrics
+from .QueryStringLimits import QueryStringLimits, QueryStringLimitError
+from .QuoteTable import QuoteTable
+from .BinaryPayload import BinaryPayload
+from .QueryStringParseResult import QueryStringParseResult
+
+class _DecodedValue:
+    """
+    A value that was decoded while splitting a query string, so its type should not be inferred
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
 
 class QueryStringManager:
     # Characters that should not be replaced with URL safe equivalents
     # when generating query strings
     URLLIB_SAFE_CHARS = ";/?!:@&=+$,."
 
+    # Characters that are not replaced in canonical query strings (see `canonicalize()`). Unlike 
+    # URLLIB_SAFE_CHARS, the characters that decide how a query string is split are always replaced
+    CANONICAL_SAFE_CHARS = ";/!:@+$."
+
+    # Types that are encoded in standard format by default when a field is set (see `replace_params()` and
+    # `QueryStringBuilder.set()`)
+    STANDARD_TYPES = (str, int, float, bool, Decimal)
+
+    # The 6 bit value of each character (and byte) in the standard and URL safe base64 alphabets. Padding is -1
+    _BASE64_VALUES = {char: index % 64 for (index, char) in enumerate(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/" \
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")}
+    _BASE64_VALUES["="] = -1
+    _BASE64_VALUES.update({ord(char): bits for (char, bits) in _BASE64_VALUES.items()})
+
+    # A value made only of base64 characters with optional padding, which is checked without a scan
+    _BASE64_TEXT = re.compile(r"[A-Za-z0-9+/_-]{2,}(=*)")
+    _BASE64_BYTES = re.compile(rb"[A-Za-z0-9+/_-]{2,}(=*)")
+
+    # Bytes a document accepted by `json.loads()` can start with. This is whitespace and the first 
+    # character of a JSON value, plus the first byte of a UTF-8/16/32 byte order mark or wide encoding
+    _JSON_FIRST_BYTES = frozenset(b' \t\n\r{["-0123456789tfnNI\x00\xef\xfe\xff')
+
+    # Prefix of a compressed base64 encoded value. "~" is never quoted and is not in the base64 alphabet,
+    # and the digit is the version of the format: deflated JSON in base64url without padding
+    COMPRESSED_PREFIX = "~1"
+
+    # Prefixes of a base64 encoded binary payload (see `BinaryPayload`) in base64url without padding, and of a
+    # deflated binary payload
+    BINARY_PREFIX = "~2"
+    COMPRESSED_BINARY_PREFIX = "~3"
+
+    # The (binary, compressed) format of the value after each prefix, for text and bytes values
+    _PREFIXED_FORMATS = {prefix: value_format for (text, value_format) in ((COMPRESSED_PREFIX, (False, True)),
+        (BINARY_PREFIX, (True, False)), (COMPRESSED_BINARY_PREFIX, (True, True)))
+        for prefix in (text, text.encode("UTF-8"))}
+
+    # The maximum size in bytes a compressed value may decompress to
+    MAX_DECOMPRESSED_SIZE = 1048576
+
+    # Ways a list can be written to a standard query string: a repeated key per element ("id=1&id=2") or
+    # elements joined with commas ("id=1,2")
+    LIST_FORMATS = ("repeat", "comma")
+
+    # Conversions for fractional numbers for each `numeric_mode`
+    NUMERIC_MODES = {"decimal": Decimal, "float": float, "str": str}
+
+    # Every capitalization of "true" and "false", mapped to the bool it is normalized to
+    _BOOLEANS = {"".join(chars): value for (word, value) in (("true", True), ("false", False))
+        for chars in product(*((char, char.upper()) for char in word))}
+
+    # Cache of parsed query strings. Disabled unless `enable_cache()` is called
+    _cache = None
+
+    # JSON backends base64 values are encoded and decoded with. Chosen when first used unless `set_json_backend()` is called
+    _json_encoder = None
+    _json_decoder = None
+
+    # Metrics of calls, errors and payload sizes. Disabled unless `enable_metrics()` is called
+    _metrics = None
+
+    # Limits on the size of parsed query strings. Not checked unless `set_limits()` is called
+    _limits = None
+
+    # The query string of the request in a line of a web access log ('"GET /path?query HTTP/1.1"', the first 
+    # quoted field of the Common and Combined Log Formats), up to whitespace or a quote. A "?" elsewhere in the
+    # line, like in the referer, is not matched
+    _LOG_QUERY_STRING_PATTERN = re.compile(rb'^[^"\n]*"[A-Z]+ [^?\s"]*\?([^\s"#]+)', re.MULTILINE)
+
     # ----------------------- Encoders ----------------------- #
     @classmethod
-    def generate_base64_query_string(cls, params:Union[int, str, bool, float, Decimal, list, dict], field_name:str="q") -> str:
+    @QueryStringMetrics.instrument("generate_base64_query_string", "output")
+    def generate_base64_query_string(cls, params:Union[int, str, bool, float, Decimal, list, dict], field_name:str="q", 
+        compress:bool=False, binary:bool=False) -> str:
         """
         Generate a base64 encoded query string from a passed dictionary. Unlike a standard query string,
         a base64 encoded query string can support nested dictionaries and lists. A field identifier should
@@ -24,6 +121,11 @@ class QueryStringManager:
 
         Keyword Arguments:
             field_name {str} -- The field name to store the encoded query string data under (default: {"q"})
+            compress {bool} -- If the JSON should be deflated before it is encoded. The value is prefixed with 
+            `COMPRESSED_PREFIX` so it is decompressed when parsed (default: {False})
+            binary {bool} -- If the value should be encoded as a compact `BinaryPayload` instead of JSON. The value
+            is prefixed with `BINARY_PREFIX` (or `COMPRESSED_BINARY_PREFIX`) so it is detected when parsed
+            (default: {False})
 
         Raises:
             ValueError: If the passed value for params is not a dictionary
@@ -36,15 +138,28 @@ class QueryStringManager:
             raise ValueError("Cannot generate a base64 encoded query string. Passed params argument is \
             not serializable")
         
-        query_string_data = base64.urlsafe_b64encode(json.dumps(params, default=float).encode('UTF-8'))
-        return f"?{quote(field_name, safe=cls.URLLIB_SAFE_CHARS)}={query_string_data.decode('UTF-8')}"
+        if binary:
+            query_string_data = BinaryPayload.dumps(params)
+
+            if compress:
+                query_string_data = cls._compress_value(query_string_data, cls.COMPRESSED_BINARY_PREFIX)
+            else:
+                query_string_data = cls.BINARY_PREFIX + base64.urlsafe_b64encode(query_string_data).rstrip(b"=").decode('UTF-8')
+        elif compress:
+            query_string_data = cls._compress_value(cls._get_json_encoder().dumps(params))
+        else:
+            query_string_data = cls._get_json_encoder().dumps(params)
+            query_string_data = base64.urlsafe_b64encode(query_string_data).decode('UTF-8')
+
+        return f"?{QuoteTable.get(cls.URLLIB_SAFE_CHARS).quote_key(field_name)}={query_string_data}"
 
     
     @classmethod
-    def generate_query_string(cls, params:dict, safe_chars:str=None) -> str:
+    @QueryStringMetrics.instrument("generate_query_string", "output")
+    def generate_query_string(cls, params:dict, safe_chars:str=None, list_format:str="repeat") -> str:
         """
         Generate a query string from a passed dictionary The passed dictionary must 
-        meet the conditions defined in `_is_valid_single_level_dict()` or a ValueError will
+        meet the conditions defined in `_is_valid_single_level_dict()` (with lists allowed) or a ValueError will
         be raised
 
         Arguments:
@@ -52,260 +167,2628 @@ class QueryStringManager:
             safe_chars {str} -- An optional string of characters to not replace in a query string. For example
             "!?@="
 
+        Keyword Arguments:
+            list_format {str} -- How list values are written: "repeat" repeats the key for each element 
+            ("id=1&id=2") and "comma" joins the elements with commas ("id=1,2"), quoting commas inside 
+            values (default: {"repeat"})
+
         Raises:
-            ValueError: If the dictionary does not meet the criteria in `_is_valid_single_level_dict()`
+            ValueError: If the dictionary does not meet the criteria in `_is_valid_single_level_dict()`, or the
+            list format is unknown
 
         Returns:
             str -- A normalized query string generated from the passed dictionary
         """
 
-        if not cls._is_valid_single_level_dict(params):
+        if list_format not in cls.LIST_FORMATS:
+            raise ValueError(f"Cannot generate a query string. Unknown list_format {list_format!r}, "
+                f"expected one of {', '.join(map(repr, cls.LIST_FORMATS))}")
+
+        safe_chars = safe_chars or cls.URLLIB_SAFE_CHARS
+
+        # Without lists each value is a single field, so the fields are joined without expanding them
+        if list_format == "repeat" and cls._is_valid_single_level_dict(params):
+            raw_query_string = "&".join([f"{key}={cls._normalize_value(value)}" for (key, value) in params.items()])
+            return "?" + QuoteTable.get(safe_chars).quote(raw_query_string)
+
+        if not cls._is_valid_single_level_dict(params, allow_lists=True):
             raise ValueError("Cannot generate a query string from passed dictionary. \
                 Passed data contains a nested dictionary, a list or an datatype that is not \
                 (int, float, bool, str)")
 
-        # Create query string and convert booleans to lowercase
-        raw_query_string = "&".join([f"{key}={cls._normalize_value(value)}" for (key,value) in params.items()])
+        if list_format == "comma":
+            return cls._generate_comma_query_string(params, safe_chars)
+
+        # Create query string and convert booleans to lowercase. Each element of a list repeats the key
+        raw_query_string = "&".join([f"{key}={cls._normalize_value(element)}" for (key, value) in params.items() 
+            for element in (value if isinstance(value, (list, tuple)) else (value,))])
 
         # Normalize special characters for URLs
-        return "?" + quote(raw_query_string, safe=safe_chars or cls.URLLIB_SAFE_CHARS)
+        return "?" + QuoteTable.get(safe_chars).quote(raw_query_string)
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("write_query_string", "output")
+    def write_query_string(cls, params:dict, out:Union[bytearray, io.IOBase], safe_chars:str=None,
+        list_format:str="repeat", chunk_size:int=65536) -> int:
+        """
+        Write the query string `generate_query_string()` creates for a dictionary to a buffer or file. Fields
+        are quoted one at a time and written in chunks, so the whole query string is never held in memory
+
+        Arguments:
+            params {dict} -- A dictionary of one or more key/value pairs to create a query string with
+            out {Union[bytearray, io.IOBase]} -- The `bytearray` to append to, or the binary or text file object
+            to write to
+
+        Keyword Arguments:
+            safe_chars {str} -- See `generate_query_string()` (default: {None})
+            list_format {str} -- See `generate_query_string()` (default: {"repeat"})
+            chunk_size {int} -- The number of bytes to collect before each write (default: {65536})
+
+        Raises:
+            ValueError: If the dictionary is invalid, the options are invalid or out cannot be written to
+
+        Returns:
+            int -- The number of bytes (or characters, for a text file) written
+        """
+
+        if list_format not in cls.LIST_FORMATS:
+            raise ValueError(f"Cannot generate a query string. Unknown list_format {list_format!r}, "
+                f"expected one of {', '.join(map(repr, cls.LIST_FORMATS))}")
+
+        if not cls._is_valid_single_level_dict(params, allow_lists=True):
+            raise ValueError("Cannot generate a query string from passed dictionary. \
+                Passed data contains a nested dictionary, a list or an datatype that is not \
+                (int, float, bool, str)")
+
+        cls._validate_chunk_size(chunk_size)
+
+        safe_chars = safe_chars or cls.URLLIB_SAFE_CHARS
+        write = cls._get_writer(out)
+        separator = QuoteTable.get(safe_chars).separator
+
+        written = 0
+        chunk = ["?"]
+        chunk_length = 1
+
+        for (index, field) in enumerate(cls._iter_query_string_fields(params, safe_chars, list_format)):
+            if index:
+                chunk.append(separator)
+                chunk_length += len(separator)
+
+            chunk.append(field)
+            chunk_length += len(field)
+
+            if chunk_length >= chunk_size:
+                written += write("".join(chunk).encode("ascii"))
+                chunk.clear()
+                chunk_length = 0
+
+        if chunk:
+            written += write("".join(chunk).encode("ascii"))
+
+        return written
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("write_base64_query_string", "output")
+    def write_base64_query_string(cls, params:Union[int, str, bool, float, Decimal, list, dict], out:Union[bytearray, io.IOBase],
+        field_name:str="q", compress:bool=False, chunk_size:int=65536, binary:bool=False) -> int:
+        """
+        Write the query string `generate_base64_query_string()` creates for a value to a buffer or file. The
+        JSON is encoded in batches of elements (see `JsonBackend.iterdumps()`), then compressed and base64 encoded
+        in chunks that are written as they are produced, so the whole payload is never held in memory
+
+        Arguments:
+            params {Union[int, str, bool, float, Decimal, list, dict]} -- The value to create a query string from
+            out {Union[bytearray, io.IOBase]} -- The `bytearray` to append to, or the binary or text file object
+            to write to
+
+        Keyword Arguments:
+            field_name {str} -- The field name to store the encoded data under (default: {"q"})
+            compress {bool} -- If the JSON should be deflated before it is encoded (default: {False})
+            chunk_size {int} -- The maximum number of bytes written at once (default: {65536})
+            binary {bool} -- If the value should be encoded as a compact `BinaryPayload` instead of JSON. The
+            payload is encoded whole, then compressed and base64 encoded in chunks (default: {False})
+
+        Raises:
+            ValueError: If the value cannot be serialized, the chunk size is invalid or out cannot be written to
+
+        Returns:
+            int -- The number of bytes (or characters, for a text file) written
+        """
+
+        if not isinstance(params, (int, str, bool, float, Decimal, list, dict)):
+            raise ValueError("Cannot generate a base64 encoded query string. Passed params argument is \
+            not serializable")
+
+        cls._validate_chunk_size(chunk_size)
+
+        write = cls._get_writer(out)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS) if compress else None
+
+        # Each chunk of input is a multiple of 3 bytes, so its base64 encoding has no padding
+        step = max(3, chunk_size // 4 * 3)
+        prefix = f"?{QuoteTable.get(cls.URLLIB_SAFE_CHARS).quote_key(field_name)}="
+
+        if binary:
+            value_prefix = cls.COMPRESSED_BINARY_PREFIX if compress else cls.BINARY_PREFIX
+            parts = [BinaryPayload.dumps(params)]
+        else:
+            value_prefix = cls.COMPRESSED_PREFIX if compress else ""
+            parts = cls._get_json_encoder().iterdumps(params)
+
+        written = write((prefix + value_prefix).encode("ascii"))
+        pending = bytearray()
+
+        for data in parts:
+            pending += compressor.compress(data) if compress else data
+
+            if len(pending) < step:
+                continue
+
+            usable = len(pending) - len(pending) % 3
+
+            with memoryview(pending) as view:
+                for start in range(0, usable, step):
+                    written += write(base64.urlsafe_b64encode(view[start:min(start + step, usable)]))
+
+            del pending[:usable]
+
+        if compress:
+            pending += compressor.flush()
+
+        for start in range(0, len(pending), step):
+            encoded = base64.urlsafe_b64encode(pending[start:start + step])
+            written += write(encoded.rstrip(b"=") if value_prefix else encoded)
+
+        return written
+
+
+    @classmethod
+    def _generate_comma_query_string(cls, params:dict, safe_chars:str) -> str:
+        """
+        Generate a query string with the elements of list values joined by commas. Each value is quoted
+        separately, so commas inside values are quoted while the commas between elements are not
+
+        Arguments:
+            params {dict} -- A valid dictionary of key/value pairs
+            safe_chars {str} -- The characters to not replace in the query string
+
+        Returns:
+            str -- The query string
+        """
+
+        # The separators are quoted with the fields, as they are when the whole query string is quoted
+        return "?" + QuoteTable.get(safe_chars).separator.join(cls._iter_query_string_fields(params, safe_chars, "comma"))
+
+
+    @classmethod
+    def _iter_query_string_fields(cls, params:dict, safe_chars:str, list_format:str) -> Iterator[str]:
+        """
+        Quote the fields of a standard query string one at a time. Joined with the quoted "&" separator they
+        are the query string `generate_query_string()` creates
+
+        Arguments:
+            params {dict} -- A valid dictionary of key/value pairs
+            safe_chars {str} -- The characters to not replace in the query string
+            list_format {str} -- How list values are written, see `generate_query_string()`
+
+        Returns:
+            Iterator[str] -- The quoted "key=value" fields
+        """
+
+        table = QuoteTable.get(safe_chars)
+
+        if list_format == "comma":
+            quote_element = QuoteTable.get(safe_chars.replace(",", "")).quote
+
+            for (key, value) in params.items():
+                elements = value if isinstance(value, (list, tuple)) else (value,)
+                yield table.quote_key(f"{key}") + table.equals + \
+                    ",".join(quote_element(f"{cls._normalize_value(element)}") for element in elements)
+
+            return
+
+        for (key, value) in params.items():
+            for element in (value if isinstance(value, (list, tuple)) else (value,)):
+                yield table.quote(f"{key}={cls._normalize_value(element)}")
     # -------------------------------------------------------- #
 
     
     # ----------------------- Decoders ----------------------- #
     @classmethod
-    def parse(cls, query_string:str) -> dict:
+    @QueryStringMetrics.instrument("parse")
+    def parse(cls, query_string:Union[str, bytes], schema:"QueryStringSchema"=None, lazy:bool=False, 
+        numeric_mode:str="decimal", list_format:Optional[str]=None, keys:Optional[Iterable[str]]=None,
+        exclude:Optional[Iterable[str]]=None) -> dict:
         """
         Parses a passed query string into a dictionary. The data in the query string may be in standard or
         in base64 format. This method will detect the encoding and parse it. Values parsed from the query string
         will be normalized to Python objects (e.g. "false" will become False). Floating point data will be converted 
         to `decimal.Decimal` to ensure no widening / narrowing issues occur.
 
-        This method can generally be used in place of `parse_base64_query_string()` and `parse_query_string()` with
-        the drawback of a slight performance hit checking each the encoding of each field in the query string
+        The encoding of each field is detected with a single scan of its value (see `_is_base64_json_candidate()`),
+        so fields in standard format are decoded directly without first attempting a base64 decode
 
         Arguments:
-            query_string {str} -- The query string to parse into a dictionary
+            query_string {Union[str, bytes]} -- The query string to parse into a dictionary. A `bytes`, `bytearray` or
+            `memoryview` (such as an ASGI `scope["query_string"]`) is parsed without being decoded to text first
+
+        Keyword Arguments:
+            schema {QueryStringSchema} -- A compiled schema to decode known fields with instead of detecting their 
+            encoding and type (default: {None})
+            lazy {bool} -- If a `LazyDict` should be returned, which decodes each value the first time it is read.
+            Lazy results are not cached (default: {False})
+            numeric_mode {str} -- How fractional numbers are converted: "decimal" to `decimal.Decimal`, "float" to `float`
+            or "str" to leave them as strings (default: {"decimal"})
+            list_format {Optional[str]} -- How lists are read from standard format fields. By default the last value of a
+            repeated key is kept. "repeat" collects the values of a repeated key in a list, and "comma" also splits
+            values on commas, which is not supported for lazy results (default: {None})
+            keys {Optional[Iterable[str]]} -- The keys to decode. Other fields are skipped by their raw key, without
+            being validated, unquoted or decoded. By default every field is decoded (default: {None})
+            exclude {Optional[Iterable[str]]} -- Keys to skip without decoding (default: {None})
 
         Raises:
-            ValueError: If the query string is malformatted or invalid
+            ValueError: If the query string is malformatted or invalid, or the options are invalid
 
         Returns:
             dict -- The parsed query string
         """
 
-        parsed_data = {}
+        cls._validate_numeric_mode(numeric_mode)
+        cls._validate_list_format(list_format)
+        key_filter = cls._get_key_filter(keys, exclude)
 
-        # Ensure a string was passed
-        if not isinstance(query_string, str):
-            raise ValueError("Cannot parse a query string from an object that is not a string")
-        
-        # Remove "?" if it's at the beginning
-        if query_string[0] == "?":
-            query_string = query_string[1:]
+        if lazy:
+            if list_format is not None:
+                raise ValueError("Cannot parse query string. A list_format is not supported for lazy results")
 
-        # Split fields if multiple fields
-        key_value_pairs = query_string.split("&")
-        if len(key_value_pairs) < 1:
-            raise ValueError("Cannot parse a query string from an empty string")
-        
-        # Split key and value
-        for key_value in key_value_pairs:
-            # If the key happens to be "=", handle that
-            if key_value[0:2] == "==":
-                key_and_value = ["=", key_value.lstrip("=")]
-            else:
-                key_and_value = key_value.split("=", 1)
+            return cls._parse_lazy(query_string, schema=schema, numeric_mode=numeric_mode, key_filter=key_filter)
 
-            if len(key_and_value) != 2:
-                raise ValueError("Malformatted query string")
-            
-            try:
-                parsed_data.update(cls.parse_base64_query_string(key_value))
-            except:
-                parsed_data.update(cls.parse_query_string(key_value))
-        
-        return parsed_data
+        if cls._cache is not None and isinstance(query_string, (str, bytes)):
+            return cls._cache.get_or_parse(("parse", query_string, schema, numeric_mode, list_format, key_filter), 
+                cls._parse, query_string, schema, numeric_mode, list_format, key_filter)
+
+        return cls._parse(query_string, schema, numeric_mode, list_format, key_filter)
 
             
-    @staticmethod
-    def parse_base64_query_string(query_string:str) -> dict:
+    @classmethod
+    @QueryStringMetrics.instrument("parse_base64_query_string")
+    def parse_base64_query_string(cls, query_string:Union[str, bytes], lazy:bool=False, numeric_mode:str="decimal",
+        keys:Optional[Iterable[str]]=None, exclude:Optional[Iterable[str]]=None) -> dict:
         """
         Parses a Base64 encoded query string into a dictionary. By default, passed data will be normalized
         to Python objects (e.g. "false" will become False). Floating point data will be converted to `decimal.Decimal`
         to ensure no widening / narrowing issues occur.
 
         Arguments:
-            query_string {str} -- The query string to parse into a dictionary
+            query_string {Union[str, bytes]} -- The query string to parse into a dictionary. A `bytes`, `bytearray` or
+            `memoryview` (such as an ASGI `scope["query_string"]`) is parsed without being decoded to text first
+
+        Keyword Arguments:
+            lazy {bool} -- If a `LazyDict` should be returned, which decodes each value the first time it is read.
+            Lazy results are not cached (default: {False})
+            numeric_mode {str} -- How fractional numbers are converted: "decimal" to `decimal.Decimal`, "float" to `float`
+            or "str" to leave them as strings (default: {"decimal"})
+            keys {Optional[Iterable[str]]} -- The keys to decode. Other fields are skipped without being decoded. By 
+            default every field is decoded (default: {None})
+            exclude {Optional[Iterable[str]]} -- Keys to skip without decoding (default: {None})
 
         Raises:
-            ValueError: If the query string is malformatted or invalid
+            ValueError: If the query string is malformatted or invalid, or the options are invalid
 
         Returns:
             dict -- The parsed query string
         """
-        
-        parsed_data = {}
 
-        # Ensure a string was passed
-        if not isinstance(query_string, str):
-            raise ValueError("Cannot parse a query string from an object that is not a string")
-        
-        # Remove "?" if it's at the beginning
-        if query_string[0] == "?":
-            query_string = query_string[1:]
+        cls._validate_numeric_mode(numeric_mode)
+        key_filter = cls._get_key_filter(keys, exclude)
 
-        # Split fields if multiple fields
-        key_value_pairs = query_string.split("&")
-        if len(key_value_pairs) < 1:
-            raise ValueError("Cannot parse a query string from an empty string")
-        
-        # Split key and value
-        for key_value in key_value_pairs:
-            # If the key happens to be "=", handle that
-            if key_value[0:2] == "==":
-                key_and_value = ["=", key_value.lstrip("=")]
-            else:
-                key_and_value = key_value.split("=", 1)
+        if lazy:
+            return cls._parse_lazy(query_string, base64_encoded=True, numeric_mode=numeric_mode, key_filter=key_filter)
 
-            if len(key_and_value) != 2:
-                raise ValueError("Malformatted query string")
-            
-            parsed_data[unquote(key_and_value[0])] = json.loads(base64.urlsafe_b64decode(key_and_value[1]), parse_float=lambda flt: Decimal(flt))
+        if cls._cache is not None and isinstance(query_string, (str, bytes)):
+            return cls._cache.get_or_parse(("parse_base64_query_string", query_string, numeric_mode, key_filter), 
+                cls._parse_base64_query_string, query_string, numeric_mode, key_filter)
 
-        return parsed_data
+        return cls._parse_base64_query_string(query_string, numeric_mode, key_filter)
     
     
     @classmethod
-    def parse_query_string(cls, query_string:str, normalize_value:bool=True) -> dict:
+    @QueryStringMetrics.instrument("parse_query_string")
+    def parse_query_string(cls, query_string:Union[str, bytes], normalize_value:bool=True, schema:"QueryStringSchema"=None,
+        numeric_mode:str="decimal", list_format:Optional[str]=None, keys:Optional[Iterable[str]]=None,
+        exclude:Optional[Iterable[str]]=None) -> dict:
         """
         Parses a standard query string into a dictionary. By default, passed data will be normalized
         to Python objects (e.g. "false" will become False). Floating point data will be converted to `decimal.Decimal`
         to ensure no widening / narrowing issues occur.
 
         Arguments:
-            query_string {str} -- The query string to parse into a dictionary
+            query_string {Union[str, bytes]} -- The query string to parse into a dictionary. A `bytes`, `bytearray` or
+            `memoryview` (such as an ASGI `scope["query_string"]`) is parsed without being decoded to text first
 
         Keyword Arguments:
             normalize_value {bool} -- If the values parsed should be normalized from strings to Python objects (default: {True})
+            schema {QueryStringSchema} -- A compiled schema to decode known fields with instead of inferring their 
+            type (default: {None})
+            numeric_mode {str} -- How fractional numbers are converted: "decimal" to `decimal.Decimal`, "float" to `float`
+            or "str" to leave them as strings (default: {"decimal"})
+
+            list_format {Optional[str]} -- How lists are read. By default the last value of a repeated key is kept.
+            "repeat" collects the values of a repeated key in a list, and "comma" also splits values on commas. Each
+            element is normalized separately (default: {None})
+            keys {Optional[Iterable[str]]} -- The keys to decode. Other fields are skipped by their raw key, without
+            being validated, unquoted or decoded. By default every field is decoded (default: {None})
+            exclude {Optional[Iterable[str]]} -- Keys to skip without decoding (default: {None})
 
         Raises:
-            ValueError: If the query string is malformatted or invalid
+            ValueError: If the query string is malformatted or invalid, or the options are invalid
 
         Returns:
             dict -- The parsed query string
         """
 
-        parsed_data = {}
-
-        # Ensure a string was passed
-        if not isinstance(query_string, str):
-            raise ValueError("Cannot parse a query string from an object that is not a string")
-        
-        # Remove "?" if it's at the beginning
-        if query_string[0] == "?":
-            query_string = query_string[1:]
+        cls._validate_numeric_mode(numeric_mode)
+        cls._validate_list_format(list_format)
+        key_filter = cls._get_key_filter(keys, exclude)
 
-        # Split fields if multiple fields
-        key_value_pairs = query_string.split("&")
-        if len(key_value_pairs) < 1:
-            raise ValueError("Cannot parse a query string from an empty string")
-        
-        # Split key and value
-        for key_value in key_value_pairs:
-            key_and_value = key_value.split("=", 1)
+        if cls._cache is not None and isinstance(query_string, (str, bytes)):
+            return cls._cache.get_or_parse(("parse_query_string", query_string, normalize_value, schema, numeric_mode, 
+                list_format, key_filter), cls._parse_query_string, query_string, normalize_value, schema, numeric_mode, 
+                list_format, key_filter)
 
-            if len(key_and_value) != 2 or key_and_value[1] == '':
-                raise ValueError("Malformatted query string")
-            
-            # Convert data
-            parsed_data[unquote(key_and_value[0])] = cls._un_normalize_value(unquote(key_and_value[1])) if \
-                normalize_value else unquote(key_and_value[1])
+        return cls._parse_query_string(query_string, normalize_value, schema, numeric_mode, list_format, key_filter)
 
-        return parsed_data
-    # -------------------------------------------------------- #
 
-    # -----------------------   Utils  ----------------------- #
-    @staticmethod
-    def _is_valid_single_level_dict(params:dict) -> bool:
+    @classmethod
+    @QueryStringMetrics.instrument("parse_many")
+    def parse_many(cls, query_strings:Iterable[Union[str, bytes]], columns:list=None, chunk_size:int=65536, 
+        skip_invalid:bool=False, numeric_mode:str="decimal", exclude:list=None) -> dict:
         """
-        Determines if a passed dictionary is "single level." In this context "single level"
-        means that this is not a nested dictionary and the values are JSON compatible
-        (int, float, bool, str)
+        Parses many query strings into columns, one per field, instead of one dictionary per query string. 
+        Values are decoded as they are by `parse()`, but the type of standard format values is inferred once
+        for each chunk of rows in a column. Integer and boolean columns are stored in compact arrays (see 
+        `QueryStringColumn`)
 
         Arguments:
-            params {dict} -- The dictionary to check
+            query_strings {Iterable[Union[str, bytes]]} -- The query strings to parse
+
+        Keyword Arguments:
+            columns {list} -- The fields to return columns for. Other fields are not decoded. By default every field
+            found is returned (default: {None})
+            chunk_size {int} -- The number of rows to infer the type of each column for at once (default: {65536})
+            skip_invalid {bool} -- If a malformatted query string should be treated as a row with every field missing
+            instead of raising (default: {False})
+            numeric_mode {str} -- How fractional numbers are converted: "decimal" to `decimal.Decimal`, "float" to `float`
+            or "str" to leave them as strings. Columns of
+            `float` values are stored in an array (default: {"decimal"})
+            exclude {list} -- Fields to skip without decoding (default: {None})
+
+        Raises:
+            ValueError: If a query string is malformatted or invalid and skip_invalid is False, or the options are invalid
 
         Returns:
-            bool -- True if the dictionary is single level with valid values. False if 
-            it is not single level, does not have valid values or is not a dictionary.
+            dict -- The field names mapped to a `QueryStringColumn` holding one value (or null) per query string
         """
-        
-        # Ensure dictionary that is not empty
-        if not isinstance(params, dict) or len(params) == 0:
-            return False
 
-        # Check all values to ensure they're not lists, dictionaries or None
-        for value in params.values():
-            if not isinstance(value, (float, int, str, bool, Decimal)):
-                return False
-            
-        return True
-    
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("Cannot parse query strings in chunks. Passed chunk_size argument is not a positive integer")
 
-    @staticmethod
-    def _normalize_value(param:Union[int, str, bool, float, Decimal]) -> str:
-        """
-        Normalizes a value for usage in a query string. For the following value types the
-        following normalization occurs:
+        cls._validate_numeric_mode(numeric_mode)
+        key_filter = cls._get_key_filter(columns, exclude)
 
-        - str - None
-        - int - Converted to a string
-        - float/Decimal - Converted to a string
-        - bool - Converted to a lowercase string
+        parsed_columns = {name: QueryStringColumn(name) for name in columns} if columns is not None else {}
+
+        # Raw values for the current chunk of rows, None where the field is missing
+        chunk = {name: [] for name in parsed_columns}
+        chunk_rows = 0
+        flushed_rows = 0
+        row = {}
+
+        for query_string in query_strings:
+            row.clear()
+
+            try:
+                cls._parse_raw_row(query_string, key_filter, row, numeric_mode)
+            except ValueError as error:
+                if not skip_invalid:
+                    raise
+
+                if cls._metrics is not None:
+                    cls._metrics.count_error("parse_many", error)
+
+                row.clear()
+
+            for (name, value) in row.items():
+                if name not in chunk:
+                    # A field seen for the first time is missing from all previous rows
+                    parsed_columns[name] = QueryStringColumn(name, flushed_rows)
+                    chunk[name] = [None] * chunk_rows
+
+                chunk[name].append(value)
+
+            chunk_rows += 1
+            for values in chunk.values():
+                if len(values) < chunk_rows:
+                    values.append(None)
+
+            if chunk_rows == chunk_size:
+                cls._flush_column_chunk(parsed_columns, chunk, numeric_mode)
+                flushed_rows += chunk_rows
+                chunk_rows = 0
+
+        cls._flush_column_chunk(parsed_columns, chunk, numeric_mode)
+        return parsed_columns
+
+
+    @classmethod
+    def parse_file(cls, path:str, workers:int=None, output:str="columns", columns:list=None, 
+        skip_invalid:bool=False, shard_size:int=8388608, exclude:list=None) -> Iterator[Union[dict, bytes]]:
+        """
+        Parses the query strings in a web access log file in parallel. The file is memory mapped and split into 
+        line aligned shards. The query string of the request of each line (the quoted '"GET /path?query HTTP/1.1"' 
+        of the Common and Combined Log Formats) is found without decoding the line, and each shard is parsed in a 
+        separate process. Lines without a query string are skipped. Results are yielded for each shard in file 
+        order, and at most one shard per worker is parsed ahead of the shard being yielded, so memory is bounded
+        for any size of log. The options are validated when this is called, before the results are iterated
 
         Arguments:
-            param {Union[int, str, bool, float]} -- The parameter to normalize
+            path {str} -- The path of the log file
+
+        Keyword Arguments:
+            workers {int} -- The number of processes to parse shards in. If 1, shards are parsed in the calling 
+            process (default: {os.cpu_count()})
+            output {str} -- "columns" to yield the result of `parse_many()` for each shard or "jsonl" to yield 
+            the result of `parse()` for each query string as UTF-8 JSON lines (default: {"columns"})
+            columns {list} -- The fields to decode, see `parse_many()`. By default every field is decoded (default: {None})
+            skip_invalid {bool} -- If a malformatted query string should be treated as having no fields instead of 
+            raising (default: {False})
+            shard_size {int} -- The approximate number of bytes in each shard (default: {8388608})
+            exclude {list} -- Fields to skip without decoding (default: {None})
+
+        Raises:
+            ValueError: If the options are invalid, or a query string is malformatted and skip_invalid is False
 
         Returns:
-            str -- The normalized value
+            Iterator[Union[dict, bytes]] -- The parsed shards. Columns (see `parse_many()`) or a block of JSON lines
         """
-        
-        if isinstance(param, bool):
-            return str(param).lower()
-        
-        return param
 
+        if output not in ("columns", "jsonl"):
+            raise ValueError("Cannot parse a log file. Passed output argument is not \"columns\" or \"jsonl\"")
 
-    @staticmethod
-    def _un_normalize_value(param:str) -> Union[int, str, bool, Decimal]:
-        """
-        "Un-normalizes" a value passed in a query string. The following datatypes will be
-        inferred from the content of the query string and converted to their respective type
+        if not isinstance(shard_size, int) or shard_size < 1:
+            raise ValueError("Cannot parse a log file. Passed shard_size argument is not a positive integer")
 
-        - str - None
-        - int - (a detected integer will be converted to an Integer)
-        - float - (a detected decimal will be converted to a Decimal)
-        - bool - (a value of true/false will be converted to a Python Bool)
+        # Validate the keys before any shard is parsed
+        cls._get_key_filter(columns, exclude)
+
+        shards = cls._find_log_shards(path, shard_size)
+        arguments = [(path, start, end, output, columns, skip_invalid, exclude) for (start, end) in shards]
+
+        return cls._parse_log_shards(arguments, workers or os.cpu_count() or 1)
+
+
+    @classmethod
+    def _parse_log_shards(cls, arguments:list, workers:int) -> Iterator[Union[dict, bytes]]:
+        """
+        Parses the shards of a log file in a process pool, yielding the results in file order. Shards are 
+        submitted as results are yielded, so no more than `workers` are parsed or held at once
 
         Arguments:
-            param {Union[int, str, bool, Decimal]} -- The parameter to "un-normalize"
+            arguments {list} -- The arguments of `_parse_log_shard()` for each shard
+            workers {int} -- The number of processes. If 1, shards are parsed in the calling process
 
         Returns:
-            str -- The normalized value
+            Iterator[Union[dict, bytes]] -- The parsed shards
         """
 
-        # Check for bool
-        if param.lower() in ["false", "true"]:
-            return json.loads(param.lower())
-        
-        # If there is a single . in a series of digits it is a decimal
-        if '.' in param and param.replace('.', '1').lstrip('-').isdigit():
-            return Decimal(param)
+        if workers == 1 or len(arguments) < 2:
+            for shard_arguments in arguments:
+                yield cls._parse_log_shard(*shard_arguments)
+            return
 
-        # If it is all digits but not decimal, it is an integer
-        if param.lstrip('-').isdigit():
-            return int(param)
-        
-        return param
-    # -------------------------------------------------------- #
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            for shard_arguments in arguments:
+                if len(pending) == workers:
+                    yield pending.popleft().result()
+
+                pending.append(executor.submit(cls._parse_log_shard, *shard_arguments))
+
+            while pending:
+                yield pending.popleft().result()
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("get")
+    def get(cls, query_string:Union[str, bytes], key:Union[str, Iterable[str]], default=None, 
+        numeric_mode:str="decimal"):
+        """
+        Gets the value of a key, or of several keys, from a query string without parsing the rest of it. Fields are
+        scanned from the end, since the last value of a repeated key is the one `parse()` keeps, and the scan stops
+        as soon as every key is found. Only the values of the keys found are decoded, and other fields are not
+        validated, unquoted or decoded
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string to search
+            key {Union[str, Iterable[str]]} -- The key to get, or a collection of keys
+
+        Keyword Arguments:
+            default -- The value to return if a single key is not in the query string (default: {None})
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Raises:
+            ValueError: If the query string is malformatted, a matching field is invalid, or the options are invalid
+
+        Returns:
+            The value `parse()` would return for the key, or default if it is missing. For a collection of keys, 
+            a dictionary of the keys found and their values, in the order they appear in the query string
+        """
+
+        cls._validate_numeric_mode(numeric_mode)
+        key_filter = cls._get_key_filter([key] if isinstance(key, str) else key, None)
+
+        remaining = set(key_filter[0])
+        found = []
+
+        for key_value in reversed(cls._split_query_string(query_string)):
+            if not cls._is_selected_field(key_value, key_filter, detected=True):
+                continue
+
+            field_key, value, _ = cls._decode_detected_pair(key_value, numeric_mode=numeric_mode)
+
+            if field_key in remaining:
+                found.append((field_key, value))
+                remaining.discard(field_key)
+
+                if not remaining:
+                    break
+
+        if isinstance(key, str):
+            return found[0][1] if found else default
+
+        return dict(reversed(found))
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("try_parse")
+    def try_parse(cls, query_string:Union[str, bytes], schema:"QueryStringSchema"=None, numeric_mode:str="decimal",
+        list_format:Optional[str]=None, keys:Optional[Iterable[str]]=None, exclude:Optional[Iterable[str]]=None,
+        lenient:bool=False) -> QueryStringParseResult:
+        """
+        Parses a query string like `parse()`, but returns a `QueryStringParseResult` holding the parsed data or the
+        error code, offset and key of the field that failed instead of raising. An error is caught once in the
+        field that raised it, so no exception reaches the caller. Results are not cached
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string to parse
+
+        Keyword Arguments:
+            schema {QueryStringSchema} -- See `parse()` (default: {None})
+            numeric_mode {str} -- See `parse()` (default: {"decimal"})
+            list_format {Optional[str]} -- See `parse()` (default: {None})
+            keys {Optional[Iterable[str]]} -- See `parse()` (default: {None})
+            exclude {Optional[Iterable[str]]} -- See `parse()` (default: {None})
+            lenient {bool} -- If fields that fail should be skipped and reported, keeping every other field,
+            instead of stopping at the first error (default: {False})
+
+        Raises:
+            ValueError: If the options are invalid
+
+        Returns:
+            QueryStringParseResult -- The parsed query string or its errors
+        """
+
+        cls._validate_numeric_mode(numeric_mode)
+        cls._validate_list_format(list_format)
+        key_filter = cls._get_key_filter(keys, exclude)
+
+        return cls._try_parse(query_string, partial(cls._parse, schema=schema, numeric_mode=numeric_mode, 
+            list_format=list_format, key_filter=key_filter), lenient, schema)
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("try_parse_base64_query_string")
+    def try_parse_base64_query_string(cls, query_string:Union[str, bytes], numeric_mode:str="decimal",
+        keys:Optional[Iterable[str]]=None, exclude:Optional[Iterable[str]]=None, lenient:bool=False) -> QueryStringParseResult:
+        """
+        Parses a base64 encoded query string like `parse_base64_query_string()`, but returns a
+        `QueryStringParseResult` instead of raising. See `try_parse()`
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string to parse
+
+        Keyword Arguments:
+            numeric_mode {str} -- See `parse()` (default: {"decimal"})
+            keys {Optional[Iterable[str]]} -- See `parse()` (default: {None})
+            exclude {Optional[Iterable[str]]} -- See `parse()` (default: {None})
+            lenient {bool} -- See `try_parse()` (default: {False})
+
+        Raises:
+            ValueError: If the options are invalid
+
+        Returns:
+            QueryStringParseResult -- The parsed query string or its errors
+        """
+
+        cls._validate_numeric_mode(numeric_mode)
+        key_filter = cls._get_key_filter(keys, exclude)
+
+        return cls._try_parse(query_string, partial(cls._parse_base64_query_string, numeric_mode=numeric_mode, 
+            key_filter=key_filter), lenient, base64_encoded=True)
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("try_parse_query_string")
+    def try_parse_query_string(cls, query_string:Union[str, bytes], normalize_value:bool=True, 
+        schema:"QueryStringSchema"=None, numeric_mode:str="decimal", list_format:Optional[str]=None, 
+        keys:Optional[Iterable[str]]=None, exclude:Optional[Iterable[str]]=None, lenient:bool=False) -> QueryStringParseResult:
+        """
+        Parses a standard query string like `parse_query_string()`, but returns a `QueryStringParseResult`
+        instead of raising. See `try_parse()`
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string to parse
+
+        Keyword Arguments:
+            normalize_value {bool} -- See `parse_query_string()` (default: {True})
+            schema {QueryStringSchema} -- See `parse_query_string()` (default: {None})
+            numeric_mode {str} -- See `parse()` (default: {"decimal"})
+            list_format {Optional[str]} -- See `parse_query_string()` (default: {None})
+            keys {Optional[Iterable[str]]} -- See `parse()` (default: {None})
+            exclude {Optional[Iterable[str]]} -- See `parse()` (default: {None})
+            lenient {bool} -- See `try_parse()` (default: {False})
+
+        Raises:
+            ValueError: If the options are invalid
+
+        Returns:
+            QueryStringParseResult -- The parsed query string or its errors
+        """
+
+        cls._validate_numeric_mode(numeric_mode)
+        cls._validate_list_format(list_format)
+        key_filter = cls._get_key_filter(keys, exclude)
+
+        return cls._try_parse(query_string, partial(cls._parse_query_string, normalize_value=normalize_value, 
+            schema=schema, numeric_mode=numeric_mode, list_format=list_format, key_filter=key_filter), lenient, schema)
+
+
+    @classmethod
+    def _parse(cls, query_string:Union[str, bytes], schema:"QueryStringSchema"=None, numeric_mode:str="decimal",
+        list_format:Optional[str]=None, key_filter:Optional[tuple]=None, on_error:Optional[Callable]=None) -> Optional[dict]:
+        """
+        Uncached implementation of `parse()`. See `_parse_lists()` for on_error
+        """
+
+        if list_format is not None:
+            return cls._parse_lists(query_string, lambda key_value: cls._decode_detected_pair(key_value, 
+                numeric_mode=numeric_mode)[:2], schema, list_format, key_filter, detected=True, on_error=on_error)
+
+        parsed_data = {}
+        fields = cls._split_query_string(query_string)
+
+        for (index, key_value) in enumerate(fields):
+            if key_filter is not None and not cls._is_selected_field(key_value, key_filter, detected=True):
+                continue
+
+            try:
+                if schema is not None:
+                    key_and_value = cls._decode_schema_pair(key_value, schema)
+                    if key_and_value is not None:
+                        parsed_data[key_and_value[0]] = key_and_value[1]
+                        continue
+
+                key, value, _ = cls._decode_detected_pair(key_value, numeric_mode=numeric_mode)
+            except ValueError as error:
+                if on_error is None:
+                    raise
+
+                if not on_error(fields, index, error):
+                    return None
+
+                continue
+
+            # The key of a field starting with "==" is only known once it is decoded
+            if key_filter is None or cls._is_selected_key(key, key_filter):
+                parsed_data[key] = value
+        
+        return parsed_data
+
+
+    @classmethod
+    def _parse_lazy(cls, query_string:Union[str, bytes], base64_encoded:bool=False, schema:"QueryStringSchema"=None, 
+        numeric_mode:str="decimal", key_filter:Optional[tuple]=None) -> LazyDict:
+        """
+        Implementation of `parse()` and `parse_base64_query_string()` for lazy results. Fields are split and keys
+        unquoted, but values are only decoded when they are read
+
+        Arguments:
+            query_string {str} -- The query string to parse
+
+        Keyword Arguments:
+            base64_encoded {bool} -- If every value is base64 encoded JSON, otherwise the encoding of each value is
+            detected (default: {False})
+            schema {QueryStringSchema} -- A compiled schema to decode known fields with (default: {None})
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+            key_filter {Optional[tuple]} -- The keys to decode and exclude, see `_get_key_filter()` (default: {None})
+
+        Raises:
+            ValueError: If the query string is malformatted, or contains a field unknown to the schema
+
+        Returns:
+            LazyDict -- The parsed query string
+        """
+
+        parsed_data = LazyDict()
+        decode_base64_value = partial(cls._decode_base64_value, numeric_mode=numeric_mode)
+        decode_detected_value = partial(cls._decode_detected_field_value, numeric_mode=numeric_mode)
+
+        for key_value in cls._split_query_string(query_string):
+            if key_filter is not None and not cls._is_selected_field(key_value, key_filter, detected=not base64_encoded,
+                base64_encoded=base64_encoded):
+                continue
+
+            if base64_encoded:
+                key, value = cls._split_pair(key_value, base64_encoded=True)
+                parsed_data._add_pending(key, decode_base64_value, value)
+                continue
+
+            if schema is not None:
+                key, value = cls._split_pair(key_value)
+                decoder = schema.decoders.get(key)
+
+                if decoder is not None:
+                    parsed_data._add_pending(key, decoder, value)
+                    continue
+
+                if not schema.allow_unknown:
+                    raise ValueError(f"Unexpected field in query string: {key}")
+
+            key_value = cls._strip_detected_field(key_value)
+
+            # The encoding of a field with a key of "=" decides the key, so it can't be deferred
+            if key_value[0:2] in ("==", b"=="):
+                key, value, _ = cls._decode_detected_pair(key_value, numeric_mode=numeric_mode)
+
+                if key_filter is None or cls._is_selected_key(key, key_filter):
+                    parsed_data._add(key, value)
+                continue
+
+            key, value = cls._split_pair(key_value)
+            parsed_data._add_pending(key, decode_detected_value, value)
+
+        return parsed_data
+
+
+    @classmethod
+    def _parse_base64_query_string(cls, query_string:Union[str, bytes], numeric_mode:str="decimal",
+        key_filter:Optional[tuple]=None, on_error:Optional[Callable]=None) -> Optional[dict]:
+        """
+        Uncached implementation of `parse_base64_query_string()`. See `_parse_lists()` for on_error
+        """
+        
+        parsed_data = {}
+        fields = cls._split_query_string(query_string)
+
+        for (index, key_value) in enumerate(fields):
+            if key_filter is not None and not cls._is_selected_field(key_value, key_filter, base64_encoded=True):
+                continue
+
+            try:
+                key, value = cls._decode_pair(key_value, base64_encoded=True, numeric_mode=numeric_mode)
+            except ValueError as error:
+                if on_error is None:
+                    raise
+
+                if not on_error(fields, index, error):
+                    return None
+
+                continue
+
+            parsed_data[key] = value
+
+        return parsed_data
+    
+    
+    @classmethod
+    def _parse_query_string(cls, query_string:Union[str, bytes], normalize_value:bool=True, schema:"QueryStringSchema"=None,
+        numeric_mode:str="decimal", list_format:Optional[str]=None, key_filter:Optional[tuple]=None, 
+        on_error:Optional[Callable]=None) -> Optional[dict]:
+        """
+        Uncached implementation of `parse_query_string()`. See `_parse_lists()` for on_error
+        """
+
+        if list_format is not None:
+            return cls._parse_lists(query_string, lambda key_value: cls._decode_pair(key_value, 
+                normalize_value=normalize_value, numeric_mode=numeric_mode), schema, list_format, key_filter, 
+                on_error=on_error)
+
+        parsed_data = {}
+        fields = cls._split_query_string(query_string)
+
+        for (index, key_value) in enumerate(fields):
+            if key_filter is not None and not cls._is_selected_field(key_value, key_filter):
+                continue
+
+            try:
+                if schema is not None:
+                    key_and_value = cls._decode_schema_pair(key_value, schema)
+                    if key_and_value is not None:
+                        parsed_data[key_and_value[0]] = key_and_value[1]
+                        continue
+
+                key, value = cls._decode_pair(key_value, normalize_value=normalize_value, numeric_mode=numeric_mode)
+            except ValueError as error:
+                if on_error is None:
+                    raise
+
+                if not on_error(fields, index, error):
+                    return None
+
+                continue
+
+            parsed_data[key] = value
+
+        return parsed_data
+
+
+    @classmethod
+    def _parse_lists(cls, query_string:Union[str, bytes], decode_pair:Callable, schema:Optional["QueryStringSchema"],
+        list_format:str, key_filter:Optional[tuple]=None, detected:bool=False, on_error:Optional[Callable]=None) -> Optional[dict]:
+        """
+        Parses a query string, collecting the values of repeated keys (and comma separated values) in lists
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string to parse
+            decode_pair {Callable} -- Decodes a "key=value" field that is not in the schema to a (key, value) pair
+            schema {Optional[QueryStringSchema]} -- A compiled schema to decode known fields with
+            list_format {str} -- "repeat" or "comma", see `parse_query_string()`
+
+        Keyword Arguments:
+            key_filter {Optional[tuple]} -- The keys to decode and exclude, see `_get_key_filter()` (default: {None})
+            detected {bool} -- If the encoding of each field is detected, as it is by `parse()` (default: {False})
+            on_error {Optional[Callable]} -- Called with the fields of the query string, the index of a field and
+            the `ValueError` it raised instead of raising it. Parsing continues with the next field if it returns
+            True and stops, returning None, if it returns False (default: {None})
+
+        Raises:
+            ValueError: If the query string is malformatted or invalid and on_error is None
+
+        Returns:
+            Optional[dict] -- The parsed query string, or None if on_error stopped parsing
+        """
+
+        parsed_data = {}
+
+        # Keys with a list built from the query string. A single value may be a list decoded from base64
+        lists = set()
+
+        fields = cls._split_query_string(query_string)
+
+        for (index, key_value) in enumerate(fields):
+            if key_filter is not None and not cls._is_selected_field(key_value, key_filter, detected=detected):
+                continue
+
+            is_str = isinstance(key_value, str)
+            comma = "," if is_str else b","
+            elements = [key_value]
+
+            # Split the value before it is unquoted, so quoted commas stay in the elements
+            if list_format == "comma" and comma in key_value:
+                key, equals, value = key_value.partition("=" if is_str else b"=")
+                if comma in value:
+                    elements = [key + equals + element for element in value.split(comma)]
+
+            # Every element is decoded before any is stored, so a field that fails is skipped whole
+            try:
+                pairs = []
+                for element in elements:
+                    key_and_value = cls._decode_schema_pair(element, schema) if schema is not None else None
+                    pairs.append(key_and_value if key_and_value is not None else decode_pair(element))
+            except ValueError as error:
+                if on_error is None:
+                    raise
+
+                if not on_error(fields, index, error):
+                    return None
+
+                continue
+
+            for (key, value) in pairs:
+                if key_filter is not None and not cls._is_selected_key(key, key_filter):
+                    continue
+
+                if key in lists:
+                    parsed_data[key].append(value)
+                elif key in parsed_data:
+                    parsed_data[key] = [parsed_data[key], value]
+                    lists.add(key)
+                elif len(elements) > 1:
+                    parsed_data[key] = [value]
+                    lists.add(key)
+                else:
+                    parsed_data[key] = value
+
+        return parsed_data
+    # -------------------------------------------------------- #
+
+    # --------------------- Canonical Form --------------------- #
+    @classmethod
+    @QueryStringMetrics.instrument("canonicalize")
+    def canonicalize(cls, query_string:Union[str, bytes], list_format:Optional[str]=None) -> str:
+        """
+        Creates the canonical form of a query string. Query strings that `parse()` decodes to the same values 
+        have the same canonical form, whatever the order of their fields, how they are percent-encoded, how
+        booleans are capitalized or how their base64 values are padded or compressed. The canonical form is
+        itself a query string that `parse()` decodes to the same values:
+
+        - Fields are sorted by key. Only the last value of a repeated key is kept, as `parse()` keeps it
+        - Keys and values are quoted with `CANONICAL_SAFE_CHARS`, using uppercase escapes
+        - Values that can be written in standard format are, with booleans in lowercase. Other values (lists,
+        dictionaries, null and strings that would be read as another type) are base64 encoded compact JSON
+        with sorted keys, which does not depend on the JSON backend
+        - Decimals are written without trailing zeros, as "1.5" for "1.50". Integral decimals keep one 
+        fractional zero, as "1.0", so they stay distinct from integers
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string
+
+        Keyword Arguments:
+            list_format {Optional[str]} -- How lists are read, see `parse()`. With "repeat" or "comma" repeated
+            keys are kept, and a list of two or more values is written as repeated keys whether it was written as
+            repeated keys, comma separated values or a base64 encoded list (default: {None})
+
+        Raises:
+            ValueError: If the query string is malformatted or invalid, or the list format is unknown
+
+        Returns:
+            str -- The canonical query string
+        """
+
+        cls._validate_list_format(list_format)
+
+        if cls._cache is not None and isinstance(query_string, (str, bytes)):
+            return cls._cache.get_or_parse(("canonicalize", query_string, list_format), cls._canonicalize, 
+                query_string, list_format)
+
+        return cls._canonicalize(query_string, list_format)
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("fingerprint")
+    def fingerprint(cls, query_string:Union[str, bytes], list_format:Optional[str]=None, digest_size:int=16) -> str:
+        """
+        Creates a stable hash of a query string for use in cache keys. The hash is the BLAKE2b digest of the 
+        canonical form (see `canonicalize()`), so query strings with the same values have the same fingerprint
+        in every process and on every machine
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string
+
+        Keyword Arguments:
+            list_format {Optional[str]} -- How lists are read, see `canonicalize()` (default: {None})
+            digest_size {int} -- The size of the digest in bytes, from 1 to 64 (default: {16})
+
+        Raises:
+            ValueError: If the query string is malformatted or invalid, or the options are invalid
+
+        Returns:
+            str -- The hexadecimal digest
+        """
+
+        cls._validate_list_format(list_format)
+
+        if not isinstance(digest_size, int) or isinstance(digest_size, bool) or not 1 <= digest_size <= 64:
+            raise ValueError("Cannot fingerprint a query string. Passed digest_size argument is not between 1 and 64")
+
+        if cls._cache is not None and isinstance(query_string, (str, bytes)):
+            return cls._cache.get_or_parse(("fingerprint", query_string, list_format, digest_size), cls._fingerprint, 
+                query_string, list_format, digest_size)
+
+        return cls._fingerprint(query_string, list_format, digest_size)
+
+
+    @classmethod
+    def _fingerprint(cls, query_string:Union[str, bytes], list_format:Optional[str]=None, digest_size:int=16) -> str:
+        """
+        Uncached implementation of `fingerprint()`
+        """
+
+        canonical = cls._canonicalize(query_string, list_format)
+        return hashlib.blake2b(canonical.encode("ascii"), digest_size=digest_size).hexdigest()
+
+
+    @classmethod
+    def _canonicalize(cls, query_string:Union[str, bytes], list_format:Optional[str]=None) -> str:
+        """
+        Uncached implementation of `canonicalize()`
+        """
+
+        table = QuoteTable.get(cls.CANONICAL_SAFE_CHARS)
+
+        # The canonical values of each key. Without a list format each value is made canonical as its field is 
+        # decoded, so only the text of the last value of each key is kept
+        if list_format is None:
+            values = {}
+
+            for key_value in cls._split_query_string(query_string):
+                key, value, _ = cls._decode_detected_pair(key_value)
+                values[key] = [cls._canonical_value(value, table)]
+        else:
+            values = {key: [cls._canonical_value(element, table) for element in value] 
+                if isinstance(value, list) and len(value) > 1 else [cls._canonical_value(value, table)]
+                for (key, value) in cls._parse(query_string, list_format=list_format).items()}
+
+        return "?" + "&".join(f"{table.quote_key(key)}={value}" for key in sorted(values) for value in values[key])
+
+
+    @classmethod
+    def _canonical_value(cls, value, table:QuoteTable) -> str:
+        """
+        Encodes a decoded value for a canonical query string
+
+        Arguments:
+            value -- The decoded value
+            table {QuoteTable} -- The table to quote standard format values with
+
+        Returns:
+            str -- The quoted standard format value, if `parse()` decodes it to the same value and type, otherwise 
+            the base64 encoded canonical JSON
+        """
+
+        value = cls._canonical_decimals(value)
+
+        if type(value) in (str, int, bool, Decimal):
+            text = value if type(value) is str else str(cls._normalize_value(value))
+            quoted = table.quote(text)
+
+            if quoted:
+                if cls._is_prefixed_value(quoted) or cls._is_base64_json_candidate(quoted):
+                    decoded, _ = cls._decode_detected_value(quoted)
+                else:
+                    decoded = cls._un_normalize_value(text)
+
+                if type(decoded) is type(value) and decoded == value:
+                    return quoted
+
+        return base64.urlsafe_b64encode(JsonBackend.canonical().dumps(value)).decode("ascii")
+
+
+    @classmethod
+    def _canonical_decimals(cls, value):
+        """
+        Gives equal decimals the same digits, in a decoded value and the lists and dictionaries it holds. 
+        Trailing zeros are removed, but integral decimals keep one fractional zero so they are not written 
+        as integers. Integral decimals with more than 28 digits (the default precision of decimals) keep their exponent
+
+        Arguments:
+            value -- The decoded value
+
+        Returns:
+            The value with its decimals in canonical form
+        """
+
+        if type(value) is Decimal:
+            if not value.is_finite():
+                return value
+
+            if not value:
+                return Decimal("0.0")
+
+            # The precision is the number of digits, so removing zeros never rounds the value
+            value = value.normalize(Context(prec=len(value.as_tuple().digits)))
+
+            if value.as_tuple().exponent >= 0 and value.adjusted() < 28:
+                value = value.quantize(Decimal("0.1"), context=Context(prec=30))
+
+            return value
+
+        if isinstance(value, list):
+            return [cls._canonical_decimals(element) for element in value]
+
+        if isinstance(value, dict):
+            return {key: cls._canonical_decimals(element) for (key, element) in value.items()}
+
+        return value
+    # -------------------------------------------------------- #
+
+    # ------------------------- URLs ------------------------- #
+    @classmethod
+    @QueryStringMetrics.instrument("merge_into_url")
+    def merge_into_url(cls, url:str, params:dict, safe_chars:Optional[str]=None, base64_encoded:Optional[bool]=None, 
+        compress:bool=False) -> str:
+        """
+        Adds fields to the query string of a URL, or replaces the fields with the same keys. See `replace_params()`
+
+        Arguments:
+            url {str} -- The URL
+            params {dict} -- The fields to set
+
+        Keyword Arguments:
+            safe_chars {Optional[str]} -- See `replace_params()` (default: {None})
+            base64_encoded {Optional[bool]} -- See `replace_params()` (default: {None})
+            compress {bool} -- See `replace_params()` (default: {False})
+
+        Raises:
+            ValueError: If the URL is not a string or a value cannot be encoded
+
+        Returns:
+            str -- The URL with the fields set
+        """
+
+        return cls._replace_params(url, params, None, safe_chars, base64_encoded, compress)
+
+
+    @classmethod
+    @QueryStringMetrics.instrument("replace_params")
+    def replace_params(cls, url:str, params:Optional[dict]=None, remove:Optional[Iterable[str]]=None, 
+        safe_chars:Optional[str]=None, base64_encoded:Optional[bool]=None, compress:bool=False) -> str:
+        """
+        Sets and removes fields in the query string of a URL without parsing it. The query string is found by 
+        scanning for the first "?" before the fragment, and only the keys of its fields are decoded. A field
+        that is set takes the place of the first field with its key and the others are removed, and new fields
+        are added at the end. Every other field, including fields that are malformatted, is kept exactly as it
+        was, as is the rest of the URL
+
+        Arguments:
+            url {str} -- The URL
+
+        Keyword Arguments:
+            params {Optional[dict]} -- The fields to set (default: {None})
+            remove {Optional[Iterable[str]]} -- The keys of fields to remove, unless they are set in params
+            (default: {None})
+            safe_chars {Optional[str]} -- An optional string of characters to not replace in the fields that are
+            set. By default `CANONICAL_SAFE_CHARS` is used, so a value cannot change how the URL is split 
+            (default: {None})
+            base64_encoded {Optional[bool]} -- If values should be encoded as base64 encoded JSON or in standard 
+            format. By default strings, numbers and booleans are encoded in standard format and lists and
+            dictionaries as base64 encoded JSON, so plain and base64 encoded fields can be mixed (default: {None})
+            compress {bool} -- If base64 encoded values should be compressed (default: {False})
+
+        Raises:
+            ValueError: If the URL is not a string, a key is not a string or a value cannot be encoded
+
+        Returns:
+            str -- The URL with the fields set and removed
+        """
+
+        return cls._replace_params(url, params, remove, safe_chars, base64_encoded, compress)
+
+
+    @classmethod
+    def _replace_params(cls, url:str, params:Optional[dict], remove:Optional[Iterable[str]], safe_chars:Optional[str], 
+        base64_encoded:Optional[bool], compress:bool) -> str:
+        """
+        Shared implementation of `merge_into_url()` and `replace_params()`
+
+        Arguments:
+            url {str} -- The URL
+            params {Optional[dict]} -- The fields to set
+            remove {Optional[Iterable[str]]} -- The keys of fields to remove
+            safe_chars {Optional[str]} -- The characters to not replace in the fields that are set
+            base64_encoded {Optional[bool]} -- If values should be encoded as base64 encoded JSON
+            compress {bool} -- If base64 encoded values should be compressed
+
+        Raises:
+            ValueError: If the URL is not a string, a key is not a string or a value cannot be encoded
+
+        Returns:
+            str -- The URL with the fields set and removed
+        """
+
+        if not isinstance(url, str):
+            raise ValueError("Cannot set the parameters of a URL. Passed url argument is not a string")
+
+        if params is not None and not isinstance(params, dict):
+            raise ValueError("Cannot set the parameters of a URL. Passed params argument is not a dictionary")
+
+        if remove is None:
+            remove = ()
+        elif isinstance(remove, (str, bytes)):
+            raise ValueError("Cannot set the parameters of a URL. Passed remove argument is not a collection of keys")
+
+        # Fields are encoded before the URL is changed, so nothing is returned if a value cannot be encoded
+        table = QuoteTable.get(safe_chars or cls.CANONICAL_SAFE_CHARS)
+        segments = {key: cls._encode_url_field(key, value, table, base64_encoded, compress) 
+            for (key, value) in (params or {}).items()}
+
+        changed = set(segments)
+        for key in remove:
+            if not isinstance(key, str):
+                raise ValueError("Cannot set the parameters of a URL. Passed keys must be strings")
+
+            changed.add(key)
+
+        if not changed:
+            return url
+
+        # The query string is everything between the first "?" and the fragment
+        query_end = url.find("#")
+        if query_end == -1:
+            query_end = len(url)
+
+        query_start = url.find("?", 0, query_end)
+        fields = url[query_start + 1:query_end].split("&") if query_start != -1 and query_start + 1 < query_end else []
+
+        kept = []
+        for key_value in fields:
+            key = cls._get_field_key(key_value)
+
+            if key not in changed:
+                kept.append(key_value)
+            elif key in segments:
+                kept.append(segments.pop(key))
+
+        kept.extend(segments.values())
+
+        # Empty fields are kept, but a query string left with only empty fields is removed
+        query_string = "?" + "&".join(kept) if any(kept) else ""
+        return url[:query_start if query_start != -1 else query_end] + query_string + url[query_end:]
+
+
+    @classmethod
+    def _encode_url_field(cls, key:str, value:Union[int, str, bool, float, Decimal, list, dict], table:QuoteTable, 
+        base64_encoded:Optional[bool], compress:bool) -> str:
+        """
+        Encodes a "key=value" field for `replace_params()`
+
+        Arguments:
+            key {str} -- The key
+            value {Union[int, str, bool, float, Decimal, list, dict]} -- The value
+            table {QuoteTable} -- The table the key and a standard format value are quoted with
+            base64_encoded {Optional[bool]} -- See `replace_params()`
+            compress {bool} -- If a base64 encoded value should be compressed
+
+        Raises:
+            ValueError: If the key is not a string or the value cannot be encoded
+
+        Returns:
+            str -- The encoded field
+        """
+
+        if not isinstance(key, str):
+            raise ValueError("Cannot set the parameters of a URL. Passed keys must be strings")
+
+        if base64_encoded is None:
+            base64_encoded = not isinstance(value, cls.STANDARD_TYPES)
+
+        if base64_encoded:
+            # Remove the "?q=" prefix
+            return f"{table.quote_key(key)}={cls.generate_base64_query_string(value, compress=compress)[3:]}"
+
+        if not isinstance(value, cls.STANDARD_TYPES):
+            raise ValueError("Cannot encode a standard format field. Passed value is a nested dictionary, a list "
+                "or an datatype that is not (int, float, bool, str)")
+
+        return f"{table.quote_key(key)}={table.quote(f'{cls._normalize_value(value)}')}"
+    # -------------------------------------------------------- #
+
+    # ----------------------- Caching ------------------------ #
+    @classmethod
+    def enable_cache(cls, max_size:int=1024) -> None:
+        """
+        Enables a bounded cache of parsed query strings for `parse()`, `parse_query_string()` and 
+        `parse_base64_query_string()`. Results are keyed on the raw query string and the options passed, and
+        the least recently used result is evicted when the cache is full.
+
+        While the cache is enabled parsed results are returned as read-only dictionaries shared between callers.
+        Call `copy()` on a result to get a mutable dictionary
+
+        Keyword Arguments:
+            max_size {int} -- The maximum number of parsed query strings to cache (default: {1024})
+
+        Raises:
+            ValueError: If the maximum size is not a positive integer
+        """
+
+        cls._cache = QueryStringCache(max_size)
+
+
+    @classmethod
+    def disable_cache(cls) -> None:
+        """
+        Disables and clears the cache of parsed query strings
+        """
+
+        cls._cache = None
+
+
+    @classmethod
+    def cache_stats(cls) -> Optional[dict]:
+        """
+        Gets statistics for the cache of parsed query strings
+
+        Returns:
+            Optional[dict] -- The number of hits, misses and evictions, and the current and maximum size of the cache,
+            or None if the cache is disabled
+        """
+
+        return cls._cache.stats() if cls._cache is not None else None
+    # -------------------------------------------------------- #
+
+    # ----------------------- Metrics ------------------------ #
+    @classmethod
+    def enable_metrics(cls) -> QueryStringMetrics:
+        """
+        Enables metrics for the encoders and decoders: call counts, errors and latency and size histograms for each
+        method, the number of values `parse()` tried to decode as base64 that fell back to standard format, and the
+        sizes of decoded base64 payloads. Metrics are disabled by default, and cost a single check per call until
+        they are enabled. Enabling metrics again resets them
+
+        Returns:
+            QueryStringMetrics -- The metrics, see `QueryStringMetrics.stats()` and `QueryStringMetrics.to_prometheus()`
+        """
+
+        cls._metrics = QueryStringMetrics()
+        return cls._metrics
+
+
+    @classmethod
+    def disable_metrics(cls) -> None:
+        """
+        Disables and clears the metrics
+        """
+
+        cls._metrics = None
+
+
+    @classmethod
+    def metrics_stats(cls) -> Optional[dict]:
+        """
+        Gets a snapshot of the metrics
+
+        Returns:
+            Optional[dict] -- See `QueryStringMetrics.stats()`, or None if metrics are disabled
+        """
+
+        return cls._metrics.stats() if cls._metrics is not None else None
+    # -------------------------------------------------------- #
+
+    # ----------------------- Limits ------------------------- #
+    @classmethod
+    def set_limits(cls, max_length:Optional[int]=None, max_pairs:Optional[int]=None, max_key_length:Optional[int]=None,
+        max_value_length:Optional[int]=None, max_decoded_bytes:Optional[int]=None, max_depth:Optional[int]=None,
+        max_digits:Optional[int]=None) -> None:
+        """
+        Sets limits on the query strings accepted by every decoder. Each limit is checked before the work it guards
+        (see `QueryStringLimits`), and a query string that exceeds one raises a `QueryStringLimitError`. Calling
+        this without arguments removes the limits. The cache of parsed query strings is cleared
+
+        Keyword Arguments:
+            max_length {Optional[int]} -- The maximum length of a query string (default: {None})
+            max_pairs {Optional[int]} -- The maximum number of fields in a query string (default: {None})
+            max_key_length {Optional[int]} -- The maximum raw length of a key (default: {None})
+            max_value_length {Optional[int]} -- The maximum raw length of a value (default: {None})
+            max_decoded_bytes {Optional[int]} -- The maximum size of a decoded base64 value in bytes (default: {None})
+            max_depth {Optional[int]} -- The maximum nesting depth of a base64 encoded value (default: {None})
+            max_digits {Optional[int]} -- The maximum number of digits in a number (default: {None})
+
+        Raises:
+            ValueError: If a limit is not a positive integer or None
+        """
+
+        limits = QueryStringLimits(max_length, max_pairs, max_key_length, max_value_length, max_decoded_bytes,
+            max_depth, max_digits)
+
+        cls._limits = limits if any(limit is not None for limit in limits.to_dict().values()) else None
+
+        # Results cached under the previous limits may exceed the new ones
+        if cls._cache is not None:
+            cls._cache.clear()
+
+
+    @classmethod
+    def limits(cls) -> dict:
+        """
+        Gets the limits set with `set_limits()`
+
+        Returns:
+            dict -- Each limit by name, None for limits that are not checked
+        """
+
+        return (cls._limits or QueryStringLimits()).to_dict()
+    # -------------------------------------------------------- #
+
+    # --------------------- JSON Backends -------------------- #
+    @classmethod
+    def set_json_backend(cls, name:Optional[str]=None) -> None:
+        """
+        Sets the JSON library base64 values are encoded and decoded with. By default values are decoded with the
+        fastest library installed, and encoded with the fastest one that produces the same query strings as the
+        standard library. See `JsonBackend` for the registered backends
+
+        Keyword Arguments:
+            name {Optional[str]} -- The name of the backend to use for both, or None to choose them automatically
+            (default: {None})
+
+        Raises:
+            ValueError: If the backend is not registered or its library is not installed
+        """
+
+        backend = JsonBackend.get(name) if name is not None else None
+        cls._json_encoder = cls._json_decoder = backend
+
+
+    @classmethod
+    def json_backends(cls) -> dict:
+        """
+        Gets the JSON backends in use
+
+        Returns:
+            dict -- The names of the backends base64 values are encoded and decoded with
+        """
+
+        return {"encoder": cls._get_json_encoder().name, "decoder": cls._get_json_decoder().name}
+
+
+    @classmethod
+    def _get_json_encoder(cls) -> JsonBackend:
+        """
+        Returns:
+            JsonBackend -- The backend base64 values are encoded with, chosen the first time it is needed
+        """
+
+        if cls._json_encoder is None:
+            cls._json_encoder = JsonBackend.best(matches_stdlib=True)
+
+        return cls._json_encoder
+
+
+    @classmethod
+    def _get_json_decoder(cls) -> JsonBackend:
+        """
+        Returns:
+            JsonBackend -- The backend base64 values are decoded with, chosen the first time it is needed
+        """
+
+        if cls._json_decoder is None:
+            cls._json_decoder = JsonBackend.best()
+
+        return cls._json_decoder
+    # -------------------------------------------------------- #
+
+    # -----------------------   Utils  ----------------------- #
+    @staticmethod
+    def _get_writer(out:Union[bytearray, io.IOBase]) -> Callable[[bytes], int]:
+        """
+        Get a function that writes ASCII bytes to a buffer or file and returns the number written
+
+        Arguments:
+            out {Union[bytearray, io.IOBase]} -- The `bytearray` to append to, or the binary or text file object
+
+        Raises:
+            ValueError: If out is not a `bytearray` or an object with a `write()` method
+
+        Returns:
+            Callable[[bytes], int] -- The writer
+        """
+
+        if isinstance(out, bytearray):
+            def write(chunk:bytes) -> int:
+                out.extend(chunk)
+                return len(chunk)
+
+        elif isinstance(out, io.TextIOBase):
+            def write(chunk:bytes) -> int:
+                out.write(chunk.decode("ascii"))
+                return len(chunk)
+
+        elif callable(getattr(out, "write", None)):
+            def write(chunk:bytes) -> int:
+                out.write(chunk)
+                return len(chunk)
+
+        else:
+            raise ValueError("Cannot write a query string. Passed out argument is not a bytearray or a file object")
+
+        return write
+
+
+    @staticmethod
+    def _validate_chunk_size(chunk_size:int) -> None:
+        """
+        Validates the chunk size of a writer
+
+        Arguments:
+            chunk_size {int} -- The chunk size
+
+        Raises:
+            ValueError: If the chunk size is not a positive integer
+        """
+
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1:
+            raise ValueError("Cannot write a query string. Passed chunk_size argument is not a positive integer")
+
+
+    @staticmethod
+    def _get_key_filter(keys:Optional[Iterable[str]], exclude:Optional[Iterable[str]]) -> Optional[tuple]:
+        """
+        Validates the keys a decoder should decode and exclude
+
+        Arguments:
+            keys {Optional[Iterable[str]]} -- The keys to decode, or None for every key
+            exclude {Optional[Iterable[str]]} -- The keys to skip, or None
+
+        Raises:
+            ValueError: If keys or exclude is not a collection of strings
+
+        Returns:
+            Optional[tuple] -- The (keys, exclude) frozensets, either of which may be None, or None if every key 
+            is decoded
+        """
+
+        if keys is None and exclude is None:
+            return None
+
+        key_filter = []
+
+        for (name, selection) in (("keys", keys), ("exclude", exclude)):
+            if selection is not None:
+                try:
+                    selection = frozenset(selection) if not isinstance(selection, (str, bytes)) else None
+                except TypeError:
+                    selection = None
+
+                if selection is None or not all(isinstance(key, str) for key in selection):
+                    raise ValueError(f"Cannot parse query string. Passed {name} argument is not a collection of strings")
+
+            key_filter.append(selection)
+
+        return tuple(key_filter)
+
+
+    @staticmethod
+    def _is_selected_key(key:str, key_filter:tuple) -> bool:
+        """
+        Arguments:
+            key {str} -- An unquoted key
+            key_filter {tuple} -- The keys to decode and exclude, see `_get_key_filter()`
+
+        Returns:
+            bool -- If the field with the key should be decoded
+        """
+
+        keys, exclude = key_filter
+        return (keys is None or key in keys) and (exclude is None or key not in exclude)
+
+
+    @classmethod
+    def _is_selected_field(cls, key_value:Union[str, bytes], key_filter:tuple, detected:bool=False, 
+        base64_encoded:bool=False) -> bool:
+        """
+        Checks if a field should be decoded from its raw key alone, so the value of a field that is skipped is 
+        never unquoted or decoded. The field is not validated
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The raw "key=value" field
+            key_filter {tuple} -- The keys to decode and exclude, see `_get_key_filter()`
+
+        Keyword Arguments:
+            detected {bool} -- If the encoding of the field is detected, as it is by `parse()` (default: {False})
+            base64_encoded {bool} -- If the value is base64 encoded JSON rather than standard format (default: {False})
+
+        Returns:
+            bool -- If the field may hold a selected key. When the encoding of a field starting with "==" is detected
+            its key is either "=" or "", so it is selected if either is and the key must be checked once decoded
+        """
+
+        equals = "=" if isinstance(key_value, str) else b"="
+
+        if detected and key_value[0:1] in ("?", b"?"):
+            key_value = key_value[1:]
+
+        if key_value[0:2] == equals * 2:
+            if detected:
+                return cls._is_selected_key("=", key_filter) or cls._is_selected_key("", key_filter)
+
+            if base64_encoded:
+                return cls._is_selected_key("=", key_filter)
+
+        return cls._is_selected_key(cls._unquote_key(key_value.partition(equals)[0]), key_filter)
+
+
+    @classmethod
+    def _split_query_string(cls, query_string:Union[str, bytes, bytearray, memoryview]) -> list:
+        """
+        Splits a query string into its "key=value" fields, removing the optional "?" prefix. Bytes are
+        split without being decoded to text. The length and fields of the query string are checked against
+        the limits before and after it is split
+
+        Arguments:
+            query_string {Union[str, bytes, bytearray, memoryview]} -- The query string to split
+
+        Raises:
+            ValueError: If a string was not passed or it contains no fields
+            QueryStringLimitError: If the query string exceeds a limit
+
+        Returns:
+            list -- The unparsed "key=value" fields of the query string
+        """
+
+        # Ensure a string was passed. Other buffers are split as bytes
+        if isinstance(query_string, (bytearray, memoryview)):
+            query_string = bytes(query_string)
+        elif not isinstance(query_string, (str, bytes)):
+            raise ValueError("Cannot parse a query string from an object that is not a string")
+
+        limits = cls._limits
+        if limits is not None:
+            limits.check_query_string(query_string)
+        
+        # Remove "?" if it's at the beginning
+        if query_string[0:1] in ("?", b"?"):
+            query_string = query_string[1:]
+
+        # Split fields if multiple fields
+        key_value_pairs = query_string.split("&" if isinstance(query_string, str) else b"&")
+        if len(key_value_pairs) < 1:
+            raise ValueError("Cannot parse a query string from an empty string")
+
+        if limits is not None:
+            limits.check_fields(key_value_pairs)
+
+        return key_value_pairs
+
+
+    @classmethod
+    def _decode_pair(cls, key_value:Union[str, bytes], base64_encoded:bool=False, normalize_value:bool=True, 
+        numeric_mode:str="decimal") -> tuple:
+        """
+        Decodes a single "key=value" field of a query string. This is shared by every decoder so
+        fields are split and validated in exactly one place
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to decode
+
+        Keyword Arguments:
+            base64_encoded {bool} -- If the value is base64 encoded JSON rather than standard format (default: {False})
+            normalize_value {bool} -- If a standard format value should be normalized to a Python object (default: {True})
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Raises:
+            ValueError: If the field is malformatted or the value cannot be decoded
+
+        Returns:
+            tuple -- The decoded (key, value) pair
+        """
+
+        key, value = cls._split_pair(key_value, base64_encoded)
+
+        if base64_encoded:
+            return key, cls._decode_base64_value(value, numeric_mode)
+
+        return key, cls._decode_value(value, normalize_value, numeric_mode)
+
+
+    @classmethod
+    def _split_pair(cls, key_value:Union[str, bytes], base64_encoded:bool=False) -> tuple:
+        """
+        Splits a single "key=value" field of a query string and unquotes the key. The value is not decoded
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to split
+
+        Keyword Arguments:
+            base64_encoded {bool} -- If the value is base64 encoded JSON rather than standard format (default: {False})
+
+        Raises:
+            ValueError: If the field is malformatted
+
+        Returns:
+            tuple -- The (key, raw value) pair. The raw value is the same type as the field
+        """
+
+        equals = "=" if isinstance(key_value, str) else b"="
+
+        if base64_encoded:
+            # If the key happens to be "=", handle that
+            if key_value[0:2] == equals * 2:
+                key_and_value = [equals, key_value.lstrip(equals)]
+            else:
+                key_and_value = key_value.split(equals, 1)
+
+            if len(key_and_value) != 2:
+                raise ValueError("Malformatted query string")
+
+            return cls._unquote_key(key_and_value[0]), key_and_value[1]
+
+        key_and_value = key_value.split(equals, 1)
+
+        if len(key_and_value) != 2 or not key_and_value[1]:
+            raise ValueError("Malformatted query string")
+
+        return cls._unquote_key(key_and_value[0]), key_and_value[1]
+
+
+    @staticmethod
+    def _unquote(value:Union[str, bytes]) -> str:
+        """
+        Replaces URL escapes in a raw key or value. Bytes are percent-decoded before they are decoded as UTF-8, 
+        giving the same result as `urllib.parse.unquote()` on the equivalent string
+
+        Arguments:
+            value {Union[str, bytes]} -- The raw key or value
+
+        Returns:
+            str -- The unquoted text
+        """
+
+        if isinstance(value, str):
+            return unquote(value) if "%" in value else value
+
+        if b"%" not in value:
+            return bytes(value).decode("UTF-8", "replace")
+
+        return unquote_to_bytes(bytes(value)).decode("UTF-8", "replace")
+
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _unquote_key(key:Union[str, bytes]) -> str:
+        """
+        Replaces URL escapes in a raw key like `_unquote()`. The set of keys is usually small, so the most
+        recently used keys are kept
+
+        Arguments:
+            key {Union[str, bytes]} -- The raw key
+
+        Returns:
+            str -- The unquoted key
+        """
+
+        return QueryStringManager._unquote(key)
+
+
+    @classmethod
+    def _decode_value(cls, value:Union[str, bytes], normalize_value:bool=True, 
+        numeric_mode:str="decimal") -> Union[int, str, bool, Decimal, float]:
+        """
+        Decodes a raw standard format value
+
+        Arguments:
+            value {Union[str, bytes]} -- The raw value
+
+        Keyword Arguments:
+            normalize_value {bool} -- If the value should be normalized to a Python object (default: {True})
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Returns:
+            Union[int, str, bool, Decimal, float] -- The decoded value
+        """
+
+        # Convert data
+        value = cls._unquote(value)
+        return cls._un_normalize_value(value, numeric_mode) if normalize_value else value
+
+
+    @classmethod
+    def _decode_detected_pair(cls, key_value:Union[str, bytes], normalize_value:bool=True, numeric_mode:str="decimal") -> tuple:
+        """
+        Decodes a single "key=value" field of a query string in either format, detecting the encoding with
+        `_is_base64_json_candidate()`
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to decode
+
+        Keyword Arguments:
+            normalize_value {bool} -- If a standard format value should be normalized to a Python object (default: {True})
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Raises:
+            ValueError: If the field is malformatted or the value cannot be decoded
+
+        Returns:
+            tuple -- The decoded (key, value, base64_encoded) field
+        """
+
+        key_value = cls._strip_detected_field(key_value)
+
+        # A key of "=" can only be read from a base64 encoded field, so the encoding decides the key
+        if key_value[0:2] in ("==", b"=="):
+            if cls._is_base64_json_candidate(cls._get_base64_value(key_value)):
+                try:
+                    return cls._decode_pair(key_value, base64_encoded=True, numeric_mode=numeric_mode) + (True,)
+                except Exception:
+                    # The value only looked like base64 encoded JSON
+                    pass
+
+            return cls._decode_pair(key_value, normalize_value=normalize_value, numeric_mode=numeric_mode) + (False,)
+
+        key, value = cls._split_pair(key_value)
+        return (key,) + cls._decode_detected_value(value, normalize_value, numeric_mode)
+
+
+    @staticmethod
+    def _strip_detected_field(key_value:Union[str, bytes]) -> Union[str, bytes]:
+        """
+        Validates a field for decoding with its encoding detected, and removes the "?" prefix it may carry
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to prepare
+
+        Raises:
+            ValueError: If the field has no value
+
+        Returns:
+            Union[str, bytes] -- The field without a "?" prefix
+        """
+
+        equals = "=" if isinstance(key_value, str) else b"="
+
+        # If the key happens to be "=", handle that
+        if key_value[0:2] != equals * 2 and equals not in key_value:
+            raise ValueError("Malformatted query string")
+
+        # Each field may carry its own "?" prefix
+        if key_value[0:1] in ("?", b"?"):
+            key_value = key_value[1:]
+
+        return key_value
+
+
+    @classmethod
+    def _decode_detected_field_value(cls, value:Union[str, bytes], numeric_mode:str="decimal") -> Union[int, str, bool, 
+        Decimal, float, list, dict, None]:
+        """
+        Decodes a raw value in either format for a `LazyDict`
+
+        Arguments:
+            value {Union[str, bytes]} -- The raw value
+
+        Keyword Arguments:
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Returns:
+            The decoded value
+        """
+
+        return cls._decode_detected_value(value, numeric_mode=numeric_mode)[0]
+
+
+    @classmethod
+    def _decode_detected_value(cls, value:Union[str, bytes], normalize_value:bool=True, numeric_mode:str="decimal") -> tuple:
+        """
+        Decodes a raw value in either format, detecting the encoding with `_is_base64_json_candidate()`
+
+        Arguments:
+            value {Union[str, bytes]} -- The raw value
+
+        Keyword Arguments:
+            normalize_value {bool} -- If a standard format value should be normalized to a Python object (default: {True})
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Returns:
+            tuple -- The decoded (value, base64_encoded) pair
+        """
+
+        if cls._is_prefixed_value(value) or cls._is_base64_json_candidate(value):
+            try:
+                return cls._decode_base64_value(value, numeric_mode), True
+            except QueryStringLimitError:
+                raise
+            except Exception:
+                # The value only looked like base64 encoded JSON
+                if cls._metrics is not None:
+                    cls._metrics.count_fallback()
+
+        return cls._decode_value(value, normalize_value, numeric_mode), False
+
+
+    @classmethod
+    def _parse_raw_row(cls, query_string:Union[str, bytes], key_filter:Optional[tuple], row:dict, 
+        numeric_mode:str="decimal") -> None:
+        """
+        Parses a query string for `parse_many()`. Base64 encoded values are decoded, but standard format values 
+        are only unquoted so their type can be inferred for a whole chunk of rows
+
+        Arguments:
+            query_string {str} -- The query string to parse
+            key_filter {Optional[tuple]} -- The fields to decode and exclude (see `_get_key_filter()`), or None to
+            decode every field
+            row {dict} -- The dictionary to store the field names and values in. Decoded base64 values are wrapped
+            in a `_DecodedValue`
+
+        Keyword Arguments:
+            numeric_mode {str} -- How fractional numbers in base64 values are converted, see `parse()` (default: {"decimal"})
+
+        Raises:
+            ValueError: If the query string is malformatted or invalid
+        """
+
+        for key_value in cls._split_query_string(query_string):
+            # Skip fields that are not selected without decoding their value
+            if key_filter is not None and not cls._is_selected_field(key_value, key_filter, detected=True):
+                continue
+
+            key, value, base64_encoded = cls._decode_detected_pair(key_value, normalize_value=False, numeric_mode=numeric_mode)
+
+            # Numbers are converted for a whole chunk of rows, so their digits are checked here
+            if cls._limits is not None and not base64_encoded:
+                cls._limits.check_number(value)
+
+            if key_filter is None or cls._is_selected_key(key, key_filter):
+                row[key] = _DecodedValue(value) if base64_encoded else value
+
+
+    @staticmethod
+    def _find_log_shards(path:str, shard_size:int) -> list:
+        """
+        Splits a file into shards of roughly equal size that start and end on a line boundary
+
+        Arguments:
+            path {str} -- The path of the file
+            shard_size {int} -- The approximate number of bytes in each shard
+
+        Returns:
+            list -- The (start, end) byte offsets of each shard
+        """
+
+        shards = []
+
+        with open(path, "rb") as log_file:
+            size = os.fstat(log_file.fileno()).st_size
+            if size == 0:
+                return shards
+
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+                start = 0
+                while start < size:
+                    # Extend each shard to the end of the line it would split
+                    end = log_map.find(b"\n", min(start + shard_size, size) - 1)
+                    end = size if end == -1 else end + 1
+
+                    shards.append((start, end))
+                    start = end
+
+        return shards
+
+
+    @classmethod
+    def _parse_log_shard(cls, path:str, start:int, end:int, output:str, columns:Optional[list], 
+        skip_invalid:bool, exclude:Optional[list]=None) -> Union[dict, bytes]:
+        """
+        Parses the query strings in a shard of a log file. This runs in a worker process for `parse_file()`
+
+        Arguments:
+            path {str} -- The path of the log file
+            start {int} -- The byte offset of the start of the shard
+            end {int} -- The byte offset of the end of the shard
+            output {str} -- "columns" or "jsonl", see `parse_file()`
+            columns {Optional[list]} -- The fields to decode, or None to decode every field
+            skip_invalid {bool} -- If malformatted query strings should be treated as having no fields
+
+        Keyword Arguments:
+            exclude {Optional[list]} -- Fields to skip without decoding (default: {None})
+
+        Raises:
+            ValueError: If a query string is malformatted and skip_invalid is False
+
+        Returns:
+            Union[dict, bytes] -- The columns of the shard, or a block of JSON lines
+        """
+
+        with open(path, "rb") as log_file:
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+                # Query strings are parsed from bytes, the lines are never decoded
+                query_strings = [match.group(1) for match in cls._LOG_QUERY_STRING_PATTERN.finditer(log_map, start, end)]
+
+        if output == "columns":
+            return cls.parse_many(query_strings, columns=columns, skip_invalid=skip_invalid, exclude=exclude)
+
+        lines = []
+        for query_string in query_strings:
+            try:
+                parsed_data = cls.parse(query_string, keys=columns, exclude=exclude)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+
+                parsed_data = {}
+
+            lines.append(cls._get_json_encoder().dumps(parsed_data))
+
+        return b"".join(line + b"\n" for line in lines)
+
+
+    @classmethod
+    def _flush_column_chunk(cls, columns:dict, chunk:dict, numeric_mode:str="decimal") -> None:
+        """
+        Infers the type of each column in a chunk of raw values and appends the converted chunk to the column.
+        The chunk is emptied
+
+        Arguments:
+            columns {dict} -- The field names mapped to their `QueryStringColumn`
+            chunk {dict} -- The field names mapped to the raw values of the chunk
+
+        Keyword Arguments:
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+        """
+
+        for (name, values) in chunk.items():
+            if values:
+                mask = bytearray(value is None for value in values)
+                columns[name].extend(*cls._infer_column_chunk(values, numeric_mode), mask)
+                values.clear()
+
+
+    @classmethod
+    def _infer_column_chunk(cls, values:list, numeric_mode:str="decimal") -> tuple:
+        """
+        Infers the type of a chunk of raw values from a single column once, and converts the chunk to it. The
+        values are the same as `_un_normalize_value()` would produce for each value
+
+        Arguments:
+            values {list} -- The unquoted standard format values, `_DecodedValue` for base64 encoded values 
+            or None for missing values
+
+        Keyword Arguments:
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Returns:
+            tuple -- The type of the chunk (see `QueryStringColumn`) and its converted values
+        """
+
+        present = [value for value in values if value is not None]
+
+        if not present:
+            return "null", values
+
+        if all(type(value) is str for value in present):
+            # Integers are stored in an array when they fit
+            digits = [value[1:] if value[:1] == "-" else value for value in present]
+
+            if all(number.isdecimal() for number in digits):
+                try:
+                    return "int", array("q", (0 if value is None else int(value) for value in values))
+                except OverflowError:
+                    pass
+
+            elif all(value in cls._BOOLEANS for value in present):
+                return "bool", array("b", (value is not None and value.lower() == "true" for value in values))
+
+            # Floats are stored in an array when every value is a fractional number. Integers are not promoted
+            # to floats, so a column mixing both holds objects
+            elif numeric_mode == "float" and all("." in number and number.replace(".", "", 1).isdecimal() 
+                for number in digits):
+                return "float", array("d", (0.0 if value is None else float(value) for value in values))
+
+        converted = [value if value is None else value.value if type(value) is _DecodedValue else \
+            cls._un_normalize_value(value, numeric_mode) for value in values]
+
+        types = {type(value) for value in converted if value is not None}
+        dtype = "decimal" if types == {Decimal} else "str" if types == {str} else "object"
+
+        return dtype, converted
+
+
+    @classmethod
+    def _decode_schema_pair(cls, key_value:Union[str, bytes], schema:"QueryStringSchema") -> Optional[tuple]:
+        """
+        Decodes a single "key=value" field of a query string with the decoder a schema binds to its key.
+        The key is checked against the schema before the value is decoded
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to decode
+            schema {QueryStringSchema} -- The compiled schema for the query string
+
+        Raises:
+            ValueError: If the field is malformatted, its key is unknown and the schema does not allow unknown
+            fields, or the value is invalid for its type
+
+        Returns:
+            Optional[tuple] -- The decoded (key, value) pair, or None if the key is unknown and should be 
+            decoded without the schema
+        """
+
+        key, value = cls._split_pair(key_value)
+        decoder = schema.decoders.get(key)
+
+        if decoder is None:
+            if schema.allow_unknown:
+                return None
+
+            raise ValueError(f"Unexpected field in query string: {key}")
+
+        return key, decoder(value)
+
+
+    @classmethod
+    def _decode_base64_value(cls, value:Union[str, bytes], numeric_mode:str="decimal") -> Union[int, str, bool, Decimal, 
+        float, list, dict, None]:
+        """
+        Decodes a base64 encoded JSON value, decompressing it first if it starts with `COMPRESSED_PREFIX`, or a
+        binary payload if it starts with `BINARY_PREFIX` or `COMPRESSED_BINARY_PREFIX`. 
+        Floating point data will be converted for the numeric mode
+
+        Arguments:
+            value {Union[str, bytes]} -- The base64 encoded value
+
+        Keyword Arguments:
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Raises:
+            ValueError: If the value is not base64 encoded JSON, or is nested too deeply to decode
+            QueryStringLimitError: If the value decompresses to more than `MAX_DECOMPRESSED_SIZE` bytes, or exceeds
+            a limit
+
+        Returns:
+            The decoded value
+        """
+
+        # Decoding bytes drops the characters that are not base64, which a string rejects, so bytes are checked
+        # to decode like the equivalent string
+        if isinstance(value, bytes) and not value.isascii():
+            raise ValueError("Cannot decode base64 encoded value. It holds characters that are not ASCII")
+
+        limits = cls._limits
+        binary, compressed = cls._PREFIXED_FORMATS.get(value[:2], (False, False))
+
+        if compressed:
+            data = cls._decompress_value(value)
+        else:
+            if limits is not None:
+                limits.check_encoded_size(value)
+
+            data = cls._decode_unpadded(value[2:]) if binary else base64.urlsafe_b64decode(value)
+
+        if limits is not None:
+            if limits.max_decoded_bytes is not None and len(data) > limits.max_decoded_bytes:
+                limits.raise_decoded_size(limits.max_decoded_bytes)
+
+            if not binary:
+                limits.check_json(data)
+
+        # Values nested deeper than the recursion limit are invalid like any other value that cannot be decoded
+        try:
+            if binary:
+                decoded = BinaryPayload.loads(data, cls.NUMERIC_MODES[numeric_mode], limits)
+            else:
+                decoder = cls._json_decoder or cls._get_json_decoder()
+                decoded = decoder.loads(data, cls.NUMERIC_MODES[numeric_mode])
+        except RecursionError:
+            raise ValueError("Cannot decode base64 encoded value. It is nested too deeply") from None
+
+        if cls._metrics is not None:
+            cls._metrics.observe_payload(len(data))
+
+        return decoded
+
+
+    @classmethod
+    def _is_prefixed_value(cls, value:Union[str, bytes]) -> bool:
+        """
+        Checks if a raw value starts with `COMPRESSED_PREFIX`, `BINARY_PREFIX` or `COMPRESSED_BINARY_PREFIX`
+
+        Arguments:
+            value {Union[str, bytes]} -- The raw value
+
+        Returns:
+            bool -- If the value is a compressed or binary base64 encoded value
+        """
+
+        return value[:2] in cls._PREFIXED_FORMATS
+
+
+    @classmethod
+    def _compress_value(cls, data:bytes, prefix:str=COMPRESSED_PREFIX) -> str:
+        """
+        Deflates JSON (or a binary payload) and encodes it to base64url without padding, prefixed with 
+        `COMPRESSED_PREFIX`
+
+        Arguments:
+            data {bytes} -- The JSON to compress
+
+        Keyword Arguments:
+            prefix {str} -- The prefix of the value (default: {COMPRESSED_PREFIX})
+
+        Returns:
+            str -- The compressed value
+        """
+
+        # Raw deflate without the zlib header and checksum, as the JSON is validated when it is decoded
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+
+        return prefix + base64.urlsafe_b64encode(compressed).rstrip(b"=").decode('UTF-8')
+
+
+    @classmethod
+    def _decompress_value(cls, value:Union[str, bytes]) -> bytes:
+        """
+        Decodes and inflates a value created by `_compress_value()`. Inflating stops as soon as the output
+        exceeds `MAX_DECOMPRESSED_SIZE` (or the max_decoded_bytes limit if it is lower), so a small value cannot
+        expand to an unbounded size
+
+        Arguments:
+            value {Union[str, bytes]} -- The compressed value, including the prefix
+
+        Raises:
+            ValueError: If the value is not valid compressed data
+            QueryStringLimitError: If the value decompresses to more than `MAX_DECOMPRESSED_SIZE` bytes or the limit
+
+        Returns:
+            bytes -- The decompressed JSON
+        """
+
+        max_size = cls.MAX_DECOMPRESSED_SIZE
+        if cls._limits is not None and cls._limits.max_decoded_bytes is not None:
+            max_size = min(max_size, cls._limits.max_decoded_bytes)
+
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+        try:
+            decompressed = decompressor.decompress(cls._decode_unpadded(value[2:]), max_size + 1)
+        except zlib.error as error:
+            raise ValueError(f"Cannot decompress base64 encoded value. {error}")
+
+        if len(decompressed) > max_size:
+            QueryStringLimits.raise_decoded_size(max_size)
+
+        if not decompressor.eof:
+            raise ValueError("Cannot decompress base64 encoded value. The compressed data is incomplete")
+
+        return decompressed
+
+
+    @staticmethod
+    def _decode_unpadded(data:Union[str, bytes]) -> bytes:
+        """
+        Decodes base64url that may be missing its padding
+
+        Arguments:
+            data {Union[str, bytes]} -- The base64url encoded data
+
+        Returns:
+            bytes -- The decoded data
+        """
+
+        return base64.urlsafe_b64decode(data + ("=" if isinstance(data, str) else b"=") * (-len(data) % 4))
+
+
+    @classmethod
+    def _try_parse(cls, query_string:Union[str, bytes], parse:Callable, lenient:bool, 
+        schema:"QueryStringSchema"=None, base64_encoded:bool=False) -> QueryStringParseResult:
+        """
+        Shared implementation of `try_parse()` and its variants
+
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string to parse
+            parse {Callable} -- The uncached parser, called with the query string and an on_error handler
+            lenient {bool} -- If fields that fail should be skipped
+
+        Keyword Arguments:
+            schema {QueryStringSchema} -- The schema the parser decodes with (default: {None})
+            base64_encoded {bool} -- If every value is base64 encoded JSON (default: {False})
+
+        Returns:
+            QueryStringParseResult -- The parsed query string or its errors
+        """
+
+        if not isinstance(query_string, (str, bytes, bytearray, memoryview)):
+            return QueryStringParseResult(None, [(QueryStringParseResult.NOT_A_STRING, 0, None, 
+                "Cannot parse a query string from an object that is not a string")])
+
+        errors = []
+
+        def on_error(fields:list, index:int, error:ValueError) -> bool:
+            key = cls._get_field_key(fields[index])
+            errors.append((cls._get_error_code(error, key, schema, base64_encoded), 
+                cls._get_field_offset(query_string, fields, index), key, str(error)))
+
+            return lenient
+
+        try:
+            parsed_data = parse(query_string, on_error=on_error)
+        except ValueError as error:
+            # Only the query string as a whole fails outside of a field, such as the max_length limit
+            code = QueryStringParseResult.LIMIT_EXCEEDED if isinstance(error, QueryStringLimitError) else \
+                QueryStringParseResult.MALFORMED_QUERY_STRING
+
+            return QueryStringParseResult(None, [(code, 0, None, str(error))])
+
+        return QueryStringParseResult(parsed_data, errors)
+
+
+    @staticmethod
+    def _get_error_code(error:ValueError, key:Optional[str], schema:"QueryStringSchema"=None, 
+        base64_encoded:bool=False) -> str:
+        """
+        Arguments:
+            error {ValueError} -- The error a field raised
+            key {Optional[str]} -- The key of the field, or None if it could not be read
+
+        Keyword Arguments:
+            schema {QueryStringSchema} -- The schema the field was decoded with (default: {None})
+            base64_encoded {bool} -- If the value of the field is base64 encoded JSON (default: {False})
+
+        Returns:
+            str -- The `QueryStringParseResult` error code of the error
+        """
+
+        if isinstance(error, QueryStringLimitError):
+            return QueryStringParseResult.LIMIT_EXCEEDED
+
+        if key is None:
+            return QueryStringParseResult.MALFORMED_FIELD
+
+        if schema is not None and not schema.allow_unknown and key not in schema.decoders:
+            return QueryStringParseResult.UNKNOWN_FIELD
+
+        return QueryStringParseResult.INVALID_BASE64 if base64_encoded else QueryStringParseResult.INVALID_VALUE
+
+
+    @staticmethod
+    def _get_field_offset(query_string:Union[str, bytes], fields:list, index:int) -> int:
+        """
+        Arguments:
+            query_string {Union[str, bytes]} -- The query string
+            fields {list} -- The fields `_split_query_string()` split it into
+            index {int} -- The index of a field
+
+        Returns:
+            int -- The position of the start of the field in the query string
+        """
+
+        start = 1 if query_string[0:1] in ("?", b"?") else 0
+        return start + sum(map(len, fields[:index])) + index
+
+
+    @classmethod
+    def _get_field_key(cls, key_value:Union[str, bytes]) -> Optional[str]:
+        """
+        Decodes the key of a field without decoding its value, for fields that are not parsed or failed
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The raw field
+
+        Returns:
+            Optional[str] -- The key, or None if the field has no "=" or its key depends on a value that cannot
+            be decoded
+        """
+
+        equals = "=" if isinstance(key_value, str) else b"="
+
+        # Fields without a value are the most common malformatted field, so they are found without raising
+        if equals not in key_value:
+            return None
+
+        key_value = cls._strip_detected_field(key_value)
+
+        # The encoding of a field with a key of "=" decides the key
+        if key_value[0:2] in ("==", b"=="):
+            try:
+                return cls._decode_detected_pair(key_value)[0]
+            except ValueError:
+                return None
+
+        # The key is read even if the value is empty or invalid
+        return cls._unquote_key(key_value.partition(equals)[0])
+
+
+    @staticmethod
+    def _get_base64_value(key_value:Union[str, bytes]) -> Union[str, bytes]:
+        """
+        Gets the value of a "key=value" field as it would be read by a base64 decode, without
+        splitting the field
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field containing the value
+
+        Returns:
+            Union[str, bytes] -- The (possibly base64 encoded) value of the field
+        """
+
+        equals = "=" if isinstance(key_value, str) else b"="
+
+        # If the key happens to be "=", handle that
+        if key_value[0:2] == equals * 2:
+            return key_value.lstrip(equals)
+
+        return key_value[key_value.find(equals) + 1:]
+
+
+    @classmethod
+    def _is_base64_json_candidate(cls, value:Union[str, bytes]) -> bool:
+        """
+        Determines in a single scan if a value could be base64 encoded JSON. Characters outside the base64
+        alphabet are skipped (as `base64.urlsafe_b64decode()` does), the number of data characters is checked
+        against the required length mod 4 and the first decoded byte is checked against the bytes a JSON
+        document can start with.
+
+        A False result is exact: decoding the value as base64 encoded JSON would fail. A True result means 
+        the value should be decoded to be sure
+
+        Arguments:
+            value {Union[str, bytes]} -- The value to check
+
+        Returns:
+            bool -- False if the value cannot be base64 encoded JSON, otherwise True
+        """
+
+        # Most values start with two data characters and only hold base64 characters and padding, so they
+        # are checked without the scan
+        if len(value) >= 2:
+            first = cls._BASE64_VALUES.get(value[0], -1)
+            second = cls._BASE64_VALUES.get(value[1], -1)
+        else:
+            first = second = -1
+
+        if first >= 0 and second >= 0:
+            if (first << 2 | second >> 4) not in cls._JSON_FIRST_BYTES:
+                return False
+
+            match = (cls._BASE64_TEXT if isinstance(value, str) else cls._BASE64_BYTES).fullmatch(value)
+            if match is not None:
+                padding = match.end(1) - match.start(1)
+                return padding > 0 or (len(value) - padding) % 4 == 0
+
+        data_chars = 0
+        first_byte = 0
+        padded = False
+
+        for char in value:
+            bits = cls._BASE64_VALUES.get(char)
+
+            if bits is None:
+                continue
+
+            if bits < 0:
+                padded = True
+                continue
+
+            if data_chars == 0:
+                first_byte = bits << 2
+            elif data_chars == 1 and (first_byte | bits >> 4) not in cls._JSON_FIRST_BYTES:
+                return False
+
+            data_chars += 1
+
+        # Less than one decoded byte can never be JSON. Without padding the length must be a multiple of 4
+        if data_chars < 2:
+            return False
+
+        return padded or data_chars % 4 == 0
+
+
+    @staticmethod
+    def _is_valid_single_level_dict(params:dict, allow_lists:bool=False) -> bool:
+        """
+        Determines if a passed dictionary is "single level." In this context "single level"
+        means that this is not a nested dictionary and the values are JSON compatible
+        (int, float, bool, str)
+
+        Arguments:
+            params {dict} -- The dictionary to check
+
+        Keyword Arguments:
+            allow_lists {bool} -- If non-empty lists (or tuples) of valid values are valid values (default: {False})
+
+        Returns:
+            bool -- True if the dictionary is single level with valid values. False if 
+            it is not single level, does not have valid values or is not a dictionary.
+        """
+        
+        # Ensure dictionary that is not empty
+        if not isinstance(params, dict) or len(params) == 0:
+            return False
+
+        # Check all values to ensure they're not lists, dictionaries or None
+        for value in params.values():
+            if allow_lists and isinstance(value, (list, tuple)) and len(value) > 0:
+                if not all(isinstance(element, (float, int, str, bool, Decimal)) for element in value):
+                    return False
+            elif not isinstance(value, (float, int, str, bool, Decimal)):
+                return False
+            
+        return True
+    
+
+    @staticmethod
+    def _normalize_value(param:Union[int, str, bool, float, Decimal]) -> str:
+        """
+        Normalizes a value for usage in a query string. For the following value types the
+        following normalization occurs:
+
+        - str - None
+        - int - Converted to a string
+        - float/Decimal - Converted to a string
+        - bool - Converted to a lowercase string
+
+        Arguments:
+            param {Union[int, str, bool, float]} -- The parameter to normalize
+
+        Returns:
+            str -- The normalized value
+        """
+        
+        if isinstance(param, bool):
+            return str(param).lower()
+        
+        return param
+
+
+    @classmethod
+    def _un_normalize_value(cls, param:str, numeric_mode:str="decimal") -> Union[int, str, bool, Decimal, float]:
+        """
+        "Un-normalizes" a value passed in a query string. The following datatypes will be
+        inferred from the content of the query string and converted to their respective type
+
+        - str - None
+        - int - (a detected integer will be converted to an Integer)
+        - float - (a detected decimal will be converted to a Decimal, float or left as a str for the numeric mode)
+        - bool - (a value of true/false will be converted to a Python Bool)
+
+        The value is classified with a single dictionary lookup and a single scan of its digits
+
+        Arguments:
+            param {Union[int, str, bool, Decimal]} -- The parameter to "un-normalize"
+
+        Keyword Arguments:
+            numeric_mode {str} -- How fractional numbers are converted, see `parse()` (default: {"decimal"})
+
+        Raises:
+            QueryStringLimitError: If the value is a number with more digits than the max_digits limit
+
+        Returns:
+            str -- The normalized value
+        """
+
+        # Check for bool
+        boolean = cls._BOOLEANS.get(param)
+        if boolean is not None:
+            return boolean
+
+        # An optional "-" followed by digits is an integer
+        digits = param[1:] if param[:1] == "-" else param
+        if digits.isdecimal():
+            if cls._limits is not None:
+                cls._limits.check_number(digits)
+
+            return int(param)
+
+        # If removing a single . leaves only digits it is a decimal
+        if "." in digits and digits.replace(".", "", 1).isdecimal():
+            if cls._limits is not None:
+                cls._limits.check_number(digits)
+
+            return cls.NUMERIC_MODES[numeric_mode](param)
+
+        return param
+
+
+    @classmethod
+    def _validate_list_format(cls, list_format:Optional[str]) -> None:
+        """
+        Check that a list format is supported for decoding
+
+        Arguments:
+            list_format {Optional[str]} -- The list format to check
+
+        Raises:
+            ValueError: If the list format is not None or one of `LIST_FORMATS`
+        """
+
+        if list_format is not None and list_format not in cls.LIST_FORMATS:
+            raise ValueError(f"Cannot parse query string. Unknown list_format {list_format!r}, "
+                f"expected one of {', '.join(map(repr, cls.LIST_FORMATS))}")
+
+
+    @classmethod
+    def _validate_numeric_mode(cls, numeric_mode:str) -> None:
+        """
+        Check that a numeric mode is supported
+
+        Arguments:
+            numeric_mode {str} -- The numeric mode to check
+
+        Raises:
+            ValueError: If the numeric mode is not one of `NUMERIC_MODES`
+        """
+
+        if numeric_mode not in cls.NUMERIC_MODES:
+            raise ValueError(f"Cannot parse query string. Unknown numeric_mode {numeric_mode!r}, "
+                f"expected one of {', '.join(map(repr, cls.NUMERIC_MODES))}")
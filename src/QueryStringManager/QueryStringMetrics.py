@@ -0,0 +1,302 @@
+# Utils
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock, local
+from time import perf_counter
+
+# Typing
+from typing import Callable, Optional
+
+from .QueryStringLimits import QueryStringLimitError
+
+class QueryStringMetrics:
+    """
+    Counters and histograms of how `QueryStringManager` is used, enabled with `QueryStringManager.enable_metrics()`.
+    The following are recorded:
+
+    - The number of calls to each public method, and the errors they raised by reason ("malformatted" for a
+    malformatted query string, "limit" for a `QueryStringLimitError`, "invalid" for other `ValueError`s or the
+    name of the exception)
+    - A latency histogram for each method, in seconds
+    - A size histogram for each method of the query strings parsed or generated, in bytes
+    - The number of values `parse()` tried to decode as base64 that fell back to standard format
+    - A size histogram of decoded base64 payloads, in bytes
+
+    Histograms are cumulative, like Prometheus histograms
+    """
+
+    # Upper bounds of the latency histogram buckets, in seconds
+    LATENCY_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+    # Upper bounds of the size histogram buckets, in bytes
+    SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+    # Prefix of the exported Prometheus metric names
+    PROMETHEUS_PREFIX = "query_string_manager"
+
+    # If an instrumented call is running in each thread, so the calls it makes to other instrumented methods
+    # are not recorded twice
+    _active = local()
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}
+        self._errors = {}
+        self._latencies = {}
+        self._sizes = {}
+        self._fallbacks = 0
+        self._payload_sizes = self._new_histogram(self.SIZE_BUCKETS)
+
+
+    def observe_call(self, method:str, seconds:float, size:Optional[int]=None, error:Optional[Exception]=None) -> None:
+        """
+        Record a call to a method
+
+        Arguments:
+            method {str} -- The name of the method
+            seconds {float} -- How long the call took
+
+        Keyword Arguments:
+            size {Optional[int]} -- The size of the query string parsed or generated in bytes, if known (default: {None})
+            error {Optional[Exception]} -- The error the call raised (default: {None})
+        """
+
+        with self._lock:
+            self._calls[method] = self._calls.get(method, 0) + 1
+
+            if method not in self._latencies:
+                self._latencies[method] = self._new_histogram(self.LATENCY_BUCKETS)
+                self._sizes[method] = self._new_histogram(self.SIZE_BUCKETS)
+
+            self._observe(self._latencies[method], self.LATENCY_BUCKETS, seconds)
+
+            if size is not None:
+                self._observe(self._sizes[method], self.SIZE_BUCKETS, size)
+
+            if error is not None:
+                self._count_error(method, error)
+
+
+    def count_error(self, method:str, error:Exception) -> None:
+        """
+        Record an error that a method handled without raising, such as an invalid row skipped by `parse_many()`
+
+        Arguments:
+            method {str} -- The name of the method
+            error {Exception} -- The error
+        """
+
+        with self._lock:
+            self._count_error(method, error)
+
+
+    def count_fallback(self) -> None:
+        """
+        Record a value that looked like base64 encoded JSON but was decoded in standard format
+        """
+
+        with self._lock:
+            self._fallbacks += 1
+
+
+    def observe_payload(self, size:int) -> None:
+        """
+        Record the size of a decoded base64 payload
+
+        Arguments:
+            size {int} -- The size of the payload in bytes
+        """
+
+        with self._lock:
+            self._observe(self._payload_sizes, self.SIZE_BUCKETS, size)
+
+
+    def stats(self) -> dict:
+        """
+        Get a snapshot of the metrics
+
+        Returns:
+            dict -- The calls, errors, latency and size histograms of each method, the number of base64 fallbacks
+            and the histogram of decoded base64 payload sizes. Each histogram holds its "count", "sum" and the
+            cumulative count of each bucket by upper bound
+        """
+
+        with self._lock:
+            return {
+                "methods": {method: {
+                    "calls": calls,
+                    "errors": dict(self._errors.get(method, {})),
+                    "latency_seconds": self._snapshot(self._latencies[method], self.LATENCY_BUCKETS),
+                    "size_bytes": self._snapshot(self._sizes[method], self.SIZE_BUCKETS),
+                } for (method, calls) in self._calls.items()},
+                "base64_fallbacks": self._fallbacks,
+                "base64_payload_bytes": self._snapshot(self._payload_sizes, self.SIZE_BUCKETS),
+            }
+
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text exposition format
+
+        Returns:
+            str -- The metrics
+        """
+
+        stats = self.stats()
+        prefix = self.PROMETHEUS_PREFIX
+        lines = []
+
+        def header(name:str, kind:str, description:str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name:str, labels:str, snapshot:dict) -> None:
+            separator = "," if labels else ""
+
+            for (bound, count) in snapshot["buckets"].items():
+                lines.append(f'{prefix}_{name}_bucket{{{labels}{separator}le="{bound}"}} {count}')
+
+            lines.append(f'{prefix}_{name}_bucket{{{labels}{separator}le="+Inf"}} {snapshot["count"]}')
+            lines.append(f"{prefix}_{name}_sum{{{labels}}} {snapshot['sum']}" if labels else f"{prefix}_{name}_sum {snapshot['sum']}")
+            lines.append(f"{prefix}_{name}_count{{{labels}}} {snapshot['count']}" if labels else f"{prefix}_{name}_count {snapshot['count']}")
+
+        methods = stats["methods"]
+
+        header("calls_total", "counter", "Calls to each QueryStringManager method")
+        for (method, method_stats) in methods.items():
+            lines.append(f'{prefix}_calls_total{{method="{method}"}} {method_stats["calls"]}')
+
+        header("errors_total", "counter", "Errors raised or skipped by each method, by reason")
+        for (method, method_stats) in methods.items():
+            for (reason, count) in method_stats["errors"].items():
+                lines.append(f'{prefix}_errors_total{{method="{method}",reason="{reason}"}} {count}')
+
+        header("latency_seconds", "histogram", "Latency of each method in seconds")
+        for (method, method_stats) in methods.items():
+            histogram("latency_seconds", f'method="{method}"', method_stats["latency_seconds"])
+
+        header("size_bytes", "histogram", "Size of the query strings parsed or generated by each method in bytes")
+        for (method, method_stats) in methods.items():
+            histogram("size_bytes", f'method="{method}"', method_stats["size_bytes"])
+
+        header("base64_fallbacks_total", "counter", "Values parse() tried to decode as base64 that were standard format")
+        lines.append(f"{prefix}_base64_fallbacks_total {stats['base64_fallbacks']}")
+
+        header("base64_payload_bytes", "histogram", "Size of decoded base64 payloads in bytes")
+        histogram("base64_payload_bytes", "", stats["base64_payload_bytes"])
+
+        return "\n".join(lines) + "\n"
+
+
+    @classmethod
+    def instrument(cls, method:str, size_of:str="input") -> Callable:
+        """
+        Decorate a `QueryStringManager` classmethod to record its calls in the metrics of the class. While metrics
+        are disabled the only cost is checking that they are. Only the outermost instrumented call in a thread is
+        recorded, so a method that calls another (like `merge_into_url()` encoding a base64 value) is counted once
+
+        Arguments:
+            method {str} -- The name to record the calls under
+
+        Keyword Arguments:
+            size_of {str} -- "input" to record the size of the query string passed as the first argument, or "output"
+            to record the size of the query string returned (default: {"input"})
+
+        Returns:
+            Callable -- The decorator
+        """
+
+        def decorator(function:Callable) -> Callable:
+            @wraps(function)
+            def wrapper(manager, *args, **kwargs):
+                metrics = manager._metrics
+                active = cls._active
+                if metrics is None or getattr(active, "running", False):
+                    return function(manager, *args, **kwargs)
+
+                sized = args[0] if size_of == "input" and args else kwargs.get("query_string")
+                started = perf_counter()
+                active.running = True
+
+                try:
+                    result = function(manager, *args, **kwargs)
+                except Exception as error:
+                    metrics.observe_call(method, perf_counter() - started, cls._size(sized), error)
+                    raise
+                finally:
+                    active.running = False
+
+                metrics.observe_call(method, perf_counter() - started, cls._size(result if size_of == "output" else sized))
+                return result
+
+            return wrapper
+
+        return decorator
+
+
+    def _count_error(self, method:str, error:Exception) -> None:
+        """
+        Record an error. The lock must be held
+        """
+
+        if isinstance(error, QueryStringLimitError):
+            reason = "limit"
+        elif isinstance(error, ValueError):
+            reason = "malformatted" if str(error).startswith("Malformatted") else "invalid"
+        else:
+            reason = type(error).__name__
+
+        errors = self._errors.setdefault(method, {})
+        errors[reason] = errors.get(reason, 0) + 1
+
+
+    @staticmethod
+    def _size(value) -> Optional[int]:
+        """
+        Returns:
+            Optional[int] -- The length of a query string, the number of bytes written for writers, or None if
+            the value is neither
+        """
+
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+
+        return len(value) if isinstance(value, (str, bytes, bytearray, memoryview)) else None
+
+
+    @staticmethod
+    def _new_histogram(buckets:tuple) -> list:
+        """
+        Returns:
+            list -- The count of each bucket (plus one for values above the last bound), then the sum of the values
+        """
+
+        return [0] * (len(buckets) + 1) + [0]
+
+
+    @staticmethod
+    def _observe(histogram:list, buckets:tuple, value:float) -> None:
+        """
+        Add a value to a histogram. The lock must be held
+        """
+
+        histogram[bisect_left(buckets, value)] += 1
+        histogram[-1] += value
+
+
+    @staticmethod
+    def _snapshot(histogram:list, buckets:tuple) -> dict:
+        """
+        Returns:
+            dict -- The "count", "sum" and cumulative "buckets" of a histogram
+        """
+
+        cumulative = {}
+        count = 0
+
+        for (bound, bucket_count) in zip(buckets, histogram):
+            count += bucket_count
+            cumulative[bound] = count
+
+        return {"count": count + histogram[len(buckets)], "sum": histogram[-1], "buckets": cumulative}
@@ -0,0 +1,168 @@
+# Utils
+from concurrent.futures import Executor
+import asyncio
+
+# Typing
+from typing import Callable, Optional
+
+from .QueryStringManager import QueryStringManager
+from .LazyDict import LazyDict
+
+def _raise(error:Exception):
+    """
+    Decoder for a field whose value failed to decode in an executor, so reading it raises the error
+    """
+
+    raise error
+
+
+class QueryStringMiddleware:
+    """
+    ASGI middleware that parses the query string of each HTTP and WebSocket request once and stores the result
+    in the scope, so every layer of an application reads the same parsed query string with `params()`.
+
+    The query string is parsed lazily (see `QueryStringManager.parse()` with `lazy=True`): it is split up front
+    and each value is decoded the first time it is read. Values longer than `offload_size`, such as large base64
+    encoded payloads, are instead decoded in an executor before the application is called so they do not block
+    the event loop
+    """
+
+    # The scope key the parsed query string is stored under
+    SCOPE_KEY = "query_string_params"
+
+    def __init__(self, app:Callable, offload_size:int=16384, executor:Optional[Executor]=None,
+        schema:"QueryStringSchema"=None, numeric_mode:str="decimal", scope_key:str=SCOPE_KEY):
+        """
+        Wrap an ASGI application
+
+        Arguments:
+            app {Callable} -- The ASGI application
+
+        Keyword Arguments:
+            offload_size {int} -- The raw length above which a value is decoded in the executor (default: {16384})
+            executor {Optional[Executor]} -- The executor to decode large values in. By default the event loop's
+            default thread pool is used. With a `ProcessPoolExecutor` the schema decoders must be picklable,
+            and the limits and JSON backend of the worker processes are used (default: {None})
+            schema {QueryStringSchema} -- A compiled schema to decode known fields with (default: {None})
+            numeric_mode {str} -- How fractional numbers are converted, see `QueryStringManager.parse()`
+            (default: {"decimal"})
+            scope_key {str} -- The scope key to store the parsed query string under (default: {"query_string_params"})
+
+        Raises:
+            ValueError: If the offload size is not a positive integer or the numeric mode is unknown
+        """
+
+        if not isinstance(offload_size, int) or isinstance(offload_size, bool) or offload_size < 1:
+            raise ValueError("Cannot create query string middleware. Passed offload_size argument is not a positive integer")
+
+        QueryStringManager._validate_numeric_mode(numeric_mode)
+
+        self.app = app
+        self.offload_size = offload_size
+        self.executor = executor
+        self.schema = schema
+        self.numeric_mode = numeric_mode
+        self.scope_key = scope_key
+
+
+    async def __call__(self, scope:dict, receive:Callable, send:Callable) -> None:
+        if scope["type"] in ("http", "websocket") and self.scope_key not in scope:
+            scope[self.scope_key] = await self.parse_scope(scope)
+
+        await self.app(scope, receive, send)
+
+
+    async def parse_scope(self, scope:dict):
+        """
+        Parse the query string of a request, decoding large values in the executor
+
+        Arguments:
+            scope {dict} -- The ASGI connection scope
+
+        Returns:
+            The parsed query string as a `LazyDict`, or the `ValueError` raised if it is malformatted, which
+            `params()` raises
+        """
+
+        try:
+            params = self._parse(scope.get("query_string", b""), self.schema, self.numeric_mode)
+        except ValueError as error:
+            return error
+
+        pending = params.pending_fields()
+        large = [(key, decoder, raw_value) for (key, (decoder, raw_value)) in pending.items() 
+            if len(raw_value) > self.offload_size]
+
+        if not large:
+            return params
+
+        loop = asyncio.get_running_loop()
+        values = await asyncio.gather(*(loop.run_in_executor(self.executor, decoder, raw_value)
+            for (_, decoder, raw_value) in large), return_exceptions=True)
+
+        # Keep the errors for when the value is read, like any other invalid lazy value
+        offloaded = {key: (key, _raise, value) if isinstance(value, Exception) else (key, value)
+            for ((key, _, _), value) in zip(large, values)}
+
+        return LazyDict.from_pairs(offloaded[key] if key in offloaded else (key, *pending[key]) if key in pending 
+            else (key, params[key]) for key in params)
+
+
+    @classmethod
+    def params(cls, scope:dict, scope_key:str=SCOPE_KEY) -> LazyDict:
+        """
+        Get the parsed query string of a request. If the middleware has not parsed it, it is parsed (without
+        offloading) and stored in the scope, so it is still only parsed once per request
+
+        Arguments:
+            scope {dict} -- The ASGI connection scope
+
+        Keyword Arguments:
+            scope_key {str} -- The scope key the parsed query string is stored under (default: {"query_string_params"})
+
+        Raises:
+            ValueError: If the query string is malformatted
+
+        Returns:
+            LazyDict -- The parsed query string
+        """
+
+        params = scope.get(scope_key)
+
+        if params is None:
+            try:
+                params = cls._parse(scope.get("query_string", b""))
+            except ValueError as error:
+                params = error
+
+            scope[scope_key] = params
+
+        if isinstance(params, ValueError):
+            raise params
+
+        return params
+
+
+    @staticmethod
+    def _parse(query_string:bytes, schema:"QueryStringSchema"=None, numeric_mode:str="decimal") -> LazyDict:
+        """
+        Parse a query string lazily. An empty query string has no fields
+
+        Arguments:
+            query_string {bytes} -- The raw query string of the request
+
+        Keyword Arguments:
+            schema {QueryStringSchema} -- A compiled schema to decode known fields with (default: {None})
+            numeric_mode {str} -- How fractional numbers are converted (default: {"decimal"})
+
+        Raises:
+            ValueError: If the query string is malformatted
+
+        Returns:
+            LazyDict -- The parsed query string
+        """
+
+        if query_string in (b"", b"?", "", "?"):
+            return LazyDict()
+
+        return QueryStringManager.parse(query_string, schema=schema, lazy=True, numeric_mode=numeric_mode)
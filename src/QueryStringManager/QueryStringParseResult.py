@@ -0,0 +1,112 @@
+# Typing
+from typing import Optional
+
+class QueryStringParseResult:
+    """
+    The result of `QueryStringManager.try_parse()` and its variants, which return errors instead of raising them.
+    Each error is an (error, offset, key, message) tuple:
+
+    - error - One of the error codes below
+    - offset - The position in the query string (in characters, or bytes for a bytes query string) of the start of
+    the field that failed, or 0 if the query string as a whole failed
+    - key - The decoded key of the field, or None if it could not be read
+    - message - The message of the `ValueError` the parser would have raised
+
+    In the default strict mode parsing stops at the first error and data is None. In lenient mode fields that
+    fail are skipped, and data holds every other field
+    """
+
+    # The query string is not a string or bytes
+    NOT_A_STRING = "not_a_string"
+
+    # The query string as a whole is invalid
+    MALFORMED_QUERY_STRING = "malformed_query_string"
+
+    # A field has no "=" separating its key and value
+    MALFORMED_FIELD = "malformed_field"
+
+    # A field is not in the schema and the schema does not allow unknown fields
+    UNKNOWN_FIELD = "unknown_field"
+
+    # A value is empty, cannot be decoded, or is invalid for its type in the schema
+    INVALID_VALUE = "invalid_value"
+
+    # A value of a base64 encoded query string is not base64 encoded JSON
+    INVALID_BASE64 = "invalid_base64"
+
+    # The query string or a field exceeds one of the `QueryStringLimits`
+    LIMIT_EXCEEDED = "limit_exceeded"
+
+    __slots__ = ("data", "errors")
+
+    def __init__(self, data:Optional[dict], errors:list):
+        """
+        Arguments:
+            data {Optional[dict]} -- The parsed query string, or None if it could not be parsed
+            errors {list} -- The (error, offset, key, message) of each error
+        """
+
+        self.data = data
+        self.errors = errors
+
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"{type(self).__name__}(data={self.data!r})"
+
+        return f"{type(self).__name__}(data={self.data!r}, error={self.error!r}, offset={self.offset!r}, key={self.key!r})"
+
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns:
+            bool -- If every field was parsed
+        """
+
+        return not self.errors
+
+
+    @property
+    def error(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str] -- The code of the first error, or None if there were no errors
+        """
+
+        return self.errors[0][0] if self.errors else None
+
+
+    @property
+    def offset(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int] -- The offset of the field of the first error, or None if there were no errors
+        """
+
+        return self.errors[0][1] if self.errors else None
+
+
+    @property
+    def key(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str] -- The key of the field of the first error, or None if there were no errors or the key
+            could not be read
+        """
+
+        return self.errors[0][2] if self.errors else None
+
+
+    @property
+    def message(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str] -- The message of the first error, or None if there were no errors
+        """
+
+        return self.errors[0][3] if self.errors else None
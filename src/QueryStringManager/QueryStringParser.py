@@ -0,0 +1,238 @@
+# Typing
+from typing import AsyncIterable, AsyncIterator, Union
+
+from .QueryStringManager import QueryStringManager
+from .QueryStringLimits import QueryStringLimits
+
+class QueryStringParser:
+    """
+    An incremental parser for standard format query strings (and `application/x-www-form-urlencoded` bodies) 
+    that arrive in chunks. Each "key=value" field is decoded as soon as the "&" ending it is fed, and only the
+    incomplete field at the end of the last chunk is buffered. Fields are decoded as they are by 
+    `QueryStringManager.parse_query_string()`
+
+    Chunks may be `str` or `bytes` (fields are split and percent-decoded as bytes), but not a mix of both.
+    The `QueryStringLimits` set with `QueryStringManager.set_limits()` are checked as the chunks are fed
+    """
+
+    def __init__(self, normalize_value:bool=True, max_pair_length:int=None):
+        """
+        Create a parser for a single query string
+
+        Keyword Arguments:
+            normalize_value {bool} -- If the values parsed should be normalized from strings to Python objects (default: {True})
+            max_pair_length {int} -- The maximum length of a single "key=value" field, to bound the memory used. By 
+            default the length is not limited (default: {None})
+        """
+
+        self.normalize_value = normalize_value
+        self.max_pair_length = max_pair_length
+
+        self._buffer = None
+        self._closed = False
+
+        # The length and separators fed so far, checked against the limits of the whole query string
+        self._length = 0
+        self._separators = 0
+
+
+    def feed(self, chunk:Union[str, bytes]) -> list:
+        """
+        Feed the next chunk of the query string to the parser
+
+        Arguments:
+            chunk {Union[str, bytes]} -- The next chunk of the query string
+
+        Raises:
+            ValueError: If the parser is closed, the chunk is not the same type as previous chunks, a field is 
+            malformatted or invalid, or a field is longer than max_pair_length
+            QueryStringLimitError: If the query string fed so far exceeds a limit
+
+        Returns:
+            list -- The (key, value) pairs of the fields completed by the chunk
+        """
+
+        if self._closed:
+            raise ValueError("Cannot feed a query string parser after it is closed")
+
+        if not isinstance(chunk, (str, bytes, bytearray)):
+            raise ValueError("Cannot parse a query string from an object that is not a string")
+
+        # Fields are split as bytes, which are hashable so their keys can be unquoted from the cache
+        if isinstance(chunk, bytearray):
+            chunk = bytes(chunk)
+
+        if self._buffer is None:
+            if not chunk:
+                return []
+
+            # Remove "?" if it's at the beginning
+            self._buffer = chunk[0:0]
+            if chunk[0:1] in ("?", b"?"):
+                chunk = chunk[1:]
+
+                # It still counts towards the length of the query string, as it does for `parse()`
+                self._length = 1
+
+        elif isinstance(chunk, str) != isinstance(self._buffer, str):
+            raise ValueError("Cannot parse a query string from a mix of str and bytes chunks")
+
+        pairs = []
+        separator = "&" if isinstance(chunk, str) else b"&"
+        start = 0
+
+        limits = QueryStringManager._limits
+        if limits is not None:
+            self._check_limits(limits, chunk, separator)
+
+        # Only the new chunk is searched, the buffer never contains a separator
+        end = chunk.find(separator)
+        while end != -1:
+            pairs.append(self._decode(self._buffer + chunk[start:end]))
+            self._buffer = chunk[0:0]
+            start = end + 1
+            end = chunk.find(separator, start)
+
+        self._buffer += chunk[start:]
+        self._check_length(self._buffer)
+
+        return pairs
+
+
+    def close(self) -> list:
+        """
+        Signal the end of the query string and decode the last field
+
+        Raises:
+            ValueError: If no data was fed, or the last field is malformatted or invalid
+
+        Returns:
+            list -- The (key, value) pair of the last field
+        """
+
+        if self._closed:
+            return []
+
+        self._closed = True
+
+        if self._buffer is None:
+            raise ValueError("Cannot parse a query string from an empty string")
+
+        return [self._decode(self._buffer)]
+
+
+    @classmethod
+    async def aiter_pairs(cls, chunks:AsyncIterable[Union[str, bytes]], normalize_value:bool=True, 
+        max_pair_length:int=None) -> AsyncIterator[tuple]:
+        """
+        Parse a query string from an async iterator of chunks, such as the body of an ASGI request
+
+        Arguments:
+            chunks {AsyncIterable[Union[str, bytes]]} -- The chunks of the query string
+
+        Keyword Arguments:
+            normalize_value {bool} -- If the values parsed should be normalized from strings to Python objects (default: {True})
+            max_pair_length {int} -- The maximum length of a single "key=value" field (default: {None})
+
+        Raises:
+            ValueError: If a field is malformatted or invalid, or longer than max_pair_length
+
+        Returns:
+            AsyncIterator[tuple] -- The (key, value) pair of each field as soon as it is complete
+        """
+
+        parser = cls(normalize_value, max_pair_length)
+
+        async for chunk in chunks:
+            for pair in parser.feed(chunk):
+                yield pair
+
+        for pair in parser.close():
+            yield pair
+
+
+    @classmethod
+    async def parse_async(cls, chunks:AsyncIterable[Union[str, bytes]], normalize_value:bool=True, 
+        max_pair_length:int=None) -> dict:
+        """
+        Parse a query string from an async iterator of chunks into a dictionary
+
+        Arguments:
+            chunks {AsyncIterable[Union[str, bytes]]} -- The chunks of the query string
+
+        Keyword Arguments:
+            normalize_value {bool} -- If the values parsed should be normalized from strings to Python objects (default: {True})
+            max_pair_length {int} -- The maximum length of a single "key=value" field (default: {None})
+
+        Raises:
+            ValueError: If a field is malformatted or invalid, or longer than max_pair_length
+
+        Returns:
+            dict -- The parsed query string
+        """
+
+        return {key: value async for (key, value) in cls.aiter_pairs(chunks, normalize_value, max_pair_length)}
+
+
+    def _decode(self, key_value:Union[str, bytes]) -> tuple:
+        """
+        Decode a complete field
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to decode
+
+        Raises:
+            ValueError: If the field is malformatted or invalid
+
+        Returns:
+            tuple -- The decoded (key, value) pair
+        """
+
+        self._check_length(key_value)
+        return QueryStringManager._decode_pair(key_value, normalize_value=self.normalize_value)
+
+
+    def _check_limits(self, limits:QueryStringLimits, chunk:Union[str, bytes], separator:Union[str, bytes]) -> None:
+        """
+        Ensure the query string fed so far, including the next chunk, is not longer and has no more fields than 
+        the limits allow
+
+        Arguments:
+            limits {QueryStringLimits} -- The limits to check
+            chunk {Union[str, bytes]} -- The next chunk of the query string
+            separator {Union[str, bytes]} -- The separator between fields
+
+        Raises:
+            QueryStringLimitError: If a limit is exceeded
+        """
+
+        self._length += len(chunk)
+        if limits.max_length is not None and self._length > limits.max_length:
+            limits.raise_length()
+
+        if limits.max_pairs is not None:
+            self._separators += chunk.count(separator)
+
+            if self._separators >= limits.max_pairs:
+                limits.raise_pairs()
+
+
+    def _check_length(self, key_value:Union[str, bytes]) -> None:
+        """
+        Ensure a (possibly incomplete) field is not longer than max_pair_length, and its key and value are not
+        longer than the limits allow. The incomplete field is checked as it is buffered, so an overlong key or
+        value is rejected before it is complete
+
+        Arguments:
+            key_value {Union[str, bytes]} -- The field to check
+
+        Raises:
+            ValueError: If the field is too long
+            QueryStringLimitError: If the key or value of the field is too long
+        """
+
+        if self.max_pair_length is not None and len(key_value) > self.max_pair_length:
+            raise ValueError("Cannot parse a query string with a field longer than the maximum length")
+
+        if QueryStringManager._limits is not None:
+            QueryStringManager._limits.check_fields([key_value])
@@ -0,0 +1,152 @@
+# Utils
+from enum import Enum
+
+# Typing
+from typing import Callable, Union
+from decimal import Decimal, InvalidOperation
+
+from .QueryStringManager import QueryStringManager
+
+class QueryStringSchema:
+    """
+    A compiled description of the fields expected in a query string. Each field is bound to a decoder
+    for its type once, when the schema is created, so parsing with a schema skips type inference for
+    known fields and rejects unknown fields before their values are decoded.
+
+    Supported field types are `int`, `float`, `decimal.Decimal`, `bool`, `str`, an `enum.Enum` subclass,
+    a collection of allowed strings, or `QueryStringSchema.BASE64` for base64 encoded JSON
+    """
+
+    # Field type for values that are base64 encoded JSON
+    BASE64 = "base64"
+
+    def __init__(self, fields:dict, allow_unknown:bool=False):
+        """
+        Compile a schema from a dictionary of field names to field types
+
+        Arguments:
+            fields {dict} -- The field names in the query string mapped to the type of their values
+
+        Keyword Arguments:
+            allow_unknown {bool} -- If fields missing from the schema should be parsed with type inference
+            instead of being rejected (default: {False})
+
+        Raises:
+            ValueError: If a field type is not supported
+        """
+
+        if not isinstance(fields, dict) or len(fields) == 0:
+            raise ValueError("Cannot compile a query string schema. Passed fields argument is not a \
+            non-empty dictionary")
+
+        self.allow_unknown = allow_unknown
+        self.decoders = {key: self._compile_decoder(key, field_type) for (key, field_type) in fields.items()}
+
+
+    def decode(self, key:str, value:Union[str, bytes]):
+        """
+        Decode a value from a query string with the decoder bound to its field
+
+        Arguments:
+            key {str} -- The (unquoted) field name
+            value {Union[str, bytes]} -- The raw value from the query string
+
+        Raises:
+            ValueError: If the field is not in the schema or the value is invalid for its type
+
+        Returns:
+            The decoded value
+        """
+
+        decoder = self.decoders.get(key)
+        if decoder is None:
+            raise ValueError(f"Unexpected field in query string: {key}")
+
+        return decoder(value)
+
+
+    @classmethod
+    def _compile_decoder(cls, key:str, field_type:Union[type, str, tuple, list, set, frozenset]) -> Callable:
+        """
+        Create the decoder for a single field
+
+        Arguments:
+            key {str} -- The field name, used in error messages
+            field_type -- The type of the field's values
+
+        Raises:
+            ValueError: If the field type is not supported
+
+        Returns:
+            Callable -- A function decoding a raw query string value to the field type
+        """
+
+        if field_type == cls.BASE64:
+            return QueryStringManager._decode_base64_value
+
+        unquote = QueryStringManager._unquote
+
+        if field_type is str:
+            return unquote
+
+        # Look-up tables for values from a fixed set
+        if field_type is bool:
+            choices = {"true": True, "false": False}
+            return lambda value: cls._lookup(key, choices, unquote(value).lower())
+
+        if isinstance(field_type, type) and issubclass(field_type, Enum):
+            choices = {str(member.value): member for member in field_type}
+            return lambda value: cls._lookup(key, choices, unquote(value))
+
+        if isinstance(field_type, (tuple, list, set, frozenset)):
+            choices = {str(choice): str(choice) for choice in field_type}
+            return lambda value: cls._lookup(key, choices, unquote(value))
+
+        # Numbers are converted directly, once they are checked to have the form type inference reads as a
+        # number (see `QueryStringManager._un_normalize_value()`). `int()` and `Decimal()` also accept forms
+        # like "1_000", " 12 " and "+5", which would otherwise pass a schema but be strings without one
+        if field_type in (int, float, Decimal):
+            def decode_number(value:str) -> Union[int, float, Decimal]:
+                text = unquote(value)
+                digits = text[1:] if text[:1] == "-" else text
+
+                if not digits.isdecimal() and (field_type is int or "." not in digits or 
+                    not digits.replace(".", "", 1).isdecimal()):
+                    raise ValueError(f"Invalid value for field in query string: {key}")
+
+                # The digits are checked once they are unquoted, as they are converted
+                limits = QueryStringManager._limits
+                if limits is not None:
+                    limits.check_number(text)
+
+                try:
+                    return field_type(text)
+                except (ValueError, InvalidOperation):
+                    raise ValueError(f"Invalid value for field in query string: {key}") from None
+
+            return decode_number
+
+        raise ValueError(f"Cannot compile a query string schema. Unsupported type for field: {key}")
+
+
+    @staticmethod
+    def _lookup(key:str, choices:dict, value:str):
+        """
+        Look up a value in the allowed values for a field
+
+        Arguments:
+            key {str} -- The field name, used in error messages
+            choices {dict} -- The allowed raw values mapped to their decoded values
+            value {str} -- The unquoted value to look up
+
+        Raises:
+            ValueError: If the value is not allowed
+
+        Returns:
+            The decoded value
+        """
+
+        try:
+            return choices[value]
+        except KeyError:
+            raise ValueError(f"Invalid value for field in query string: {key}") from None
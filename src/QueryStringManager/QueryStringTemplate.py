@@ -0,0 +1,127 @@
+# Typing
+from typing import Iterable, Sequence, Union
+from decimal import Decimal
+
+from .QueryStringManager import QueryStringManager
+from .QuoteTable import QuoteTable
+
+class QueryStringTemplate:
+    """
+    A standard query string compiled for a fixed list of keys. The "key=" segments are quoted once when the
+    template is created, so rendering only converts and quotes the values. A rendered query string is the same
+    as the one `QueryStringManager.generate_query_string()` creates for the keys in the same order
+    """
+
+    def __init__(self, keys:Iterable[str], safe_chars:str=None):
+        """
+        Compile a template
+
+        Arguments:
+            keys {Iterable[str]} -- The keys of the query string, in the order they are rendered
+
+        Keyword Arguments:
+            safe_chars {str} -- An optional string of characters to not replace in a query string. For example
+            "!?@=" (default: {None})
+
+        Raises:
+            ValueError: If no keys are passed or a key is passed more than once
+        """
+
+        self.keys = tuple(keys)
+        self.safe_chars = safe_chars or QueryStringManager.URLLIB_SAFE_CHARS
+
+        if not self.keys or len(set(self.keys)) != len(self.keys):
+            raise ValueError("Cannot compile a query string template. Passed keys are empty or contain duplicates")
+
+        # The separators are quoted with the keys, as they are by `generate_query_string()` for custom safe_chars
+        self._table = QuoteTable.get(self.safe_chars)
+        self._segments = tuple(self._table.quote(f"{'&' if index else ''}{key}=") for (index, key) in enumerate(self.keys))
+
+        # Converters for each exact value type. Integers and booleans only contain characters that are never quoted
+        quote = self._table.quote
+        self._converters = {
+            str: quote,
+            int: int.__str__,
+            bool: lambda value: "true" if value else "false",
+            float: lambda value: quote(float.__str__(value)),
+            Decimal: lambda value: quote(Decimal.__str__(value)),
+        }
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.keys)!r})"
+
+
+    def render(self, params:dict) -> str:
+        """
+        Render a query string from a dictionary with exactly the keys of the template
+
+        Arguments:
+            params {dict} -- The key/value pairs to create a query string with. Values must be of a type
+            `generate_query_string()` accepts
+
+        Raises:
+            ValueError: If the keys differ from the template or a value has an invalid type
+
+        Returns:
+            str -- The query string
+        """
+
+        if not isinstance(params, dict) or len(params) != len(self.keys):
+            raise ValueError(f"Cannot render query string template. Passed params must be a dictionary with the keys {list(self.keys)!r}")
+
+        try:
+            values = [params[key] for key in self.keys]
+        except KeyError as error:
+            raise ValueError(f"Cannot render query string template. Passed params are missing the key {error}")
+
+        return self.render_values(values)
+
+
+    def render_values(self, values:Sequence[Union[int, str, bool, float, Decimal]]) -> str:
+        """
+        Render a query string from values in the order of the template keys
+
+        Arguments:
+            values {Sequence} -- The values of the query string. Values must be of a type `generate_query_string()` accepts
+
+        Raises:
+            ValueError: If the number of values differs from the number of keys or a value has an invalid type
+
+        Returns:
+            str -- The query string
+        """
+
+        if len(values) != len(self._segments):
+            raise ValueError(f"Cannot render query string template. Expected {len(self._segments)} values, got {len(values)}")
+
+        converters = self._converters
+        parts = ["?"]
+
+        for (segment, value) in zip(self._segments, values):
+            converter = converters.get(type(value))
+            parts.append(segment)
+            parts.append(converter(value) if converter is not None else self._convert_other(value))
+
+        return "".join(parts)
+
+
+    def _convert_other(self, value) -> str:
+        """
+        Convert a value that is not one of the exact types the template has a converter for, such as a subclass
+
+        Arguments:
+            value -- The value to convert
+
+        Raises:
+            ValueError: If the value is not of a type `generate_query_string()` accepts
+
+        Returns:
+            str -- The quoted value
+        """
+
+        if not isinstance(value, (float, int, str, bool, Decimal)):
+            raise ValueError("Cannot render query string template. Passed data contains a nested dictionary, "
+                "a list or an datatype that is not (int, float, bool, str)")
+
+        return self._table.quote(f"{QueryStringManager._normalize_value(value)}")
@@ -1 +1,14 @@
-from .QueryStringManager import QueryStringManager
\ No newline at end of file
+from .QueryStringManager import QueryStringManager
+from .QueryStringSchema import QueryStringSchema
+from .QueryStringCache import QueryStringCache, FrozenDict, FrozenList
+from .QueryStringColumn import QueryStringColumn
+from .QueryStringParser import QueryStringParser
+from .LazyDict import LazyDict
+from .JsonBackend import JsonBackend
+from .BinaryPayload import BinaryPayload
+from .QueryStringTemplate import QueryStringTemplate
+from .QueryStringBuilder import QueryStringBuilder
+from .QueryStringMetrics import QueryStringMetrics
+from .QueryStringLimits import QueryStringLimits, QueryStringLimitError
+from .QueryStringParseResult import QueryStringParseResult
+from .QueryStringMiddleware import QueryStringMiddleware
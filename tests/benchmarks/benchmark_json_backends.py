@@ -0,0 +1,77 @@
+"""
+Compares the throughput of the installed JSON backends when encoding and decoding base64 values holding nested
+payloads of 1 KB to 64 KB. Run from the repository root with:
+
+    python -m tests.benchmarks.benchmark_json_backends
+"""
+
+from decimal import Decimal
+from src.QueryStringManager import JsonBackend
+
+import argparse, timeit
+
+PAYLOAD_SIZES = [1024, 4096, 16384, 65536]
+
+
+def make_payload(size:int, fractions:bool=True) -> dict:
+    """
+    Build a nested payload that encodes to at least `size` bytes of JSON with the standard library
+
+    Arguments:
+        size {int} -- The minimum encoded size in bytes
+
+    Keyword Arguments:
+        fractions {bool} -- If the payload should hold `decimal.Decimal` values (default: {True})
+
+    Returns:
+        dict -- The payload
+    """
+
+    payload = {"items": []}
+    backend = JsonBackend.get("json")
+
+    while len(backend.dumps(payload)) < size:
+        index = len(payload["items"])
+        payload["items"].append({
+            "id": index, "name": f"item-{index}", "active": index % 2 == 0, 
+            "price": Decimal(f"{index}.99") if fractions else index * 100 + 99,
+            "tags": ["a", "b", "c"], "meta": {"rank": index * 3, "score": Decimal("0.125") if fractions else 125, "note": None},
+        })
+
+    return payload
+
+
+def measure(function, number:int) -> float:
+    """
+    Returns:
+        float -- The fastest time of a single call to the function in seconds
+    """
+
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main(number:int) -> None:
+    backends = [JsonBackend.get(name) for name in JsonBackend.available()]
+    print("Throughput in MB/s of JSON. \"decimal\" and \"float\" decode with that numeric mode\n")
+    print(f"{'backend':<10}{'payload':<11}{'size':>6}{'encode':>10}{'decimal':>10}{'float':>10}")
+
+    for fractions in (True, False):
+        for size in PAYLOAD_SIZES:
+            payload = make_payload(size, fractions)
+
+            for backend in backends:
+                data = backend.dumps(payload)
+                megabytes = len(data) / 1e6
+
+                encode = measure(lambda: backend.dumps(payload), number)
+                decode_decimal = measure(lambda: backend.loads(data, Decimal), number)
+                decode_float = measure(lambda: backend.loads(data, float), number)
+
+                print(f"{backend.name:<10}{'decimals' if fractions else 'integers':<11}{size // 1024:>4}KB"
+                    f"{megabytes / encode:>10.1f}{megabytes / decode_decimal:>10.1f}{megabytes / decode_float:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=100, help="calls per timing (default: 100)")
+    main(parser.parse_args().number)
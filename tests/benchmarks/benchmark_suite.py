@@ -0,0 +1,307 @@
+"""
+Benchmarks every encoder and decoder of `QueryStringManager` against `urllib.parse` on generated corpora, and
+reports ops/sec, latency percentiles and the memory allocated per call. Run from the repository root with:
+
+    python -m tests.benchmarks.benchmark_suite --output results.json
+    python -m tests.benchmarks.benchmark_suite --compare results.json
+
+Results are stored as JSON so runs of different versions can be compared. `--compare` marks cases that got slower
+than the threshold
+"""
+
+from decimal import Decimal
+from urllib.parse import parse_qsl, quote, urlencode
+from src.QueryStringManager import QueryStringManager
+
+import argparse, base64, json, platform, random, subprocess, sys, time, tracemalloc
+
+# The fraction of ops/sec lost against a baseline run that is reported as a regression
+REGRESSION_THRESHOLD = 0.1
+
+WORDS = ["page", "sort", "filter", "user", "created", "active", "price", "name", "tag", "region", "limit", "offset"]
+
+
+def make_params(rng:random.Random, fields:int, percent_encoded:bool=False) -> dict:
+    """
+    Create a flat dictionary of the types a standard query string holds
+
+    Arguments:
+        rng {random.Random} -- The seeded random generator
+        fields {int} -- The number of fields
+
+    Keyword Arguments:
+        percent_encoded {bool} -- If string values should be mostly characters that are percent-encoded (default: {False})
+
+    Returns:
+        dict -- The parameters
+    """
+
+    params = {}
+
+    for index in range(fields):
+        key = f"{rng.choice(WORDS)}_{index}"
+        kind = index % 4
+
+        if kind == 0:
+            params[key] = rng.randint(-100000, 100000)
+        elif kind == 1:
+            params[key] = Decimal(rng.randint(0, 10 ** 6)) / 100
+        elif kind == 2:
+            params[key] = rng.random() < 0.5
+        elif percent_encoded:
+            params[key] = "".join(rng.choice(" <>\"#{}|^`é漢ü€") + rng.choice("ab") for _ in range(rng.randint(4, 16)))
+        else:
+            params[key] = "-".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+    return params
+
+
+def make_nested(rng:random.Random, items:int) -> dict:
+    """
+    Create a nested value for base64 encoding
+
+    Arguments:
+        rng {random.Random} -- The seeded random generator
+        items {int} -- The number of items in the value
+
+    Returns:
+        dict -- The value
+    """
+
+    return {"filters": [{"field": rng.choice(WORDS), "op": rng.choice(["eq", "lt", "gt", "in"]),
+        "values": [rng.randint(0, 1000) for _ in range(rng.randint(1, 4))], "price": Decimal(rng.randint(0, 9999)) / 100}
+        for _ in range(items)], "page": rng.randint(1, 50), "sort": rng.choice(WORDS)}
+
+
+def make_corpora(seed:int=0, size:int=200) -> dict:
+    """
+    Create the corpora the benchmarks run over. Each corpus holds `size` dictionaries or lists and their encoded
+    query strings
+
+    Keyword Arguments:
+        seed {int} -- The seed of the random generator, so every run uses the same corpora (default: {0})
+        size {int} -- The number of query strings in each corpus (default: {200})
+
+    Returns:
+        dict -- The corpora by name. Each corpus holds the "params" and "query_strings", and "format" is "plain",
+        "base64" or "mixed"
+    """
+
+    rng = random.Random(seed)
+    corpora = {}
+
+    def add(name, format, params, encode):
+        corpora[name] = {"format": format, "params": params, "query_strings": [encode(value) for value in params]}
+
+    add("plain_short_ascii", "plain", [make_params(rng, 3) for _ in range(size)], QueryStringManager.generate_query_string)
+    add("plain_long_ascii", "plain", [make_params(rng, 40) for _ in range(size)], QueryStringManager.generate_query_string)
+    add("plain_short_percent_encoded", "plain", [make_params(rng, 3, True) for _ in range(size)],
+        QueryStringManager.generate_query_string)
+    add("plain_long_percent_encoded", "plain", [make_params(rng, 40, True) for _ in range(size)],
+        QueryStringManager.generate_query_string)
+    add("base64_short", "base64", [make_nested(rng, 1) for _ in range(size)], QueryStringManager.generate_base64_query_string)
+    add("base64_long", "base64", [make_nested(rng, 60) for _ in range(size)], QueryStringManager.generate_base64_query_string)
+
+    mixed = [(make_params(rng, 6), make_nested(rng, 3)) for _ in range(size)]
+    add("mixed", "mixed", mixed, lambda value: QueryStringManager.generate_query_string(value[0]) + "&" +
+        QueryStringManager.generate_base64_query_string(value[1], "state")[1:])
+
+    return corpora
+
+
+def stdlib_base64_query_string(value) -> str:
+    """
+    The baseline for `generate_base64_query_string()`: JSON and base64 encoding with the standard library
+    """
+
+    return "?q=" + base64.urlsafe_b64encode(json.dumps(value, default=float).encode("UTF-8")).decode("UTF-8")
+
+
+def stdlib_parse_base64_query_string(query_string:str) -> dict:
+    """
+    The baseline for `parse_base64_query_string()`: `parse_qsl` followed by base64 and JSON decoding
+    """
+
+    return {key: json.loads(base64.urlsafe_b64decode(value), parse_float=Decimal)
+        for (key, value) in parse_qsl(query_string[1:])}
+
+
+def make_cases(corpora:dict) -> list:
+    """
+    Create the benchmark cases: every encoder and decoder over each corpus of its format, with its `urllib.parse`
+    baseline
+
+    Arguments:
+        corpora {dict} -- The corpora from `make_corpora()`
+
+    Returns:
+        list -- (name, function, inputs) for each case
+    """
+
+    cases = []
+
+    for (name, corpus) in corpora.items():
+        query_strings = corpus["query_strings"]
+        params = corpus["params"]
+
+        cases.append((f"parse/{name}", QueryStringManager.parse, query_strings))
+
+        if corpus["format"] == "plain":
+            cases.append((f"parse_query_string/{name}", QueryStringManager.parse_query_string, query_strings))
+            cases.append((f"stdlib.parse_qsl/{name}", lambda query_string: parse_qsl(query_string[1:]), query_strings))
+            cases.append((f"generate_query_string/{name}", QueryStringManager.generate_query_string, params))
+            cases.append((f"stdlib.urlencode/{name}", lambda value: "?" + urlencode(value, quote_via=quote), params))
+
+        elif corpus["format"] == "base64":
+            cases.append((f"parse_base64_query_string/{name}", QueryStringManager.parse_base64_query_string, query_strings))
+            cases.append((f"stdlib.parse_base64/{name}", stdlib_parse_base64_query_string, query_strings))
+            cases.append((f"generate_base64_query_string/{name}", QueryStringManager.generate_base64_query_string, params))
+            cases.append((f"stdlib.generate_base64/{name}", stdlib_base64_query_string, params))
+
+        else:
+            cases.append((f"stdlib.parse_qsl/{name}", lambda query_string: parse_qsl(query_string[1:]), query_strings))
+
+    return cases
+
+
+def measure(function, inputs:list, min_time:float) -> dict:
+    """
+    Measure a function over its inputs
+
+    Arguments:
+        function {Callable} -- The function to call with each input
+        inputs {list} -- The inputs, called in order and repeated until `min_time` has passed
+        min_time {float} -- The minimum number of seconds to time the function for
+
+    Returns:
+        dict -- The ops/sec, the latency percentiles in microseconds and the bytes allocated per call
+    """
+
+    # Warm up
+    for value in inputs:
+        function(value)
+
+    latencies = []
+    clock = time.perf_counter_ns
+    started = clock()
+
+    while clock() - started < min_time * 1e9:
+        for value in inputs:
+            call_started = clock()
+            function(value)
+            latencies.append(clock() - call_started)
+
+    total = sum(latencies)
+    latencies.sort()
+
+    def percentile(fraction:float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] / 1000
+
+    # The memory allocated by a call is the peak traced while it runs, as most of it is freed before it returns
+    allocated = 0
+    tracemalloc.start()
+
+    for value in inputs:
+        tracemalloc.clear_traces()
+        baseline = tracemalloc.get_traced_memory()[0]
+        function(value)
+        allocated += tracemalloc.get_traced_memory()[1] - baseline
+
+    tracemalloc.stop()
+
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": round(len(latencies) / (total / 1e9), 1),
+        "p50_us": round(percentile(0.5), 3),
+        "p90_us": round(percentile(0.9), 3),
+        "p99_us": round(percentile(0.99), 3),
+        "bytes_per_call": round(allocated / len(inputs)),
+        "input_bytes": round(sum(len(value) if isinstance(value, str) else len(str(value)) for value in inputs) / len(inputs)),
+    }
+
+
+def get_version() -> str:
+    """
+    Returns:
+        str -- The git description of the checked out version, or "unknown"
+    """
+
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results:dict, baseline:dict, threshold:float) -> list:
+    """
+    Compare results against a baseline run
+
+    Arguments:
+        results {dict} -- The current results
+        baseline {dict} -- The results of the baseline run
+        threshold {float} -- The fraction of ops/sec lost that is reported as a regression
+
+    Returns:
+        list -- The names of the cases that regressed
+    """
+
+    regressions = []
+    print(f"\nCompared to {baseline['version']} ({baseline['python']})\n")
+
+    for (name, result) in results["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+
+        ratio = result["ops_per_sec"] / baseline["cases"][name]["ops_per_sec"]
+        marker = ""
+
+        if ratio < 1 - threshold and not name.startswith("stdlib."):
+            regressions.append(name)
+            marker = "  REGRESSION"
+
+        print(f"{name:<60}{ratio:>8.2f}x{marker}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results to a JSON file written by --output")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to time each case for (default: 0.5)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+        help=f"fraction of ops/sec lost that is a regression (default: {REGRESSION_THRESHOLD})")
+    arguments = parser.parse_args()
+
+    QueryStringManager.disable_cache()
+
+    results = {"version": get_version(), "python": platform.python_version(), "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "json_backends": QueryStringManager.json_backends(), "cases": {}}
+
+    print(f"{'case':<60}{'ops/sec':>12}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'bytes/call':>12}")
+
+    for (name, function, inputs) in make_cases(make_corpora()):
+        if arguments.filter not in name:
+            continue
+
+        result = measure(function, inputs, arguments.min_time)
+        results["cases"][name] = result
+
+        print(f"{name:<60}{result['ops_per_sec']:>12,.0f}{result['p50_us']:>10.2f}{result['p90_us']:>10.2f}"
+            f"{result['p99_us']:>10.2f}{result['bytes_per_call']:>12,}")
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            if compare(results, json.load(baseline_file), arguments.threshold):
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager
+
+import unittest
+
+class TestNumericMode(unittest.TestCase):
+    """
+        Tests for the `numeric_mode` argument of :class:`QueryStringManager.parse()`,
+        :class:`QueryStringManager.parse_query_string()` and :class:`QueryStringManager.parse_base64_query_string()`
+    """
+
+    def test_standard_values_are_classified(self):
+        """
+        Standard format values should be classified as a bool, int, decimal or string in any numeric mode
+        """
+
+        TEST_VALUES = {
+            "true": True, "FaLsE": False, "0": 0, "-12": -12, "3.14": Decimal("3.14"), "-.5": Decimal("-.5"),
+            "1.": Decimal("1"), "hello": "hello", "-": "-", ".": ".", "1.2.3": "1.2.3", "--5": "--5",
+            "1e5": "1e5", "truee": "truee",
+        }
+
+        for value, expected in TEST_VALUES.items():
+            result = QueryStringManager.parse_query_string(f"?key={value}")["key"]
+            self.assertEqual(result, expected)
+            self.assertIs(type(result), type(expected))
+
+
+    def test_fractional_values_follow_numeric_mode(self):
+        """
+        Fractional numbers should be converted for the numeric mode while integers are always an int
+        """
+
+        TEST_QUERY_STRING = "?price=-3.14&count=2&name=x"
+        TEST_RESULTS = {
+            "decimal": {"price": Decimal("-3.14"), "count": 2, "name": "x"},
+            "float": {"price": -3.14, "count": 2, "name": "x"},
+            "str": {"price": "-3.14", "count": 2, "name": "x"},
+        }
+
+        for numeric_mode, expected in TEST_RESULTS.items():
+            for parser in (QueryStringManager.parse, QueryStringManager.parse_query_string):
+                result = parser(TEST_QUERY_STRING, numeric_mode=numeric_mode)
+                self.assertEqual(result, expected)
+                self.assertIs(type(result["price"]), type(expected["price"]))
+
+
+    def test_base64_values_follow_numeric_mode(self):
+        """
+        JSON numbers with a fractional part should be converted for the numeric mode
+        """
+
+        # {"rate": 0.5, "n": 1}
+        TEST_QUERY_STRING = "?q=eyJyYXRlIjogMC41LCAibiI6IDF9"
+        TEST_RESULTS = {"decimal": Decimal("0.5"), "float": 0.5, "str": "0.5"}
+
+        for numeric_mode, expected in TEST_RESULTS.items():
+            for lazy in (False, True):
+                for parser in (QueryStringManager.parse, QueryStringManager.parse_base64_query_string):
+                    result = parser(TEST_QUERY_STRING, lazy=lazy, numeric_mode=numeric_mode)["q"]
+                    self.assertEqual(result, {"rate": expected, "n": 1})
+                    self.assertIs(type(result["rate"]), type(expected))
+
+
+    def test_parse_many_stores_floats_in_an_array(self):
+        """
+        A column of fractional numbers should be stored as floats in an array with the "float" numeric mode.
+        Integers are not promoted to floats
+        """
+
+        columns = QueryStringManager.parse_many(["?a=1.5&b=1.5&c=1.5", "?a=2.0&c=2", "?b=x"], numeric_mode="float")
+
+        self.assertEqual(columns["a"].dtype, "float")
+        self.assertEqual(columns["a"].to_list(), [1.5, 2.0, None])
+        self.assertEqual(columns["c"].dtype, "object")
+        self.assertEqual(columns["c"].to_list(), [1.5, 2, None])
+        self.assertEqual(columns["b"].dtype, "object")
+        self.assertEqual(columns["b"].to_list(), [1.5, None, "x"])
+
+
+    def test_invalid_numeric_mode(self):
+        """
+        An unknown numeric mode should raise a ValueError
+        """
+
+        for parser in (QueryStringManager.parse, QueryStringManager.parse_query_string,
+            QueryStringManager.parse_base64_query_string, QueryStringManager.parse_many):
+            with self.assertRaises(ValueError):
+                parser("?a=1.5" if parser is not QueryStringManager.parse_many else ["?a=1.5"], numeric_mode="int")
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, BinaryPayload, QueryStringLimitError
+
+import unittest
+
+class TestParseBinaryBase64QueryString(unittest.TestCase):
+    """
+        Tests for binary base64 encoded query strings, created by :class:`QueryStringManager.generate_base64_query_string()`
+        with `binary=True`, and :class:`BinaryPayload`
+    """
+
+    TEST_STATE = {"rows": [{"id": i, "name": f"item {i}", "price": Decimal("1.50") * i, "active": i % 2 == 0,
+        "note": None} for i in range(20)], "large": 2 ** 100, "negative": -2 ** 70, "exact": Decimal("1E+400"),
+        "text": "é" * 40, "ratio": 0.1}
+
+    EXPECTED = dict(TEST_STATE, ratio=Decimal("0.1"))
+
+    def tearDown(self):
+        QueryStringManager.set_limits()
+
+
+    def test_binary_round_trip(self):
+        """
+        A binary value should be prefixed, smaller than the JSON value, and decoded by every decoder
+        """
+
+        for (compress, prefix) in [(False, QueryStringManager.BINARY_PREFIX), (True, QueryStringManager.COMPRESSED_BINARY_PREFIX)]:
+            query_string = QueryStringManager.generate_base64_query_string(self.TEST_STATE, "state", compress=compress, binary=True)
+
+            self.assertTrue(query_string.startswith(f"?state={prefix}"))
+            self.assertNotIn("=", query_string[len("?state="):])
+
+            self.assertEqual(QueryStringManager.parse_base64_query_string(query_string), {"state": self.EXPECTED})
+            self.assertEqual(QueryStringManager.parse(query_string), {"state": self.EXPECTED})
+            self.assertEqual(QueryStringManager.parse(query_string.encode()), {"state": self.EXPECTED})
+            self.assertEqual(dict(QueryStringManager.parse(query_string + "&page=2", lazy=True)), {"state": self.EXPECTED, "page": 2})
+            self.assertEqual(QueryStringManager.parse_many([query_string])["state"].to_list()[0], self.EXPECTED)
+
+            out = bytearray()
+            QueryStringManager.write_base64_query_string(self.TEST_STATE, out, "state", compress=compress, chunk_size=7, binary=True)
+            self.assertEqual(out.decode(), query_string)
+
+        self.assertLess(len(QueryStringManager.generate_base64_query_string(self.TEST_STATE, binary=True)),
+            len(QueryStringManager.generate_base64_query_string(self.TEST_STATE)) / 2)
+
+
+    def test_values_round_trip(self):
+        """
+        Every type the JSON payload holds should be decoded to the value the JSON payload is decoded to
+        """
+
+        TEST_VALUES = [
+            None, True, False, 0, 127, 128, -1, -129, 2 ** 62, "", "a", "x" * 31, "x" * 32, "\ud800", [], {}, [[]],
+            list(range(16)), {str(i): i for i in range(16)}, (1, 2), {1: "a", None: "b", 1.5: "c"},
+            Decimal("-0.000"), Decimal("12.50"), Decimal("1E-400"), Decimal("5"), Decimal("-0"), Decimal("100"),
+            Decimal("1E+5"), 1.5, 1e300, float("inf"),
+            [{"a": 1, "b": 2}, {"a": 3, "b": 4}, {"c": {"a": 5}}],
+        ]
+
+        for value in TEST_VALUES:
+            for numeric_mode in QueryStringManager.NUMERIC_MODES:
+                expected = QueryStringManager.parse_base64_query_string(
+                    QueryStringManager.generate_base64_query_string([value]), numeric_mode=numeric_mode)
+                result = QueryStringManager.parse_base64_query_string(
+                    QueryStringManager.generate_base64_query_string([value], binary=True), numeric_mode=numeric_mode)
+
+                self.assertEqual(result, expected)
+                self.assertEqual(repr(result), repr(expected))
+
+
+    def test_key_table(self):
+        """
+        Keys that appear more than once should be stored once
+        """
+
+        value = [{"identifier": i, "description": str(i)} for i in range(10)]
+
+        self.assertEqual(BinaryPayload.loads(BinaryPayload.dumps(value)), value)
+        self.assertEqual(BinaryPayload.loads(BinaryPayload.dumps(value, key_table=False)), value)
+        self.assertEqual(BinaryPayload.dumps(value).count(b"identifier"), 1)
+        self.assertEqual(BinaryPayload.dumps(value, key_table=False).count(b"identifier"), 10)
+        self.assertEqual(BinaryPayload.dumps({"a": 1}), b"\x00\x51\x02a\x81")
+
+
+    def test_limits(self):
+        """
+        The depth, digit and size limits should be checked while a binary value is decoded
+        """
+
+        for (limits, value) in [
+            ({"max_depth": 3}, [[[[1]]]]),
+            ({"max_digits": 10}, 10 ** 10),
+            ({"max_digits": 10}, Decimal("-12345678901E-5")),
+            ({"max_decoded_bytes": 10}, "x" * 10),
+        ]:
+            query_string = QueryStringManager.generate_base64_query_string(value, binary=True)
+            QueryStringManager.set_limits(**limits)
+
+            for parser in [QueryStringManager.parse_base64_query_string, QueryStringManager.parse]:
+                with self.assertRaises(QueryStringLimitError):
+                    parser(query_string)
+
+            QueryStringManager.set_limits()
+            self.assertEqual(QueryStringManager.parse(query_string), {"q": value})
+
+
+    def test_invalid_binary_values(self):
+        """
+        Malformatted payloads should be rejected by the base64 decoder and kept by the unified parser
+        """
+
+        for payload in [b"", b"\x00", b"\x01\x05", b"\x00\x0a", b"\x00\x07\x05ab", b"\x00\x21\xff", b"\x00\x81\x00",
+                b"\x00\x51\x03\x81", b"\x00\x03\xff", b"\x00\x06\x00", b"\x00\x08\xff\xff\xff\x7f", b"\x00\x41"]:
+            with self.assertRaises(ValueError):
+                BinaryPayload.loads(payload)
+
+        for value in ["~2", "~2x", "~2AAoK", "~3AAoK", "~2AIEA"]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.parse_base64_query_string(f"?q={value}")
+
+            self.assertEqual(QueryStringManager.parse(f"?q={value}"), {"q": value})
+
+        with self.assertRaises(TypeError):
+            BinaryPayload.dumps({"a": object()})
@@ -0,0 +1,114 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringCache
+
+import copy, pickle, unittest
+
+class TestParseCache(unittest.TestCase):
+    """
+        Tests for the cache of parsed query strings enabled with :class:`QueryStringManager.enable_cache()`
+    """
+
+    def setUp(self):
+        QueryStringManager.enable_cache(max_size=2)
+
+
+    def tearDown(self):
+        QueryStringManager.disable_cache()
+
+
+    def test_throws_exception_on_invalid_size(self):
+        """
+        Creating a cache should throw a ValueError if the size is not a positive integer
+        """
+
+        for max_size in [0, -1, None, 1.5, True]:
+            self.assertRaises(ValueError, lambda: QueryStringCache(max_size))
+
+
+    def test_cached_results_are_shared_and_equal(self):
+        """
+        Parsing the same query string with the same options should return the same result object, equal to
+        the uncached result
+        """
+
+        TEST_QUERY_STRINGS = [
+            (QueryStringManager.parse, "?test=1&y=eyJ0ZXN0MiI6IFsxLCAyLCAzXX0="),
+            (QueryStringManager.parse_query_string, "?test=-1&test2=hello&test4=.14"),
+            (QueryStringManager.parse_base64_query_string, "?q=eyJ0ZXN0IjogeyJuZXN0ZWQiOiAxfX0="),
+        ]
+
+        for (parser, query_string) in TEST_QUERY_STRINGS:
+            QueryStringManager.disable_cache()
+            uncached = parser(query_string)
+
+            QueryStringManager.enable_cache()
+            self.assertEqual(uncached, parser(query_string))
+            self.assertIs(parser(query_string), parser(query_string))
+            self.assertEqual({"hits": 2, "misses": 1, "evictions": 0, "size": 1, "max_size": 1024}, 
+                QueryStringManager.cache_stats())
+
+
+    def test_options_are_part_of_the_key(self):
+        """
+        The same query string parsed with different options should not share a result
+        """
+
+        self.assertEqual({"test": 1}, QueryStringManager.parse_query_string("?test=1"))
+        self.assertEqual({"test": "1"}, QueryStringManager.parse_query_string("?test=1", False))
+        self.assertEqual(0, QueryStringManager.cache_stats()["hits"])
+
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        The least recently used result should be evicted when the cache is full
+        """
+
+        first = QueryStringManager.parse("?a=1")
+        QueryStringManager.parse("?b=2")
+        QueryStringManager.parse("?a=1")
+        QueryStringManager.parse("?c=3")
+
+        stats = QueryStringManager.cache_stats()
+        self.assertEqual((1, 3, 1, 2), (stats["hits"], stats["misses"], stats["evictions"], stats["size"]))
+        self.assertIs(first, QueryStringManager.parse("?a=1"))
+        self.assertIsNot(QueryStringManager.parse("?b=2"), QueryStringManager.parse("?c=3"))
+
+
+    def test_errors_are_not_cached(self):
+        """
+        Invalid query strings should raise on every call and not be cached
+        """
+
+        for _ in range(2):
+            self.assertRaises(ValueError, lambda: QueryStringManager.parse("?q=test&data"))
+            self.assertRaises(ValueError, lambda: QueryStringManager.parse(None))
+
+        self.assertEqual(0, QueryStringManager.cache_stats()["size"])
+
+
+    def test_cached_results_are_read_only(self):
+        """
+        Cached results, including nested values, should be read-only. `copy()` should return a mutable dictionary
+        """
+
+        result = QueryStringManager.parse("?test=1&q=eyJ0ZXN0IjogWzEsIDIsIDNdfQ==")
+        
+        self.assertRaises(TypeError, lambda: result.update({"test": 2}))
+        self.assertRaises(TypeError, lambda: result.pop("test"))
+        self.assertRaises(TypeError, lambda: result["q"].setdefault("other", 1))
+        self.assertRaises(TypeError, lambda: result["q"]["test"].append(4))
+        self.assertRaises(TypeError, lambda: result["q"]["test"].__setitem__(0, 4))
+        self.assertRaises(TypeError, lambda: result["q"]["test"].sort())
+
+        # Cached values have the types of uncached values
+        self.assertIsInstance(result, dict)
+        self.assertIsInstance(result["q"], dict)
+        self.assertIsInstance(result["q"]["test"], list)
+        self.assertEqual(result["q"]["test"].copy() + [4], [1, 2, 3, 4])
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertEqual(copy.deepcopy(result["q"]["test"]), [1, 2, 3])
+
+        copied = result.copy()
+        copied["test"] = Decimal("2.5")
+        self.assertEqual({"test": Decimal("2.5"), "q": {"test": [1, 2, 3]}}, copied)
+        self.assertEqual({"test": 1, "q": {"test": [1, 2, 3]}}, QueryStringManager.parse("?test=1&q=eyJ0ZXN0IjogWzEsIDIsIDNdfQ=="))
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringLimitError
+
+import unittest
+
+class TestParseCompressedBase64QueryString(unittest.TestCase):
+    """
+        Tests for compressed base64 encoded query strings, created by :class:`QueryStringManager.generate_base64_query_string()`
+        with `compress=True`
+    """
+
+    TEST_STATE = {"filters": [{"field": f"col{i}", "op": "eq", "value": f"value-{i % 7}", "on": True} for i in range(50)],
+        "price": Decimal("19.99")}
+
+    def test_compressed_round_trip(self):
+        """
+        A compressed value should be prefixed, smaller than the uncompressed value, and decoded by every decoder
+        """
+
+        query_string = QueryStringManager.generate_base64_query_string(self.TEST_STATE, "state", compress=True)
+
+        self.assertTrue(query_string.startswith(f"?state={QueryStringManager.COMPRESSED_PREFIX}"))
+        self.assertNotIn("=", query_string[len("?state="):])
+        self.assertLess(len(query_string), len(QueryStringManager.generate_base64_query_string(self.TEST_STATE)) / 4)
+
+        self.assertEqual(QueryStringManager.parse_base64_query_string(query_string), {"state": self.TEST_STATE})
+        self.assertEqual(QueryStringManager.parse(query_string), {"state": self.TEST_STATE})
+        self.assertEqual(QueryStringManager.parse(query_string.encode()), {"state": self.TEST_STATE})
+        self.assertEqual(dict(QueryStringManager.parse(query_string + "&page=2", lazy=True)), {"state": self.TEST_STATE, "page": 2})
+
+
+    def test_small_values_round_trip(self):
+        """
+        Values of every length should survive removing the base64 padding
+        """
+
+        for value in [1, "a", [1, 2], {"k": "v"}, "x" * 100, True, 0.5]:
+            query_string = QueryStringManager.generate_base64_query_string(value, compress=True)
+            self.assertEqual(QueryStringManager.parse(query_string), {"q": value})
+
+
+    def test_decompressed_size_is_capped(self):
+        """
+        A value that decompresses to more than `MAX_DECOMPRESSED_SIZE` bytes should be rejected without inflating it
+        """
+
+        bomb = QueryStringManager._compress_value(b"[" + b" " * (QueryStringManager.MAX_DECOMPRESSED_SIZE * 8) + b"1]")
+        self.assertLess(len(bomb), QueryStringManager.MAX_DECOMPRESSED_SIZE / 50)
+
+        # Exceeding the cap is a limit error, which the unified parser does not fall back on
+        for parser in [QueryStringManager.parse_base64_query_string, QueryStringManager.parse]:
+            with self.assertRaises(QueryStringLimitError):
+                parser(f"?q={bomb}")
+
+
+    def test_invalid_compressed_values(self):
+        """
+        Values that only start with the prefix should be rejected by the base64 decoder and kept by the unified parser
+        """
+
+        TEST_QUERY_STRINGS = ["?q=~1", "?q=~1abc", "?q=~1MwQ", "?q=~1!!!"]
+
+        for query_string in TEST_QUERY_STRINGS:
+            with self.assertRaises(ValueError):
+                QueryStringManager.parse_base64_query_string(query_string)
+
+            self.assertEqual(QueryStringManager.parse(query_string), {"q": query_string[3:]})
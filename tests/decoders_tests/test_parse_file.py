@@ -0,0 +1,69 @@
+from src.QueryStringManager import QueryStringManager
+
+import json, os, tempfile, unittest
+
+class TestParseFile(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.parse_file()`
+    """
+
+    TEST_LOG_LINES = [
+        '127.0.0.1 - - [10/Oct/2023:13:55:36 +0000] "GET /items?page=1&sort=asc HTTP/1.1" 200 2326 "-" "curl/8.0"',
+        '127.0.0.1 - - [10/Oct/2023:13:55:37 +0000] "GET /health HTTP/1.1" 200 2 "-" "curl/8.0"',
+        '127.0.0.1 - - [10/Oct/2023:13:55:37 +0000] "GET /index.html HTTP/1.1" 200 2 "http://ref.example/search?utm=ad&x=1" "-"',
+        'GET /plain?page=9',
+        '127.0.0.1 - - [10/Oct/2023:13:55:38 +0000] "GET /items?page=2&q=WzEsIDIsIDNd HTTP/1.1" 200 2326 "http://a.com/?ref=1" "-"',
+        '127.0.0.1 - - [10/Oct/2023:13:55:39 +0000] "GET /search?name=hello%20world HTTP/1.1" 200 12 "-" "-"',
+        '127.0.0.1 - - [10/Oct/2023:13:55:40 +0000] "GET /? HTTP/1.1" 200 12 "-" "-"',
+        '127.0.0.1 - - [10/Oct/2023:13:55:41 +0000] "GET /bad?page HTTP/1.1" 400 0 "-" "-"',
+    ]
+
+    def setUp(self):
+        log_file, self.path = tempfile.mkstemp()
+        with os.fdopen(log_file, "w") as log:
+            log.write("\n".join(self.TEST_LOG_LINES))
+
+
+    def tearDown(self):
+        os.remove(self.path)
+
+
+    def test_parse_file_to_columns(self):
+        """
+        Parse the query strings in a log file into columns, with the same result for any number of shards 
+        and workers
+        """
+
+        for (workers, shard_size) in [(1, 8388608), (1, 10), (2, 100)]:
+            shards = list(QueryStringManager.parse_file(self.path, workers=workers, shard_size=shard_size, 
+                columns=["page", "sort", "q", "name"], skip_invalid=True))
+            rows = []
+            for shard in shards:
+                shard_columns = [(name, column.to_list()) for (name, column) in shard.items()]
+                for index in range(len(shard["page"])):
+                    rows.append({name: values[index] for (name, values) in shard_columns if values[index] is not None})
+
+            self.assertEqual([{"page": 1, "sort": "asc"}, {"page": 2, "q": [1, 2, 3]}, {"name": "hello world"}, {}], rows)
+
+
+    def test_parse_file_to_json_lines(self):
+        """
+        Parse the query strings in a log file into JSON lines, one for each line with a query string
+        """
+
+        output = b"".join(QueryStringManager.parse_file(self.path, workers=2, output="jsonl", shard_size=100, 
+            skip_invalid=True))
+
+        self.assertEqual([{"page": 1, "sort": "asc"}, {"page": 2, "q": [1, 2, 3]}, {"name": "hello world"}, {}], 
+            [json.loads(line) for line in output.splitlines()])
+
+
+    def test_throws_exception_on_invalid_arguments(self):
+        """
+        This method should throw a ValueError for invalid options or a malformatted query string
+        """
+
+        # Options are validated before the results are iterated
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse_file(self.path, output="csv"))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse_file(self.path, shard_size=0))
+        self.assertRaises(ValueError, lambda: list(QueryStringManager.parse_file(self.path, workers=1)))
@@ -0,0 +1,114 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringSchema
+
+import unittest
+
+class TestParseKeys(unittest.TestCase):
+    """
+        Tests for the keys and exclude arguments of the decoders and :class:`QueryStringManager.get()`
+    """
+
+    STATE = QueryStringManager.generate_base64_query_string({"rows": [1, 2, 3]}, field_name="state")[1:]
+    TEST_QUERY_STRING = f"?page=2&sort=name&utm_source=news%20letter&{STATE}&page=3&a%20b=1.5"
+
+    def test_keys_and_exclude(self):
+        """
+        Only the selected keys should be returned by every decoder, in standard and bytes form
+        """
+
+        for query_string in [self.TEST_QUERY_STRING, self.TEST_QUERY_STRING.encode()]:
+            self.assertEqual(QueryStringManager.parse(query_string, keys=["page", "state"]),
+                {"page": 3, "state": {"rows": [1, 2, 3]}})
+            self.assertEqual(QueryStringManager.parse(query_string, exclude=["state", "utm_source"]),
+                {"page": 3, "sort": "name", "a b": Decimal("1.5")})
+            self.assertEqual(QueryStringManager.parse(query_string, keys=["page", "sort"], exclude={"sort"}), {"page": 3})
+            self.assertEqual(QueryStringManager.parse(query_string, keys=["a b"], list_format="repeat"),
+                {"a b": Decimal("1.5")})
+            self.assertEqual(QueryStringManager.parse(query_string, keys=("page",), list_format="repeat"),
+                {"page": [2, 3]})
+            self.assertEqual(QueryStringManager.parse_query_string(query_string, keys=["sort", "missing"]),
+                {"sort": "name"})
+            self.assertEqual(dict(QueryStringManager.parse(query_string, lazy=True, keys=["sort"])), {"sort": "name"})
+
+        base64_query_string = "?" + self.STATE + "&" + QueryStringManager.generate_base64_query_string(1)[1:]
+        self.assertEqual(QueryStringManager.parse_base64_query_string(base64_query_string, exclude=["state"]), {"q": 1})
+        self.assertEqual(dict(QueryStringManager.parse_base64_query_string(base64_query_string, lazy=True, keys=["q"])),
+            {"q": 1})
+
+        columns = QueryStringManager.parse_many(["?a=1&b=2&c=3", "?a=4&c=x"], exclude=["c"])
+        self.assertEqual(list(columns), ["a", "b"])
+
+
+    def test_skipped_fields_are_not_decoded(self):
+        """
+        The values of fields that are not selected should not be decoded or validated
+        """
+
+        metrics = QueryStringManager.enable_metrics()
+
+        try:
+            self.assertEqual(QueryStringManager.parse(self.TEST_QUERY_STRING, keys=["sort"]), {"sort": "name"})
+            self.assertEqual(metrics.stats()["base64_payload_bytes"]["count"], 0)
+
+            QueryStringManager.parse(self.TEST_QUERY_STRING, keys=["state"])
+            self.assertEqual(metrics.stats()["base64_payload_bytes"]["count"], 1)
+        finally:
+            QueryStringManager.disable_metrics()
+
+        self.assertEqual(QueryStringManager.parse("?page=1&malformatted", exclude=["malformatted"]), {"page": 1})
+
+        # Unknown fields that are excluded do not need to be in the schema
+        schema = QueryStringSchema({"page": int})
+        self.assertEqual(QueryStringManager.parse("?page=1&utm_source=x", schema=schema, exclude=["utm_source"]),
+            {"page": 1})
+
+
+    def test_key_of_equals(self):
+        """
+        A field starting with "==" has a key of "=" if its value is base64 encoded, so it should be selected by its
+        decoded key
+        """
+
+        query_string = "?" + QueryStringManager.generate_base64_query_string([1], field_name="=")[1:] + "&a=1"
+
+        self.assertEqual(QueryStringManager.parse(query_string, keys=["="]), {"=": [1]})
+        self.assertEqual(QueryStringManager.parse(query_string, keys=[""]), {})
+        self.assertEqual(QueryStringManager.parse(query_string, exclude=["="]), {"a": 1})
+        self.assertEqual(QueryStringManager.get(query_string, "="), [1])
+
+
+    def test_get(self):
+        """
+        `get()` should return the value `parse()` would for each key, and stop once every key is found
+        """
+
+        for query_string in [self.TEST_QUERY_STRING, self.TEST_QUERY_STRING.encode()]:
+            self.assertEqual(QueryStringManager.get(query_string, "page"), 3)
+            self.assertEqual(QueryStringManager.get(query_string, "a b"), Decimal("1.5"))
+            self.assertEqual(QueryStringManager.get(query_string, "state"), {"rows": [1, 2, 3]})
+            self.assertEqual(QueryStringManager.get(query_string, "a b", numeric_mode="str"), "1.5")
+            self.assertIsNone(QueryStringManager.get(query_string, "missing"))
+            self.assertEqual(QueryStringManager.get(query_string, "missing", default=0), 0)
+            self.assertEqual(QueryStringManager.get(query_string, ["sort", "page", "missing"]), {"sort": "name", "page": 3})
+
+        # Fields before the last key found are never validated or decoded
+        self.assertEqual(QueryStringManager.get("?a&b=1&page=1", "page"), 1)
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.get("?page", "page")
+
+
+    def test_throws_exception_on_invalid_keys(self):
+        """
+        Keys should be a collection of strings
+        """
+
+        for keys in ["page", b"page", 1, [1], [None]]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.parse("?page=1", keys=keys)
+
+            with self.assertRaises(ValueError):
+                QueryStringManager.parse_query_string("?page=1", exclude=keys)
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.get("?page=1", 1)
@@ -0,0 +1,108 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringSchema, LazyDict
+
+import unittest
+
+class TestParseLazy(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.parse()` and :class:`QueryStringManager.parse_base64_query_string()`
+        returning a :class:`LazyDict`
+    """
+
+    def test_lazy_results_match_parse(self):
+        """
+        A lazy result should contain the same fields and values as an eager result
+        """
+
+        TEST_QUERY_STRINGS = [
+            "?key===usb=",
+            "?test=-1&test2=hello&test3=false&test4=.14",
+            "?q=eyJrZXkiOiAidmFsdWUiLCAiMSI6ICI1In0=&test2=-3.14",
+            "?q=IkhlbGxvIg==&==dHJ1ZQ==",
+            "?test=dGVzdA==&test=1234",
+            "?a=1&?b=2",
+        ]
+
+        for query_string in TEST_QUERY_STRINGS:
+            result = QueryStringManager.parse(query_string, lazy=True)
+            self.assertIsInstance(result, LazyDict)
+            self.assertEqual(QueryStringManager.parse(query_string), dict(result))
+            self.assertEqual(list(QueryStringManager.parse(query_string)), list(result))
+
+        query_string = "?q=IkhlbGxvIg==&==dHJ1ZQ==&t=eyJ0ZXN0MiI6IFsxLCAyLCAzXX0="
+        self.assertEqual(QueryStringManager.parse_base64_query_string(query_string), 
+            QueryStringManager.parse_base64_query_string(query_string, lazy=True))
+
+
+    def test_values_are_decoded_when_read(self):
+        """
+        Values should only be decoded the first time they are read
+        """
+
+        result = QueryStringManager.parse_base64_query_string("?q=IkhlbGxvIg==&data=WzEsIDIsIDNd", lazy=True)
+
+        self.assertEqual(2, len(result))
+        self.assertFalse(result.is_decoded("q"))
+        self.assertFalse(result.is_decoded("data"))
+
+        self.assertEqual([1, 2, 3], result["data"])
+        self.assertTrue(result.is_decoded("data"))
+        self.assertFalse(result.is_decoded("q"))
+        self.assertIs(result["data"], result["data"])
+
+
+    def test_invalid_values_raise_when_read(self):
+        """
+        A malformatted field should raise when parsing, but an invalid value only when it is read
+        """
+
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse("?q=test&data", lazy=True))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse("?q=test&data=", lazy=True))
+
+        result = QueryStringManager.parse_base64_query_string("?q=1234&data=WzEsIDIsIDNd", lazy=True)
+        self.assertEqual([1, 2, 3], result["data"])
+        self.assertRaises(ValueError, lambda: result["q"])
+        self.assertRaises(KeyError, lambda: result["missing"])
+
+
+    def test_membership_does_not_decode(self):
+        """
+        Checking if a field is in the result should not decode its value, even if the value is invalid
+        """
+
+        result = QueryStringManager.parse_base64_query_string("?q=1234&data=WzEsIDIsIDNd", lazy=True)
+
+        self.assertIn("q", result)
+        self.assertIn("data", result)
+        self.assertNotIn("missing", result)
+        self.assertFalse(result.is_decoded("q"))
+        self.assertFalse(result.is_decoded("data"))
+
+
+    def test_from_pairs(self):
+        """
+        A `LazyDict` built from split fields should decode pending fields when read, and later fields should
+        replace earlier fields with the same name in their position
+        """
+
+        result = LazyDict.from_pairs([("a", 1), ("b", int, "2"), ("c", 3), ("a", int, "4")])
+
+        self.assertEqual(["a", "b", "c"], list(result))
+        self.assertEqual({"a": (int, "4"), "b": (int, "2")}, result.pending_fields())
+        self.assertEqual(2, result["b"])
+        self.assertEqual({"a": (int, "4")}, result.pending_fields())
+        self.assertEqual({"a": 4, "b": 2, "c": 3}, dict(result))
+        self.assertEqual({}, LazyDict.from_pairs([]).pending_fields())
+
+
+    def test_lazy_results_with_schema(self):
+        """
+        Fields in a schema should be decoded lazily with their bound decoder, and unknown fields rejected up front
+        """
+
+        schema = QueryStringSchema({"page": int, "price": Decimal})
+
+        result = QueryStringManager.parse("?page=2&price=abc", schema=schema, lazy=True)
+        self.assertEqual(2, result["page"])
+        self.assertRaises(ValueError, lambda: result["price"])
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse("?page=2&other=1", schema=schema, lazy=True))
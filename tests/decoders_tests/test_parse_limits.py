@@ -0,0 +1,143 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringSchema, QueryStringLimits, QueryStringLimitError
+
+import base64, unittest
+
+class TestParseLimits(unittest.TestCase):
+    """
+        Tests for the limits set with :class:`QueryStringManager.set_limits()`
+    """
+
+    def tearDown(self):
+        QueryStringManager.set_limits()
+
+
+    def assertLimit(self, limit:str, parser, query_string):
+        with self.assertRaises(QueryStringLimitError) as context:
+            parser(query_string)
+
+        self.assertEqual(context.exception.limit, limit)
+
+
+    def test_throws_exception_on_invalid_limits(self):
+        """
+        Limits should be positive integers or None
+        """
+
+        for limit in [0, -1, 1.5, True, "10"]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.set_limits(max_length=limit)
+
+        QueryStringManager.set_limits(max_pairs=10)
+        self.assertEqual(QueryStringManager.limits()["max_pairs"], 10)
+        self.assertIsNone(QueryStringManager.limits()["max_length"])
+
+        QueryStringManager.set_limits()
+        self.assertEqual(QueryStringManager.limits(), QueryStringLimits().to_dict())
+
+
+    def test_limits_apply_to_every_decoder(self):
+        """
+        The length, field count and key and value length limits should be checked by every decoder
+        """
+
+        QueryStringManager.set_limits(max_length=64, max_pairs=3, max_key_length=8, max_value_length=16)
+
+        DECODERS = [
+            QueryStringManager.parse,
+            QueryStringManager.parse_query_string,
+            lambda query_string: QueryStringManager.parse(query_string, lazy=True),
+            lambda query_string: QueryStringManager.parse_many([query_string]),
+        ]
+
+        for parser in DECODERS:
+            self.assertLimit("max_length", parser, "?a=" + "1" * 100)
+            self.assertLimit("max_length", parser, b"?a=" + b"1" * 100)
+            self.assertLimit("max_pairs", parser, "?a=1&b=2&c=3&d=4")
+            self.assertLimit("max_key_length", parser, "?abcdefghi=1")
+            self.assertLimit("max_value_length", parser, "?a=" + "x" * 17)
+
+        self.assertLimit("max_pairs", QueryStringManager.parse_base64_query_string, "?a=1&b=2&c=3&d=4")
+        self.assertEqual(QueryStringManager.parse("?a=1&b=2&c=3"), {"a": 1, "b": 2, "c": 3})
+
+
+    def test_decoded_size_and_depth(self):
+        """
+        Base64 values should be rejected before decoding if they are too large or nested too deeply, and
+        the unified parser should not fall back to a standard format value
+        """
+
+        QueryStringManager.set_limits(max_decoded_bytes=64, max_depth=3)
+
+        large = QueryStringManager.generate_base64_query_string(list(range(50)))
+        compressed = QueryStringManager.generate_base64_query_string(list(range(50)), compress=True)
+        deep = QueryStringManager.generate_base64_query_string([[[[1]]]])
+
+        for parser in [QueryStringManager.parse, QueryStringManager.parse_base64_query_string]:
+            self.assertLimit("max_decoded_bytes", parser, large)
+            self.assertLimit("max_decoded_bytes", parser, compressed)
+            self.assertLimit("max_depth", parser, deep)
+
+        # Brackets in strings are not nesting
+        self.assertEqual(QueryStringManager.parse(QueryStringManager.generate_base64_query_string([["[[[{{"]])),
+            {"q": [["[[[{{"]]})
+
+
+    def test_digits(self):
+        """
+        Numbers with too many digits should be rejected before they are converted, in every format
+        """
+
+        QueryStringManager.set_limits(max_digits=10)
+
+        self.assertEqual(QueryStringManager.parse("?a=-1234567890&b=12345.67890&c=12345678901x"),
+            {"a": -1234567890, "b": Decimal("12345.67890"), "c": "12345678901x"})
+
+        self.assertLimit("max_digits", QueryStringManager.parse, "?a=12345678901")
+        self.assertLimit("max_digits", QueryStringManager.parse, "?a=-123456.789012")
+        self.assertLimit("max_digits", QueryStringManager.parse_many, ["?a=12345678901"])
+        self.assertLimit("max_digits", QueryStringManager.parse,
+            QueryStringManager.generate_base64_query_string({"a": 10 ** 12}))
+        self.assertLimit("max_digits", lambda query_string: QueryStringManager.parse(query_string,
+            schema=QueryStringSchema({"a": int})), "?a=12345678901")
+
+        # JSON in UTF-16 and UTF-32 is checked like UTF-8
+        for encoding in ["UTF-8", "UTF-16", "UTF-16-LE", "UTF-32"]:
+            data = base64.urlsafe_b64encode("[12345678901234567890123]".encode(encoding)).decode()
+            self.assertLimit("max_digits", QueryStringManager.parse_base64_query_string, "?q=" + data)
+
+        # Digits in strings are not numbers
+        self.assertEqual(QueryStringManager.parse(QueryStringManager.generate_base64_query_string({"a": "1" * 20})),
+            {"q": {"a": "1" * 20}})
+
+
+    def test_digits_with_schema(self):
+        """
+        Numbers in schema fields should be checked once they are unquoted
+        """
+
+        QueryStringManager.set_limits(max_digits=5)
+        schema = QueryStringSchema({"n": int, "d": Decimal})
+        parse = lambda query_string: QueryStringManager.parse(query_string, schema=schema)
+
+        self.assertEqual(parse("?n=%31%32%33%34%35&d=-%31234.5"), {"n": 12345, "d": Decimal("-1234.5")})
+
+        self.assertLimit("max_digits", parse, "?n=%31%32%33%34%35%36%37")
+        self.assertLimit("max_digits", parse, "?d=%31234567.5")
+        self.assertLimit("max_digits", QueryStringManager.parse, "?n=%31%32%33%34%35%36%37")
+
+        # Forms that inference reads as strings are not numbers, whatever their length
+        for query_string in ["?n=1_234_567_890", "?d=1_234_567.5"]:
+            with self.assertRaises(ValueError):
+                parse(query_string)
+
+
+    def test_skip_invalid(self):
+        """
+        Rows that exceed a limit should be skipped by `parse_many()` like malformatted rows
+        """
+
+        QueryStringManager.set_limits(max_length=10)
+        columns = QueryStringManager.parse_many(["?a=1", "?a=" + "1" * 20], skip_invalid=True)
+
+        self.assertEqual(columns["a"].to_list(), [1, None])
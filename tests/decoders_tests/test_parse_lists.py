@@ -0,0 +1,84 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringSchema
+
+import unittest
+
+class TestParseLists(unittest.TestCase):
+    """
+        Tests for the `list_format` argument of :class:`QueryStringManager.parse_query_string()` and
+        :class:`QueryStringManager.parse()`
+    """
+
+    def test_repeated_keys(self):
+        """
+        The values of a repeated key should be collected in a list, with the type of each element inferred
+        """
+
+        TEST_QUERY_STRING = "?id=1&id=2.5&id=true&id=a%20b&page=2"
+        EXPECTED = {"id": [1, Decimal("2.5"), True, "a b"], "page": 2}
+
+        for parser in (QueryStringManager.parse_query_string, QueryStringManager.parse):
+            self.assertEqual(parser(TEST_QUERY_STRING), {"id": "a b", "page": 2})
+            self.assertEqual(parser(TEST_QUERY_STRING, list_format="repeat"), EXPECTED)
+            self.assertEqual(parser(TEST_QUERY_STRING.encode(), list_format="comma"), EXPECTED)
+
+
+    def test_comma_separated_values(self):
+        """
+        Values should be split on commas before they are unquoted, so quoted commas stay in the elements
+        """
+
+        TEST_QUERY_STRING = "?id=1,2&id=3&tag=a%2Cb,c&q=x"
+        EXPECTED = {"id": [1, 2, 3], "tag": ["a,b", "c"], "q": "x"}
+
+        for parser in (QueryStringManager.parse_query_string, QueryStringManager.parse):
+            self.assertEqual(parser(TEST_QUERY_STRING, list_format="comma"), EXPECTED)
+            self.assertEqual(parser(TEST_QUERY_STRING, list_format="repeat")["id"], ["1,2", 3])
+
+
+    def test_round_trip(self):
+        """
+        Lists generated in either format should be parsed back to the same lists
+        """
+
+        TEST_PARAMS = {"id": [1, 2, 3], "tag": ["a,b", "c d", False], "price": [Decimal("9.99"), Decimal("-1.5")], "page": 1}
+
+        for list_format in QueryStringManager.LIST_FORMATS:
+            query_string = QueryStringManager.generate_query_string(TEST_PARAMS, list_format=list_format)
+            self.assertEqual(QueryStringManager.parse_query_string(query_string, list_format=list_format), TEST_PARAMS)
+
+
+    def test_base64_lists_are_elements(self):
+        """
+        A list decoded from a base64 encoded value should be a single element of a repeated key
+        """
+
+        # [1, 2] and [3]
+        result = QueryStringManager.parse("?q=WzEsIDJd&q=WzNd&r=WzEsIDJd", list_format="comma")
+        self.assertEqual(result, {"q": [[1, 2], [3]], "r": [1, 2]})
+
+
+    def test_schema_decodes_each_element(self):
+        """
+        The schema decoder of a field should decode each element of its list
+        """
+
+        schema = QueryStringSchema({"id": int}, allow_unknown=True)
+
+        self.assertEqual(QueryStringManager.parse_query_string("?id=1,2&id=3&x=y", schema=schema, list_format="comma"),
+            {"id": [1, 2, 3], "x": "y"})
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.parse("?id=1,a", schema=schema, list_format="comma")
+
+
+    def test_invalid_list_format(self):
+        """
+        An unknown list format, or a list format for a lazy result, should raise a ValueError
+        """
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.parse_query_string("?id=1", list_format="json")
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.parse("?id=1", lazy=True, list_format="repeat")
@@ -0,0 +1,135 @@
+from decimal import Decimal
+from array import array
+from src.QueryStringManager import QueryStringManager
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TestParseMany(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.parse_many()`
+    """
+
+    TEST_QUERY_STRINGS = [
+        "?page=1&sort=asc&active=true",
+        "?page=2&price=3.14&q=eyJ0ZXN0MiI6IFsxLCAyLCAzXX0=",
+        "?sort=desc&active=FALSE&price=-1.5",
+        "?page=-3&mixed=1",
+        "?mixed=hello&q=dGVzdA==",
+    ]
+
+    def test_columns_match_parse(self):
+        """
+        Each column should hold the value `parse()` returns for its field in each query string, or None where the
+        field is missing, regardless of the chunk size
+        """
+
+        for chunk_size in [1, 2, 3, 100]:
+            columns = QueryStringManager.parse_many(self.TEST_QUERY_STRINGS, chunk_size=chunk_size)
+            rows = [QueryStringManager.parse(query_string) for query_string in self.TEST_QUERY_STRINGS]
+
+            self.assertEqual(["page", "sort", "active", "price", "q", "mixed"], list(columns))
+            for (name, column) in columns.items():
+                self.assertEqual(len(self.TEST_QUERY_STRINGS), len(column))
+                self.assertEqual([row.get(name) for row in rows], column.to_list())
+
+
+    def test_column_types(self):
+        """
+        Integer and boolean columns should be stored in arrays, with a null mask for missing rows
+        """
+
+        columns = QueryStringManager.parse_many(self.TEST_QUERY_STRINGS)
+
+        self.assertEqual("int", columns["page"].dtype)
+        self.assertEqual(array("q", [1, 2, 0, -3, 0]), columns["page"].values)
+        self.assertEqual(bytearray([0, 0, 1, 0, 1]), columns["page"].mask)
+        self.assertEqual("bool", columns["active"].dtype)
+        self.assertEqual("str", columns["sort"].dtype)
+        self.assertEqual("decimal", columns["price"].dtype)
+        self.assertEqual([None, Decimal("3.14"), Decimal("-1.5"), None, None], columns["price"].to_list())
+        self.assertEqual("object", columns["mixed"].dtype)
+        self.assertEqual("object", columns["q"].dtype)
+
+
+    def test_types_are_promoted_between_chunks(self):
+        """
+        A column with different types in different chunks should hold Python objects
+        """
+
+        columns = QueryStringManager.parse_many(["?a=1", "?b=1", "?a=true", "?a=x"], chunk_size=1)
+
+        self.assertEqual("object", columns["a"].dtype)
+        self.assertEqual([1, None, True, "x"], columns["a"].to_list())
+        self.assertEqual("int", columns["b"].dtype)
+        self.assertEqual([None, 1, None, None], columns["b"].to_list())
+
+
+    def test_float_columns(self):
+        """
+        Fractional numbers should be stored in a float array with the "float" numeric mode, and integers in the
+        same column should stay integers
+        """
+
+        columns = QueryStringManager.parse_many(["?a=1.5&b=1.5", "?a=-2.25&b=2", "?b=.5"], numeric_mode="float")
+
+        self.assertEqual("float", columns["a"].dtype)
+        self.assertEqual(array("d", [1.5, -2.25, 0.0]), columns["a"].values)
+        self.assertEqual("object", columns["b"].dtype)
+        self.assertEqual([1.5, 2, 0.5], columns["b"].to_list())
+        self.assertIs(type(columns["b"].to_list()[1]), int)
+
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_to_numpy(self):
+        """
+        Columns should convert to masked arrays of their type, masked where the field was missing
+        """
+
+        columns = QueryStringManager.parse_many(["?a=1&b=1.5&c=x", "?b=2.5", "?a=3&c=1"], numeric_mode="float")
+
+        self.assertEqual(columns["a"].to_numpy().dtype, numpy.int64)
+        self.assertEqual(columns["a"].to_numpy().tolist(), [1, None, 3])
+        self.assertEqual(columns["b"].to_numpy().dtype, numpy.float64)
+        self.assertEqual(columns["b"].to_numpy().tolist(), [1.5, 2.5, None])
+        self.assertEqual(columns["c"].to_numpy().dtype, object)
+        self.assertEqual(columns["c"].to_numpy().tolist(), ["x", None, 1])
+
+
+    @unittest.skipIf(numpy, "NumPy is installed")
+    def test_to_numpy_requires_numpy(self):
+        """
+        Converting a column to a NumPy array should raise an ImportError without NumPy
+        """
+
+        with self.assertRaises(ImportError):
+            QueryStringManager.parse_many(["?a=1"])["a"].to_numpy()
+
+
+    def test_selected_columns(self):
+        """
+        Only the selected fields should be returned, including fields that never appear
+        """
+
+        columns = QueryStringManager.parse_many(self.TEST_QUERY_STRINGS, columns=["page", "missing"])
+
+        self.assertEqual(["page", "missing"], list(columns))
+        self.assertEqual("null", columns["missing"].dtype)
+        self.assertEqual([None] * 5, columns["missing"].to_list())
+
+
+    def test_invalid_query_strings(self):
+        """
+        A malformatted query string should raise a ValueError, or be treated as a row with every field missing
+        when skip_invalid is set
+        """
+
+        TEST_QUERY_STRINGS = ["?a=1", "?a=", None, "?a=2"]
+
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse_many(TEST_QUERY_STRINGS))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse_many(["?a=1"], chunk_size=0))
+        self.assertEqual([1, None, None, 2], QueryStringManager.parse_many(TEST_QUERY_STRINGS, skip_invalid=True)["a"].to_list())
@@ -0,0 +1,104 @@
+from decimal import Decimal
+from enum import Enum
+from src.QueryStringManager import QueryStringManager, QueryStringSchema
+
+import unittest
+
+class Sort(Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class TestParseWithSchema(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.parse()` and :class:`QueryStringManager.parse_query_string()` 
+        with a :class:`QueryStringSchema`
+    """
+
+    SCHEMA = QueryStringSchema({
+        "page": int,
+        "price": Decimal,
+        "active": bool,
+        "name": str,
+        "sort": Sort,
+        "view": ("list", "grid"),
+        "q": QueryStringSchema.BASE64,
+    })
+
+    def test_throws_exception_on_invalid_schema(self):
+        """
+        Creating a schema should throw a ValueError if the fields are empty or a type is not supported
+        """
+
+        TEST_INVALID_FIELDS = [
+            None,
+            {},
+            {"page": list},
+            {"page": None},
+        ]
+
+        for fields in TEST_INVALID_FIELDS:
+            self.assertRaises(ValueError, lambda: QueryStringSchema(fields))
+
+
+    def test_parse_with_schema(self):
+        """
+        Parse query strings with each field decoded to the type bound in the schema
+        """
+
+        TEST_DICTS_AND_RESULTS = [
+            ({"page": 2}, "?page=2"),
+            ({"page": -2, "price": Decimal("3.10")}, "?page=-2&price=3.10"),
+            ({"page": 3, "price": Decimal("-5")}, "?page=%33&price=-5"),
+            ({"price": Decimal(".5")}, "?price=.5"),
+            ({"active": True, "name": "true"}, "?active=TRUE&name=true"),
+            ({"name": "1234", "view": "grid"}, "?name=1234&view=grid"),
+            ({"name": "hello world", "sort": Sort.DESC}, "?name=hello%20world&sort=desc"),
+            ({"q": {"key": "value"}, "page": 1}, "?q=eyJrZXkiOiAidmFsdWUifQ==&page=1"),
+        ]
+
+        for test_dict in TEST_DICTS_AND_RESULTS:
+            self.assertEqual(test_dict[0], QueryStringManager.parse(test_dict[1], schema=self.SCHEMA))
+            self.assertEqual(test_dict[0], QueryStringManager.parse_query_string(test_dict[1], schema=self.SCHEMA))
+
+
+    def test_throws_exception_on_invalid_value(self):
+        """
+        Parsing should throw a ValueError if a value is invalid for the type bound in the schema
+        """
+
+        TEST_INVALID_STRINGS = [
+            "?page=one",
+            "?page=1.5",
+            "?price=abc",
+            "?active=yes",
+            "?sort=up",
+            "?view=table",
+            "?q=notbase64",
+            "?page=",
+            "?page=1_000",
+            "?page=%2012%20",
+            "?page=%2B5",
+            "?price=1_000.5",
+            "?price=1e5",
+            "?price=NaN",
+            "?price=%2B1.5",
+        ]
+
+        for query_string in TEST_INVALID_STRINGS:
+            self.assertRaises(ValueError, lambda: QueryStringManager.parse(query_string, schema=self.SCHEMA))
+
+
+    def test_unknown_fields(self):
+        """
+        Fields not in the schema should be rejected unless the schema allows unknown fields, in which case 
+        they are parsed without the schema
+        """
+
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse("?page=1&other=1", schema=self.SCHEMA))
+
+        schema = QueryStringSchema({"name": str}, allow_unknown=True)
+        self.assertEqual({"name": "1", "other": 1, "y": {"test2": [1, 2, 3]}}, 
+            QueryStringManager.parse("?name=1&other=1&y=eyJ0ZXN0MiI6IFsxLCAyLCAzXX0=", schema=schema))
+        self.assertEqual({"name": "1", "other": "1"}, 
+            QueryStringManager.parse_query_string("?name=1&other=1", normalize_value=False, schema=schema))
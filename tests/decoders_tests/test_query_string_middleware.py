@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.QueryStringManager import QueryStringManager, QueryStringMiddleware, QueryStringSchema
+
+import asyncio, unittest
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    A thread pool that counts the calls submitted to it
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+class TestQueryStringMiddleware(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringMiddleware`
+    """
+
+    def setUp(self):
+        self.executor = CountingExecutor()
+        self.seen = []
+
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+
+    async def app(self, scope, receive, send):
+        self.seen.append(scope)
+
+
+    def call(self, query_string:bytes, scope_type:str="http", **options) -> dict:
+        scope = {"type": scope_type, "query_string": query_string}
+        middleware = QueryStringMiddleware(self.app, executor=self.executor, **options)
+
+        asyncio.run(middleware(scope, None, None))
+        return scope
+
+
+    def test_parses_once_and_stores_on_scope(self):
+        """
+        The query string should be parsed lazily once, and every call to `params()` should return the same result
+        """
+
+        scope = self.call(b"?page=2&sort=created%20desc")
+        params = QueryStringMiddleware.params(scope)
+
+        self.assertIs(self.seen[0], scope)
+        self.assertIs(QueryStringMiddleware.params(scope), params)
+        self.assertFalse(params.is_decoded("page"))
+        self.assertEqual(dict(params), {"page": 2, "sort": "created desc"})
+        self.assertEqual(self.executor.submitted, 0)
+
+
+    def test_offloads_large_values(self):
+        """
+        Values longer than the offload size should be decoded in the executor before the application is called
+        """
+
+        payload = {"filters": list(range(2000))}
+        state = QueryStringManager.generate_base64_query_string(payload, "state")
+        scope = self.call(f"{state}&page=1".encode(), offload_size=1024)
+        params = QueryStringMiddleware.params(scope)
+
+        self.assertEqual(self.executor.submitted, 1)
+        self.assertTrue(params.is_decoded("state"))
+        self.assertFalse(params.is_decoded("page"))
+        self.assertEqual(params["state"], payload)
+
+
+    def test_invalid_and_empty_query_strings(self):
+        """
+        A malformatted query string should raise when read, an invalid large value when it is read, and an
+        empty query string should have no fields
+        """
+
+        scope = self.call(b"?a=1&b")
+        with self.assertRaises(ValueError):
+            QueryStringMiddleware.params(scope)
+
+        scope = self.call(b"?a=1&q=" + b"x" * 2000, offload_size=1024, schema=QueryStringSchema({"a": int, "q": int}))
+        params = QueryStringMiddleware.params(scope)
+        self.assertEqual(params["a"], 1)
+        self.assertEqual(self.executor.submitted, 1)
+
+        with self.assertRaises(ValueError):
+            params["q"]
+
+        self.assertEqual(dict(QueryStringMiddleware.params(self.call(b""))), {})
+        self.assertEqual(dict(QueryStringMiddleware.params({"type": "http", "query_string": b"?x=y"})), {"x": "y"})
+
+
+    def test_other_scopes_and_options(self):
+        """
+        Lifespan scopes should be passed through untouched, and invalid options should raise a ValueError
+        """
+
+        scope = self.call(b"", scope_type="lifespan")
+        self.assertNotIn(QueryStringMiddleware.SCOPE_KEY, scope)
+
+        scope = self.call(b"?a=1.5", scope_type="websocket", numeric_mode="float", scope_key="params")
+        self.assertEqual(QueryStringMiddleware.params(scope, "params")["a"], 1.5)
+
+        for options in [{"offload_size": 0}, {"offload_size": True}, {"numeric_mode": "int"}]:
+            with self.assertRaises(ValueError):
+                QueryStringMiddleware(self.app, **options)
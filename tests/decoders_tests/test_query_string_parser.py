@@ -0,0 +1,138 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringParser, QueryStringLimitError
+
+import asyncio, unittest
+
+class TestQueryStringParser(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringParser`
+    """
+
+    TEST_QUERY_STRINGS = [
+        "?key=value",
+        "?key%20w/%20sp%27ec%20chars=value%20w/%20spec%20chars!",
+        "?test=-1&test2=hello&test3=false&test4=.14",
+        "test=1&test2=-3.14&test=2",
+    ]
+
+    @staticmethod
+    def _split(query_string, size):
+        return [query_string[index:index + size] for index in range(0, len(query_string), size)]
+
+
+    def test_feed_matches_parse_query_string(self):
+        """
+        Feeding a query string in chunks of any size, as str or bytes, should produce the same result as
+        `parse_query_string()`
+        """
+
+        for query_string in self.TEST_QUERY_STRINGS:
+            for size in [1, 2, 5, len(query_string)]:
+                for chunks in [self._split(query_string, size), self._split(query_string.encode("UTF-8"), size)]:
+                    for normalize_value in [True, False]:
+                        parser = QueryStringParser(normalize_value)
+                        pairs = [pair for chunk in chunks for pair in parser.feed(chunk)] + parser.close()
+
+                        self.assertEqual(QueryStringManager.parse_query_string(query_string, normalize_value), dict(pairs))
+
+
+    def test_fields_are_emitted_when_complete(self):
+        """
+        Each field should be returned by the call to `feed()` that completes it
+        """
+
+        parser = QueryStringParser()
+
+        self.assertEqual([], parser.feed("?page=1"))
+        self.assertEqual([("page", 12), ("sort", "asc")], parser.feed("2&sort=asc&na"))
+        self.assertEqual([], parser.feed(""))
+        self.assertEqual([("name", Decimal("3.5"))], parser.feed("me=3.5&x="))
+        self.assertEqual([("x", True)], parser.feed("true") + parser.close())
+
+
+    def test_feed_bytearray(self):
+        """
+        Chunks may be bytearrays, and may be mixed with bytes
+        """
+
+        parser = QueryStringParser()
+
+        self.assertEqual([("a", 1), ("b", 2)], parser.feed(bytearray(b"a=1&b=2&")))
+        self.assertEqual([("c", "x")], parser.feed(b"c=x&d"))
+        self.assertEqual([], parser.feed(bytearray(b"=3.5")))
+        self.assertEqual([("d", Decimal("3.5"))], parser.close())
+
+
+    def test_throws_exception_on_invalid_input(self):
+        """
+        The parser should throw a ValueError on malformatted fields, mixed chunk types, empty input,
+        fields longer than the maximum length, or feeding after it is closed
+        """
+
+        parser = QueryStringParser()
+        self.assertRaises(ValueError, lambda: parser.feed("?q=test&data&"))
+
+        parser = QueryStringParser()
+        parser.feed("a=1")
+        self.assertRaises(ValueError, lambda: parser.feed(b"&b=2"))
+
+        self.assertRaises(ValueError, lambda: QueryStringParser().close())
+        self.assertRaises(ValueError, lambda: QueryStringParser().feed(None))
+        self.assertRaises(ValueError, lambda: QueryStringParser(max_pair_length=5).feed("a=1&key=val"))
+        
+        parser = QueryStringParser()
+        parser.feed("a=1")
+        parser.close()
+        self.assertRaises(ValueError, lambda: parser.feed("&b=2"))
+
+
+    def test_limits(self):
+        """
+        The limits set with `QueryStringManager.set_limits()` should be checked as chunks are fed
+        """
+
+        def assertLimit(limit, chunks):
+            parser = QueryStringParser()
+
+            with self.assertRaises(QueryStringLimitError) as context:
+                for chunk in chunks:
+                    parser.feed(chunk)
+                parser.close()
+
+            self.assertEqual(context.exception.limit, limit)
+
+        try:
+            QueryStringManager.set_limits(max_pairs=2, max_value_length=3)
+            parser = QueryStringParser()
+            self.assertEqual(parser.feed("?a=1&b=12") + parser.close(), [("a", 1), ("b", 12)])
+
+            assertLimit("max_pairs", ["a=1&b=2&c=3&d=12345&"])
+            assertLimit("max_pairs", [b"a=1", b"&b=2", b"&c=3"])
+            assertLimit("max_value_length", ["a=12345&"])
+            assertLimit("max_value_length", ["a=1", "2", "34"])
+
+            QueryStringManager.set_limits(max_length=10, max_key_length=3)
+            parser = QueryStringParser()
+            self.assertEqual(parser.feed("?abc=1") + parser.feed("&b=x") + parser.close(), [("abc", 1), ("b", "x")])
+
+            assertLimit("max_length", ["?abc=1", "&b=22"])
+            assertLimit("max_key_length", ["ab", "cd=1"])
+        finally:
+            QueryStringManager.set_limits()
+
+
+    def test_parse_async(self):
+        """
+        Parse a query string from an async iterator of byte chunks
+        """
+
+        async def chunks():
+            for chunk in [b"?test=-1&te", b"st2=hel", b"lo&test3=false", b"&test4=.14"]:
+                yield chunk
+
+        async def pairs():
+            return [pair async for pair in QueryStringParser.aiter_pairs(chunks())]
+
+        expected = {"test": -1, "test2": "hello", "test3": False, "test4": Decimal(".14")}
+        self.assertEqual(expected, asyncio.run(QueryStringParser.parse_async(chunks())))
+        self.assertEqual(list(expected.items()), asyncio.run(pairs()))
@@ -0,0 +1,152 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringParseResult, QueryStringSchema
+
+import base64, unittest
+
+class TestTryParse(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.try_parse()` and its variants
+    """
+
+    STATE = QueryStringManager.generate_base64_query_string({"rows": [1, 2, 3]}, field_name="state")[1:]
+
+    def tearDown(self):
+        QueryStringManager.set_limits()
+
+
+    def test_valid_query_strings(self):
+        """
+        A valid query string should have the data `parse()` returns and no errors
+        """
+
+        query_string = f"?page=2&{self.STATE}&price=1.50&tags=a&tags=b"
+
+        for (try_parse, parse, options) in [
+            (QueryStringManager.try_parse, QueryStringManager.parse, {}),
+            (QueryStringManager.try_parse, QueryStringManager.parse, {"list_format": "repeat", "numeric_mode": "str"}),
+            (QueryStringManager.try_parse, QueryStringManager.parse, {"keys": ["page"]}),
+            (QueryStringManager.try_parse_query_string, QueryStringManager.parse_query_string, {"normalize_value": False}),
+        ]:
+            for value in [query_string, query_string.encode()]:
+                result = try_parse(value, **options)
+
+                self.assertTrue(result.ok)
+                self.assertTrue(result)
+                self.assertEqual(result.data, parse(value, **options))
+                self.assertEqual(result.errors, [])
+                self.assertIsNone(result.error)
+                self.assertIsNone(result.offset)
+
+        result = QueryStringManager.try_parse_base64_query_string("?" + self.STATE)
+        self.assertEqual(result.data, {"state": {"rows": [1, 2, 3]}})
+
+
+    def test_strict_mode(self):
+        """
+        Parsing should stop at the first field that fails, reporting its error code, offset and key
+        """
+
+        for (query_string, error, offset, key) in [
+            ("?page=1&sort&q=2", QueryStringParseResult.MALFORMED_FIELD, 8, None),
+            (b"page=1&&q=2", QueryStringParseResult.MALFORMED_FIELD, 7, None),
+            ("", QueryStringParseResult.MALFORMED_FIELD, 0, None),
+            ("?page=1&sort&q", QueryStringParseResult.MALFORMED_FIELD, 8, None),
+            ("?a=1&b=", QueryStringParseResult.INVALID_VALUE, 5, "b"),
+            (b"?a=1&%62=&c", QueryStringParseResult.INVALID_VALUE, 5, "b"),
+            ("?=&a=1", QueryStringParseResult.INVALID_VALUE, 1, ""),
+        ]:
+            result = QueryStringManager.try_parse(query_string)
+
+            self.assertFalse(result.ok)
+            self.assertIsNone(result.data)
+            self.assertEqual((result.error, result.offset, result.key), (error, offset, key))
+            self.assertEqual(len(result.errors), 1)
+
+            with self.assertRaises(ValueError) as context:
+                QueryStringManager.parse(query_string)
+
+            self.assertEqual(result.message, str(context.exception))
+
+        result = QueryStringManager.try_parse(1)
+        self.assertEqual((result.error, result.offset, result.key), (QueryStringParseResult.NOT_A_STRING, 0, None))
+
+
+    def test_lenient_mode(self):
+        """
+        Fields that fail should be skipped and reported, keeping every other field
+        """
+
+        result = QueryStringManager.try_parse(f"?page=1&sort&{self.STATE}&&price=1.5", lenient=True)
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.data, {"page": 1, "state": {"rows": [1, 2, 3]}, "price": Decimal("1.5")})
+        self.assertEqual([error[:3] for error in result.errors], [
+            (QueryStringParseResult.MALFORMED_FIELD, 8, None),
+            (QueryStringParseResult.MALFORMED_FIELD, 14 + len(self.STATE), None),
+        ])
+
+        result = QueryStringManager.try_parse_base64_query_string(f"?{self.STATE}&q=bm90IGpzb24=", lenient=True)
+        self.assertEqual(result.data, {"state": {"rows": [1, 2, 3]}})
+        self.assertEqual(result.errors[0][:3], (QueryStringParseResult.INVALID_BASE64, 2 + len(self.STATE), "q"))
+
+        # A field with a list format is skipped whole
+        schema = QueryStringSchema({"id": int})
+        result = QueryStringManager.try_parse_query_string("?id=1,x&id=3", schema=schema, list_format="comma", lenient=True)
+        self.assertEqual(result.data, {"id": 3})
+        self.assertEqual(result.errors[0][:3], (QueryStringParseResult.INVALID_VALUE, 1, "id"))
+
+
+    def test_schema_errors(self):
+        """
+        Unknown fields and values that are invalid for their type should have their own error codes
+        """
+
+        schema = QueryStringSchema({"page": int})
+        result = QueryStringManager.try_parse("?page=1&utm_source=x&page=two", schema=schema, lenient=True)
+
+        self.assertEqual(result.data, {"page": 1})
+        self.assertEqual([error[:3] for error in result.errors], [
+            (QueryStringParseResult.UNKNOWN_FIELD, 8, "utm_source"),
+            (QueryStringParseResult.INVALID_VALUE, 21, "page"),
+        ])
+
+
+    def test_limits(self):
+        """
+        Limits on the query string as a whole should fail it in either mode, and limits on a field should only
+        skip the field in lenient mode
+        """
+
+        QueryStringManager.set_limits(max_length=10)
+        result = QueryStringManager.try_parse("?page=1&sort=name", lenient=True)
+        self.assertIsNone(result.data)
+        self.assertEqual((result.error, result.offset), (QueryStringParseResult.LIMIT_EXCEEDED, 0))
+
+        QueryStringManager.set_limits(max_digits=5)
+        result = QueryStringManager.try_parse("?page=1&id=123456", lenient=True)
+        self.assertEqual(result.data, {"page": 1})
+        self.assertEqual(result.errors[0][:3], (QueryStringParseResult.LIMIT_EXCEEDED, 8, "id"))
+
+
+    def test_deeply_nested_values(self):
+        """
+        Values nested deeper than the recursion limit should be invalid values, not raise a RecursionError
+        """
+
+        for value in [base64.urlsafe_b64encode(b"[" * 100000).decode(), 
+            QueryStringManager.BINARY_PREFIX + base64.urlsafe_b64encode(b"\x00" + b"A" * 100000).decode().rstrip("=")]:
+            result = QueryStringManager.try_parse_base64_query_string("q=" + value)
+            self.assertEqual(result.errors[0][:3], (QueryStringParseResult.INVALID_BASE64, 0, "q"))
+
+            with self.assertRaises(ValueError):
+                QueryStringManager.parse_base64_query_string("q=" + value)
+
+
+    def test_throws_exception_on_invalid_options(self):
+        """
+        Invalid options are not errors in the query string, so they should still raise a ValueError
+        """
+
+        for options in [{"numeric_mode": "int"}, {"list_format": "pipe"}, {"keys": "page"}]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.try_parse("?page=1", **options)
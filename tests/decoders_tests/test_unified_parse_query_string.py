@@ -109,4 +109,48 @@ class TestUnifiedParseQueryString(unittest.TestCase):
         ]
 
         for test_dict in TEST_DICTS_AND_RESULTS:
-            self.assertEqual(test_dict[0], QueryStringManager.parse(test_dict[1]))
\ No newline at end of file
+            self.assertEqual(test_dict[0], QueryStringManager.parse(test_dict[1]))
+
+
+    def test_parse_values_that_resemble_base64(self):
+        """
+        Values that are valid base64 characters but do not decode to JSON should be parsed in standard format
+        """
+
+        TEST_DICTS_AND_RESULTS = [
+            ({"test": "abcd"}, "?test=abcd"),
+            ({"test": 1234}, "?test=1234"),
+            ({"test": "dGVzdA=="}, "?test=dGVzdA=="),
+            ({"test": "eyJrZXkiOiAidmFsdWUifQ"}, "?test=eyJrZXkiOiAidmFsdWUifQ"),
+            ({"test": "dHJ1ZQ", "q": True}, "?test=dHJ1ZQ&q=dHJ1ZQ=="),
+        ]
+
+        for test_dict in TEST_DICTS_AND_RESULTS:
+            self.assertEqual(test_dict[0], QueryStringManager.parse(test_dict[1]))
+
+
+    def test_parse_bytes_query_string(self):
+        """
+        Parse query strings passed as bytes, bytearray or memoryview, with the same result as the equivalent string
+        """
+
+        TEST_QUERY_STRINGS = [
+            "?key%20w/%20sp%27ec%20chars=value%20w/%20spec%20chars!",
+            "?test=-1&test2=hello&test3=false&test4=.14",
+            "?q=eyJrZXkiOiAidmFsdWUiLCAiMSI6ICI1In0=&test2=-3.14",
+            "?q=IkhlbGxvIg==&==dHJ1ZQ==",
+            "?name=%E2%9C%93&raw=✓",
+            "?a=1&==dHéJ1ZQ==&q=eyJrZXkiOiAidmFsdWUi✓LCAiMSI6ICI1In0=&c=~1q1ZKVLJSUKpQ0lF✓QSgKyog11FIxiawE",
+        ]
+
+        for query_string in TEST_QUERY_STRINGS:
+            for convert in [bytes, bytearray, memoryview]:
+                encoded = convert(query_string.encode("UTF-8"))
+                self.assertEqual(QueryStringManager.parse(query_string), QueryStringManager.parse(encoded))
+                self.assertEqual(QueryStringManager.parse_query_string(query_string), QueryStringManager.parse_query_string(encoded))
+
+        self.assertEqual({"q": "Hello", "=": True}, QueryStringManager.parse_base64_query_string(b"?q=IkhlbGxvIg==&==dHJ1ZQ=="))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse(b""))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse_base64_query_string("?q=IkhlbG✓xvIg=="))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse_base64_query_string("?q=IkhlbG✓xvIg==".encode()))
+        self.assertRaises(ValueError, lambda: QueryStringManager.parse(b"?q=test&data"))
@@ -83,3 +83,21 @@ class TestGenerateQueryString(unittest.TestCase):
 
         for test_dict in TEST_DICTS__RULES_AND_RESULTS:
             self.assertEqual(test_dict[2], QueryStringManager.generate_query_string(test_dict[1], test_dict[0]))
+
+
+    def test_list_formats(self):
+        """
+        Lists should be written as a repeated key per element, or as comma separated elements with commas inside
+        values quoted
+        """
+
+        TEST_DICT = {"id": [1, 2, 3], "tag": ("a,b", True), "q": "x,y"}
+
+        self.assertEqual(QueryStringManager.generate_query_string(TEST_DICT), "?id=1&id=2&id=3&tag=a,b&tag=true&q=x,y")
+        self.assertEqual(QueryStringManager.generate_query_string(TEST_DICT, list_format="comma"), "?id=1,2,3&tag=a%2Cb,true&q=x%2Cy")
+        self.assertEqual(QueryStringManager.generate_query_string({"page": 1}, list_format="comma"), "?page=1")
+
+        for test_dict in [{"id": []}, {"id": [1, [2]]}, {"id": [None]}]:
+            self.assertRaises(ValueError, lambda: QueryStringManager.generate_query_string(test_dict))
+
+        self.assertRaises(ValueError, lambda: QueryStringManager.generate_query_string(TEST_DICT, list_format="json"))
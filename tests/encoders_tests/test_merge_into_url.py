@@ -0,0 +1,97 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager
+
+import unittest
+
+class TestMergeIntoUrl(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.merge_into_url()` and :class:`QueryStringManager.replace_params()`
+    """
+
+    STATE = QueryStringManager.generate_base64_query_string({"rows": [1, 2, 3]}, field_name="state")[1:]
+    TEST_URL = f"https://example.com/search?page=1&{STATE}&sort=%6Eame&tags=a&tags=b&odd&page=9#results?page=1"
+
+    def test_merge_into_url(self):
+        """
+        Set fields should replace the first field with their key, new fields should be added at the end, and
+        everything else should be kept exactly
+        """
+
+        url = QueryStringManager.merge_into_url(self.TEST_URL, {"page": 2, "price": Decimal("1.50"), "active": True})
+
+        self.assertEqual(url, f"https://example.com/search?page=2&{self.STATE}&sort=%6Eame&tags=a&tags=b&odd"
+            "&price=1.50&active=true#results?page=1")
+
+        # Keys are matched after they are decoded
+        self.assertEqual(QueryStringManager.merge_into_url("/?sort=%6Eame", {"name": 1, "sort": "id"}),
+            "/?sort=id&name=1")
+
+
+    def test_mixed_formats(self):
+        """
+        Lists and dictionaries should be base64 encoded unless a format is passed, and values should be quoted so
+        they cannot change how the URL is split
+        """
+
+        url = QueryStringManager.merge_into_url("/search", {"filters": {"tags": ["a"]}, "q": "a&b=c #d?", "page": 1})
+
+        self.assertTrue(url.startswith("/search?filters=eyJ0YWdzIjogWyJhIl19&q="))
+        self.assertEqual(QueryStringManager.parse(url[len("/search"):]), {"filters": {"tags": ["a"]}, "q": "a&b=c #d?", "page": 1})
+
+        self.assertEqual(QueryStringManager.merge_into_url("/", {"page": 1}, base64_encoded=True), "/?page=MQ==")
+        self.assertEqual(QueryStringManager.parse(QueryStringManager.merge_into_url("/", {"state": [1] * 50}, compress=True)[1:]),
+            {"state": [1] * 50})
+        self.assertEqual(QueryStringManager.merge_into_url("/", {"path": "/a:b"}, safe_chars=":"), "/?path=%2Fa:b")
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.merge_into_url("/", {"filters": [1]}, base64_encoded=False)
+
+
+    def test_replace_params(self):
+        """
+        Removed fields should be dropped with every repeat of their key, unless they are also set
+        """
+
+        self.assertEqual(QueryStringManager.replace_params(self.TEST_URL, remove=["page", "tags", "missing"]),
+            f"https://example.com/search?{self.STATE}&sort=%6Eame&odd#results?page=1")
+        self.assertEqual(QueryStringManager.replace_params(self.TEST_URL, {"state": 1}, remove=["state", "sort"]),
+            "https://example.com/search?page=1&state=1&tags=a&tags=b&odd&page=9#results?page=1")
+        self.assertEqual(QueryStringManager.replace_params("/?a=1&a=2#top", remove={"a"}), "/#top")
+
+        # Empty fields are kept, unless no other field is left
+        self.assertEqual(QueryStringManager.replace_params("http://x/p?a=1&&b=2#f?g", remove=["a", "b"]), "http://x/p#f?g")
+        self.assertEqual(QueryStringManager.replace_params("http://x/p?a=1&&b=2#f?g", remove=["a"]), "http://x/p?&b=2#f?g")
+
+
+    def test_urls_without_query_strings(self):
+        """
+        A query string should be added before the fragment, and URLs should be returned unchanged if nothing is set
+        """
+
+        for (url, expected) in [
+            ("https://example.com", "https://example.com?a=1"),
+            ("https://example.com/#top", "https://example.com/?a=1#top"),
+            ("https://example.com/?", "https://example.com/?a=1"),
+            ("/path#top?a=2", "/path?a=1#top?a=2"),
+        ]:
+            self.assertEqual(QueryStringManager.merge_into_url(url, {"a": 1}), expected)
+
+        self.assertEqual(QueryStringManager.merge_into_url(self.TEST_URL, {}), self.TEST_URL)
+        self.assertEqual(QueryStringManager.replace_params(self.TEST_URL, remove=["missing"]), self.TEST_URL)
+
+
+    def test_throws_exception_on_invalid_arguments(self):
+        """
+        Invalid URLs, parameters and keys should raise a ValueError
+        """
+
+        for (url, params, remove) in [
+            (b"/?a=1", {"a": 2}, None),
+            ("/?a=1", [("a", 2)], None),
+            ("/?a=1", {1: 2}, None),
+            ("/?a=1", {"a": object()}, None),
+            ("/?a=1", None, "a"),
+            ("/?a=1", None, [1]),
+        ]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.replace_params(url, params, remove)
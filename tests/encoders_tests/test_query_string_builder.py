@@ -0,0 +1,73 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringBuilder
+
+import unittest
+
+class TestQueryStringBuilder(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringBuilder`
+    """
+
+    def test_matches_generators(self):
+        """
+        Fields should be encoded the same as `generate_query_string()` and `generate_base64_query_string()`
+        """
+
+        TEST_PARAMS = {"page": 2, "sort": "created desc", "active": True, "price": Decimal("9.99")}
+
+        self.assertEqual(QueryStringBuilder(TEST_PARAMS).render(), QueryStringManager.generate_query_string(TEST_PARAMS))
+        self.assertEqual(QueryStringBuilder(TEST_PARAMS, "!").render(), QueryStringManager.generate_query_string(TEST_PARAMS, "!"))
+
+        builder = QueryStringBuilder().set("state", {"nested": [1, 2]}).set("raw", "text", base64_encoded=True)
+        self.assertEqual(builder.render(), QueryStringManager.generate_base64_query_string({"nested": [1, 2]}, "state") +
+            "&" + QueryStringManager.generate_base64_query_string("text", "raw")[1:])
+
+
+    def test_from_query_string_keeps_untouched_segments(self):
+        """
+        Fields that are not changed should be rendered exactly as they were passed, in their original positions
+        """
+
+        state = QueryStringManager.generate_base64_query_string({"filters": list(range(20))}, "state", compress=True)
+        query_string = f"{state}&page=2&sort=created%20desc&?tag=a%2Cb"
+
+        builder = QueryStringBuilder.from_query_string(query_string)
+        self.assertEqual(list(builder), ["state", "page", "sort", "tag"])
+        self.assertEqual(builder.render(), query_string.replace("&?", "&"))
+
+        builder.set("page", 3).delete("tag").set("new", False)
+        self.assertEqual(builder.render(), f"{state}&page=3&sort=created%20desc&new=false")
+        self.assertEqual(QueryStringManager.parse(builder.render()),
+            {"state": {"filters": list(range(20))}, "page": 3, "sort": "created desc", "new": False})
+
+
+    def test_get_decodes_like_parse(self):
+        """
+        Getting a field should decode its value the way `parse()` does
+        """
+
+        builder = QueryStringBuilder.from_query_string(b"?q=eyJrZXkiOiAidmFsdWUifQ==&price=3.14&==dHJ1ZQ==")
+
+        self.assertEqual(builder.get("q"), {"key": "value"})
+        self.assertEqual(builder.get("price"), Decimal("3.14"))
+        self.assertEqual(builder.get("="), True)
+        self.assertIsNone(builder.get("missing"))
+        self.assertEqual(builder.get("missing", 1), 1)
+
+
+    def test_empty_and_invalid(self):
+        """
+        An empty builder renders an empty string, and invalid values, keys or query strings raise an error
+        """
+
+        self.assertEqual(QueryStringBuilder().render(), "")
+        self.assertEqual(len(QueryStringBuilder({"a": 1}).delete("a")), 0)
+
+        with self.assertRaises(ValueError):
+            QueryStringBuilder().set("a", [1], base64_encoded=False)
+
+        with self.assertRaises(KeyError):
+            QueryStringBuilder().delete("a")
+
+        with self.assertRaises(ValueError):
+            QueryStringBuilder.from_query_string("?a=1&b")
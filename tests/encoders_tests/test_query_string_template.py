@@ -0,0 +1,67 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, QueryStringTemplate
+
+import unittest
+
+class TestQueryStringTemplate(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringTemplate`
+    """
+
+    def test_matches_generate_query_string(self):
+        """
+        A rendered template should be identical to the query string created by `generate_query_string()`
+        """
+
+        TEST_DICTS_AND_SAFE_CHARS = [
+            ({"page": 3, "per_page": 50, "sort": "created desc", "active": True}, None),
+            ({"key w/ sp'ec chars": "value w/ spec chars!", "float": 3.14, "decimal": Decimal("-1E+5")}, None),
+            ({"a&b": "c=d", "e": "?f", "bool": False, "unicode": "é漢"}, "!"),
+            ({"test": "!!!@@@", "1": 1.5e-7}, "!?@="),
+        ]
+
+        for (test_dict, safe_chars) in TEST_DICTS_AND_SAFE_CHARS:
+            template = QueryStringTemplate(list(test_dict), safe_chars)
+            expected = QueryStringManager.generate_query_string(test_dict, safe_chars)
+
+            self.assertEqual(template.render(test_dict), expected)
+            self.assertEqual(template.render_values(list(test_dict.values())), expected)
+
+
+    def test_renders_keys_in_template_order(self):
+        """
+        Values should be rendered in the order of the template keys, whatever the order of the dictionary
+        """
+
+        template = QueryStringTemplate(["page", "sort"])
+
+        self.assertEqual(template.render({"sort": "asc", "page": 2}), "?page=2&sort=asc")
+        self.assertEqual(template.render({"page": 3, "sort": "desc"}), "?page=3&sort=desc")
+
+
+    def test_invalid_templates_and_values(self):
+        """
+        Invalid keys, missing or extra keys and values of invalid types should raise a ValueError
+        """
+
+        for keys in [[], ["a", "a"]]:
+            with self.assertRaises(ValueError):
+                QueryStringTemplate(keys)
+
+        template = QueryStringTemplate(["page", "sort"])
+        TEST_INVALID_PARAMS = [
+            {"page": 1},
+            {"page": 1, "order": "asc"},
+            {"page": 1, "sort": "asc", "extra": 1},
+            {"page": [1], "sort": "asc"},
+            {"page": None, "sort": "asc"},
+            {"page": 1, "sort": {"nested": 1}},
+            [1, "asc"],
+        ]
+
+        for params in TEST_INVALID_PARAMS:
+            with self.assertRaises(ValueError):
+                template.render(params)
+
+        with self.assertRaises(ValueError):
+            template.render_values([1])
@@ -0,0 +1,53 @@
+from urllib.parse import quote
+from src.QueryStringManager import QueryStringManager
+from src.QueryStringManager.QuoteTable import QuoteTable
+
+import unittest
+
+class TestQuoteTable(unittest.TestCase):
+    """
+        Tests for :class:`QuoteTable` and the unquoting fast paths of :class:`QueryStringManager`
+    """
+
+    def test_matches_urllib_quote(self):
+        """
+        Quoting should give the same result as `urllib.parse.quote()` whether or not the text needs quoting
+        """
+
+        TEST_TEXTS = ["", "page", "a.b-c_d~e", "created desc", "a&b=c", "é漢ü€", "100%", "?x=1;y=2", "\x00\n\x7f"]
+        TEST_SAFE_CHARS = ["", QueryStringManager.URLLIB_SAFE_CHARS, "!", "é!", "&=", "%"]
+
+        for safe_chars in TEST_SAFE_CHARS:
+            table = QuoteTable.get(safe_chars)
+
+            for text in TEST_TEXTS:
+                self.assertEqual(table.quote(text), quote(text, safe=safe_chars))
+                self.assertEqual(table.quote_key(text), quote(text, safe=safe_chars))
+
+            self.assertEqual(table.equals + table.separator, quote("=&", safe=safe_chars))
+
+
+    def test_tables_and_keys_are_shared(self):
+        """
+        Tables should be computed once for each set of safe characters, and quoted keys should be memoized
+        """
+
+        self.assertIs(QuoteTable.get("!"), QuoteTable.get("!"))
+
+        table = QuoteTable("!")
+        table.quote_key("my key")
+        table.quote_key("my key")
+        self.assertEqual(table.quote_key.cache_info().hits, 1)
+
+
+    def test_unquote_fast_paths(self):
+        """
+        Keys and values without escapes should be returned as they are, and escaped ones unquoted
+        """
+
+        self.assertEqual(QueryStringManager._unquote("plain"), "plain")
+        self.assertEqual(QueryStringManager._unquote(b"plain"), "plain")
+        self.assertEqual(QueryStringManager._unquote(b"caf\xc3\xa9"), "café")
+        self.assertEqual(QueryStringManager._unquote("a%20b+c"), "a b+c")
+        self.assertEqual(QueryStringManager._unquote_key(b"a%20b"), "a b")
+        self.assertEqual(QueryStringManager.parse(b"?my%20key=1&my%20key=2&b=%C3%A9"), {"my key": 2, "b": "é"})
@@ -0,0 +1,98 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager
+
+import io, random, tempfile, unittest
+
+class TestWriteQueryString(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.write_query_string()` and :class:`QueryStringManager.write_base64_query_string()`
+    """
+
+    def test_matches_generate_query_string(self):
+        """
+        The bytes written should be the query string `generate_query_string()` creates, whatever the chunk size
+        """
+
+        TEST_DICTS = [
+            ({"page": 2, "sort": "created desc", "active": True, "price": Decimal("9.99")}, {}),
+            ({"key w/ sp'ec chars": "value w/ spec chars!", "unicode": "é漢"}, {"safe_chars": "!"}),
+            ({"id": [1, 2, 3], "tag": ["a,b", "c"], "x": "y"}, {"list_format": "repeat"}),
+            ({"id": [1, 2, 3], "tag": ["a,b", "c"], "x": "y"}, {"list_format": "comma"}),
+            ({f"key_{index}": "value " * index for index in range(50)}, {}),
+        ]
+
+        for (params, options) in TEST_DICTS:
+            expected = QueryStringManager.generate_query_string(params, **options).encode("ascii")
+
+            for chunk_size in [1, 7, 65536]:
+                out = bytearray()
+                self.assertEqual(QueryStringManager.write_query_string(params, out, chunk_size=chunk_size, **options),
+                    len(expected))
+                self.assertEqual(bytes(out), expected)
+
+
+    def test_matches_generate_base64_query_string(self):
+        """
+        The bytes written should be the query string `generate_base64_query_string()` creates, compressed or not
+        """
+
+        rng = random.Random(0)
+        TEST_VALUES = [
+            1,
+            {"key": "value", "price": Decimal("1.50")},
+            [rng.randint(0, 10 ** 6) for _ in range(5000)],
+            {"rows": [{"id": index, "tags": ["a", "b"] * index} for index in range(1000)], "total": 1000},
+            {"text": "".join(rng.choice("abcdé漢 ") for _ in range(20000))},
+        ]
+
+        for value in TEST_VALUES:
+            for compress in [False, True]:
+                expected = QueryStringManager.generate_base64_query_string(value, "state", compress).encode("ascii")
+
+                for chunk_size in [1, 4, 1000, 65536]:
+                    out = io.BytesIO()
+                    self.assertEqual(QueryStringManager.write_base64_query_string(value, out, "state", compress,
+                        chunk_size), len(expected))
+                    self.assertEqual(out.getvalue(), expected)
+
+
+    def test_writes_to_files(self):
+        """
+        Query strings should be appended to binary and text files
+        """
+
+        with tempfile.TemporaryFile() as binary_file:
+            QueryStringManager.write_query_string({"a": 1}, binary_file)
+            QueryStringManager.write_base64_query_string({"b": 2}, binary_file)
+            binary_file.seek(0)
+
+            self.assertEqual(binary_file.read(), b"?a=1?q=eyJiIjogMn0=")
+
+        text_file = io.StringIO()
+        QueryStringManager.write_query_string({"a": "é"}, text_file)
+        self.assertEqual(text_file.getvalue(), "?a=%C3%A9")
+
+
+    def test_invalid_arguments(self):
+        """
+        Invalid values, options or outputs should raise a ValueError before anything is written
+        """
+
+        out = bytearray()
+
+        for (writer, params, options) in [
+            (QueryStringManager.write_query_string, {"a": {"b": 1}}, {}),
+            (QueryStringManager.write_query_string, {}, {}),
+            (QueryStringManager.write_query_string, {"a": 1}, {"list_format": "pipe"}),
+            (QueryStringManager.write_query_string, {"a": 1}, {"chunk_size": 0}),
+            (QueryStringManager.write_base64_query_string, None, {}),
+            (QueryStringManager.write_base64_query_string, {"a": 1}, {"chunk_size": True}),
+        ]:
+            with self.assertRaises(ValueError):
+                writer(params, out, **options)
+
+        self.assertEqual(out, bytearray())
+
+        for invalid_out in [b"", [], "out"]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.write_query_string({"a": 1}, invalid_out)
@@ -0,0 +1,135 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager
+
+import unittest
+
+class TestCanonicalize(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager.canonicalize()` and :class:`QueryStringManager.fingerprint()`
+    """
+
+    def test_equivalent_query_strings(self):
+        """
+        Query strings that parse to the same values should have the same canonical form and fingerprint
+        """
+
+        TEST_QUERY_STRINGS = [
+            "?sort=name&page=2&active=True&path=%2fdocs%2fa%20b&price=1.50&state=eyJiIjogWzEsIDJdLCAiYSI6ICJ4In0=",
+            "?active=true&path=/docs/a%20b&page=2&price=1.50&sort=%6Eame&state=eyJhIjogIngiLCAiYiI6IFsxLCAyXX0=",
+            b"?page=002&state=~1q1ZKVLJSUKpQ0lFQSgKyog11FIxiawE&price=1.50&sort=name&active=TRUE&path=%2Fdocs%2Fa%20b",
+            "?page=1&page=2&state=eyJhIjoieCIsImIiOlsxLDJdfQ===&price=MS41MA==&sort=name&active=true&path=/docs/a%20b",
+        ]
+
+        canonical = "?active=true&page=2&path=/docs/a%20b&price=1.5&sort=name&state=eyJhIjoieCIsImIiOlsxLDJdfQ=="
+
+        for query_string in TEST_QUERY_STRINGS:
+            self.assertEqual(QueryStringManager.canonicalize(query_string), canonical)
+            self.assertEqual(QueryStringManager.fingerprint(query_string), QueryStringManager.fingerprint(canonical))
+
+        self.assertNotEqual(QueryStringManager.fingerprint("?page=2"), QueryStringManager.fingerprint("?page=3"))
+        self.assertNotEqual(QueryStringManager.fingerprint("?price=1"), QueryStringManager.fingerprint("?price=1.0"))
+        self.assertEqual(len(QueryStringManager.fingerprint("?page=2")), 32)
+        self.assertEqual(len(QueryStringManager.fingerprint("?page=2", digest_size=8)), 16)
+
+
+    def test_equal_decimals(self):
+        """
+        Decimals that are equal should have the same canonical form, in standard format and in base64 encoded
+        values, while integral decimals stay distinct from integers
+        """
+
+        TEST_DECIMALS = [
+            (["?x=1.5", "?x=1.50", "?x=01.500", "?x=MS41MA=="], "?x=1.5"),
+            (["?x=1.0", "?x=1.00", "?x=MS4wMDA="], "?x=1.0"),
+            (["?x=0.0", "?x=-0.00", "?x=.0"], "?x=0.0"),
+            (["?x=-100.0", "?x=-100.000", "?x=LTFFKzI="], "?x=-100.0"),
+            (["?x=WzEuNSwgMUUrMl0=", "?x=WzEuNTAsIDEwMC4wMF0="], "?x=WzEuNSwxMDAuMF0="),
+        ]
+
+        for (query_strings, canonical) in TEST_DECIMALS:
+            for query_string in query_strings:
+                self.assertEqual(QueryStringManager.canonicalize(query_string), canonical)
+                self.assertEqual(QueryStringManager.parse(canonical), QueryStringManager.parse(query_string))
+
+        self.assertEqual(QueryStringManager.canonicalize("?x=1"), "?x=1")
+        self.assertEqual(QueryStringManager.canonicalize("?x=1.23456789012345678901234567890"), 
+            "?x=1.2345678901234567890123456789")
+
+
+    def test_canonical_form_parses_to_the_same_values(self):
+        """
+        Values that would be read as another type in standard format, and keys and values holding the characters
+        that split a query string, should be encoded so the canonical form parses to the same values
+        """
+
+        TEST_QUERY_STRINGS = [
+            "?flag=InRydWUi&number=IjEi&empty=IiI=&none=bnVsbA==&exponent=MUU1",
+            "?a%26b=c%3Dd&%3F=%3Fx&%3D=eA==&comma=a%2Cb&base64_text=MQ%3D%3D&text=dHJ1",
+            "?unicode=%C3%A9%E6%BC%A2&list=WzEsIFsyXV0=",
+        ]
+
+        for query_string in TEST_QUERY_STRINGS:
+            canonical = QueryStringManager.canonicalize(query_string)
+            parsed = QueryStringManager.parse(query_string)
+
+            self.assertEqual(QueryStringManager.parse(canonical), parsed)
+            self.assertEqual({key: type(value) for (key, value) in QueryStringManager.parse(canonical).items()},
+                {key: type(value) for (key, value) in parsed.items()})
+            self.assertEqual(QueryStringManager.canonicalize(canonical), canonical)
+
+        self.assertEqual(QueryStringManager.canonicalize("?exponent=MUU1"), "?exponent=100000.0")
+        self.assertEqual(QueryStringManager.canonicalize("?exponent=MUU0MA=="), "?exponent=MUUrNDA=")
+        self.assertEqual(QueryStringManager.parse("?exponent=MUUrNDA="), {"exponent": Decimal("1E+40")})
+
+
+    def test_list_formats(self):
+        """
+        With a list format repeated keys should be kept, and lists written in any format should have the same
+        canonical form
+        """
+
+        self.assertEqual(QueryStringManager.canonicalize("?id=1&id=2"), "?id=2")
+
+        for (query_string, list_format) in [
+            ("?id=1&id=2&tag=a", "repeat"),
+            ("?tag=a&id=1,2", "comma"),
+            ("?id=WzEsIDJd&tag=a", "repeat"),
+        ]:
+            self.assertEqual(QueryStringManager.canonicalize(query_string, list_format=list_format), "?id=1&id=2&tag=a")
+
+        # A single element list is not a repeated key
+        self.assertEqual(QueryStringManager.canonicalize("?id=WzFd", list_format="repeat"), "?id=WzFd")
+
+
+    def test_cached(self):
+        """
+        Canonical forms and fingerprints should be cached with parsed query strings
+        """
+
+        QueryStringManager.enable_cache()
+
+        try:
+            for _ in range(2):
+                QueryStringManager.canonicalize("?b=2&a=1")
+                QueryStringManager.fingerprint("?b=2&a=1")
+
+            stats = QueryStringManager.cache_stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+        finally:
+            QueryStringManager.disable_cache()
+
+
+    def test_throws_exception_on_invalid_arguments(self):
+        """
+        Malformatted query strings and invalid options should raise a ValueError
+        """
+
+        for (method, query_string, options) in [
+            (QueryStringManager.canonicalize, "?a", {}),
+            (QueryStringManager.canonicalize, "?a=1", {"list_format": "pipe"}),
+            (QueryStringManager.fingerprint, "?a", {}),
+            (QueryStringManager.fingerprint, "?a=1", {"digest_size": 0}),
+            (QueryStringManager.fingerprint, "?a=1", {"digest_size": 65}),
+        ]:
+            with self.assertRaises(ValueError):
+                method(query_string, **options)
@@ -0,0 +1,58 @@
+from src.QueryStringManager import QueryStringManager
+
+import unittest
+
+class TestIsBase64JsonCandidate(unittest.TestCase):
+    """
+        Tests for :class:`QueryStringManager._is_base64_json_candidate()`
+    """
+
+    def test_standard_values_are_not_candidates(self):
+        """
+        Values in standard format should be rejected without attempting a base64 decode
+        """
+
+        TEST_VALUES = [
+            "",
+            "a",
+            "usb",
+            "true",
+            "false",
+            "1234",
+            "3.14",
+            "-1",
+            "value%20w/%20spec%20chars!",
+        ]
+
+        for value in TEST_VALUES:
+            self.assertFalse(QueryStringManager._is_base64_json_candidate(value))
+
+
+    def test_base64_json_values_are_candidates(self):
+        """
+        Base64 encoded JSON values should be candidates
+        """
+
+        TEST_VALUES = [
+            "eyJrZXkiOiAidmFsdWUifQ==",
+            "WzEsIDIsIDNd",
+            "dHJ1ZQ==",
+            "My4xNA==",
+            "IkhlbGxvIg==",
+        ]
+
+        for value in TEST_VALUES:
+            self.assertTrue(QueryStringManager._is_base64_json_candidate(value))
+
+
+    def test_rejected_values_fail_to_decode(self):
+        """
+        A rejected value must never be decodable as base64 encoded JSON, so `parse()` returns the same result
+        as attempting a decode
+        """
+
+        TEST_VALUES = ["abcde", "ab", "dHJ1ZQ", "ab=c", "!!!!", "dGVzdA==", "eyJrZXkiOiAidmFsdWUifQ"]
+
+        for value in TEST_VALUES:
+            if not QueryStringManager._is_base64_json_candidate(value):
+                self.assertRaises(ValueError, lambda: QueryStringManager.parse_base64_query_string(f"?q={value}"))
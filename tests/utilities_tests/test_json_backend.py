@@ -0,0 +1,149 @@
+from decimal import Decimal
+from src.QueryStringManager import QueryStringManager, JsonBackend
+
+import json, unittest
+
+class TestJsonBackend(unittest.TestCase):
+    """
+        Tests for :class:`JsonBackend` and :class:`QueryStringManager.set_json_backend()`
+    """
+
+    TEST_PAYLOAD = {
+        "exact": Decimal("0.1000000000000000055511151231257827"), "large": Decimal("1E+400"), "integral": Decimal("5"),
+        "trailing": Decimal("-12.50"), "nested": [{"float": 0.1, "int": 2, "none": None, "str": "1.5"}],
+    }
+
+    def tearDown(self):
+        QueryStringManager.set_json_backend()
+
+
+    def test_decimals_round_trip_exactly(self):
+        """
+        Decimal values should be encoded and decoded with their exact digits by every installed backend
+        """
+
+        EXPECTED = {
+            "exact": Decimal("0.1000000000000000055511151231257827"), "large": Decimal("1E+400"),
+            "integral": Decimal("5.0"), "trailing": Decimal("-12.50"),
+            "nested": [{"float": Decimal("0.1"), "int": 2, "none": None, "str": "1.5"}],
+        }
+
+        for name in JsonBackend.available():
+            QueryStringManager.set_json_backend(name)
+            query_string = QueryStringManager.generate_base64_query_string(self.TEST_PAYLOAD)
+            result = QueryStringManager.parse_base64_query_string(query_string)["q"]
+
+            self.assertEqual(result, EXPECTED)
+            self.assertEqual(str(result["trailing"]), "-12.50")
+            self.assertEqual(str(result["integral"]), "5.0")
+
+
+    def test_backends_decode_the_same(self):
+        """
+        Every installed backend should decode a document to the same values in each numeric mode
+        """
+
+        data = json.dumps({"a": [1, 2.5, "x", True, None, {"b": -1e-3}], "big": 2 ** 70, "nan": float("nan")}).encode()
+
+        for parse_float in (Decimal, float, str):
+            expected = json.loads(data, parse_float=parse_float)
+
+            for name in JsonBackend.available():
+                result = JsonBackend.get(name).loads(data, parse_float)
+                self.assertEqual(result["a"], expected["a"])
+                self.assertEqual(result["big"], expected["big"])
+
+
+    def test_backends_decode_large_integers_exactly(self):
+        """
+        Integers over 64 bits should be decoded exactly, and documents without fractional numbers should decode
+        to the same values in every numeric mode
+        """
+
+        TEST_DOCUMENTS = [
+            [2 ** 70], [-2 ** 63 - 1], [2 ** 64], [2 ** 63 - 1, -2 ** 63], {"a": [1, "1.5", "2e3", True]}, 
+            {"a": [2 ** 100, 0.5]}, [1e20, 1.5e-7],
+        ]
+
+        for document in TEST_DOCUMENTS:
+            data = json.dumps(document).encode()
+
+            for parse_float in (Decimal, float, str):
+                expected = json.loads(data, parse_float=parse_float)
+
+                for name in JsonBackend.available():
+                    result = JsonBackend.get(name).loads(data, parse_float)
+                    self.assertEqual(repr(result), repr(expected))
+
+
+    def test_default_encoder_matches_stdlib(self):
+        """
+        Query strings generated with the automatically chosen backend should not depend on what is installed
+        """
+
+        TEST_PARAMS = {"nested_dict": {"float": .1}, "list": [{"int": 1, "bool": True}], "decimal": Decimal("3.14")}
+
+        self.assertTrue(JsonBackend.best(matches_stdlib=True).matches_stdlib)
+        self.assertEqual(QueryStringManager.json_backends()["encoder"], JsonBackend.best(matches_stdlib=True).name)
+        self.assertEqual(QueryStringManager.generate_base64_query_string(TEST_PARAMS),
+            "?q=eyJuZXN0ZWRfZGljdCI6IHsiZmxvYXQiOiAwLjF9LCAibGlzdCI6IFt7ImludCI6IDEsICJib29sIjogdHJ1ZX1dLCAiZGVjaW1hbCI6IDMuMTR9")
+
+
+    def test_iterdumps_matches_dumps(self):
+        """
+        The parts `iterdumps()` yields should join to the bytes `dumps()` returns, for small batches and large
+        nested values
+        """
+
+        TEST_VALUES = [
+            self.TEST_PAYLOAD, [], {}, [[]], {"a": {}}, 1, "string", Decimal("1.50"), {1: [1, 2, 3]},
+            {"rows": [{"id": i, "name": "é" * i, "values": list(range(i))} for i in range(40)], "empty": []},
+            [list(range(30)), {str(i): [i] * 10 for i in range(30)}, (1, 2)],
+        ]
+
+        for name in JsonBackend.available():
+            backend = JsonBackend.get(name)
+
+            for value in TEST_VALUES:
+                for batch_size in (1, 2, 7, 256):
+                    self.assertEqual(b"".join(backend.iterdumps(value, batch_size)), backend.dumps(value))
+
+
+    def test_register_backend(self):
+        """
+        A registered backend should be preferred over the backends registered before it, and be selectable by name
+        """
+
+        calls = []
+
+        def create_backend():
+            def loads(data, parse_float):
+                calls.append(data)
+                return json.loads(data, parse_float=parse_float)
+
+            return JsonBackend("test", lambda value, default: json.dumps(value, default=default).encode(), loads,
+                matches_stdlib=True)
+
+        def create_missing_backend():
+            raise ImportError("not installed")
+
+        try:
+            JsonBackend.register("test", create_backend)
+            JsonBackend.register("missing", create_missing_backend)
+
+            self.assertEqual(JsonBackend.available()[0], "test")
+            self.assertEqual(JsonBackend.best().name, "test")
+
+            QueryStringManager.set_json_backend("test")
+            self.assertEqual(QueryStringManager.parse_base64_query_string("?q=MS41"), {"q": Decimal("1.5")})
+            self.assertEqual(calls, [b"1.5"])
+
+            with self.assertRaises(ValueError):
+                QueryStringManager.set_json_backend("missing")
+
+            with self.assertRaises(ValueError):
+                QueryStringManager.set_json_backend("unknown")
+        finally:
+            for name in ("test", "missing"):
+                JsonBackend._factories.pop(name, None)
+                JsonBackend._backends.pop(name, None)
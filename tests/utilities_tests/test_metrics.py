@@ -0,0 +1,135 @@
+from src.QueryStringManager import QueryStringManager, QueryStringMetrics
+
+import unittest
+
+class TestMetrics(unittest.TestCase):
+    """
+        Tests for the metrics enabled with :class:`QueryStringManager.enable_metrics()`
+    """
+
+    def setUp(self):
+        self.metrics = QueryStringManager.enable_metrics()
+
+
+    def tearDown(self):
+        QueryStringManager.disable_metrics()
+
+
+    def test_disabled_by_default(self):
+        """
+        Nothing should be recorded while metrics are disabled
+        """
+
+        QueryStringManager.disable_metrics()
+        QueryStringManager.parse("?a=1")
+
+        self.assertIsNone(QueryStringManager.metrics_stats())
+        self.assertEqual(self.metrics.stats()["methods"], {})
+
+
+    def test_counts_calls_errors_and_sizes(self):
+        """
+        Calls, errors by reason, latencies and the sizes of query strings should be recorded for each method
+        """
+
+        QueryStringManager.parse("?a=1&b=2")
+        QueryStringManager.parse(b"?a=1")
+        QueryStringManager.generate_query_string({"a": 1})
+
+        for query_string in ["?a=1&b", "?a=1&b"]:
+            with self.assertRaises(ValueError):
+                QueryStringManager.parse(query_string)
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.parse("?a=1", numeric_mode="invalid")
+
+        QueryStringManager.parse_many(["?a=1", "?b"], skip_invalid=True)
+
+        stats = QueryStringManager.metrics_stats()
+        parse = stats["methods"]["parse"]
+
+        self.assertEqual(parse["calls"], 5)
+        self.assertEqual(parse["errors"], {"malformatted": 2, "invalid": 1})
+        self.assertEqual(parse["latency_seconds"]["count"], 5)
+        self.assertEqual(parse["size_bytes"]["count"], 5)
+        self.assertEqual(parse["size_bytes"]["sum"], 8 + 4 + 6 + 6 + 4)
+        self.assertEqual(parse["size_bytes"]["buckets"][16], 5)
+
+        self.assertEqual(stats["methods"]["generate_query_string"]["size_bytes"]["sum"], 4)
+        self.assertEqual(stats["methods"]["parse_many"]["errors"], {"malformatted": 1})
+
+
+    def test_nested_calls_are_recorded_once(self):
+        """
+        Instrumented methods called by another instrumented method should not be recorded
+        """
+
+        QueryStringManager.merge_into_url("/search?page=1", {"filters": {"tags": ["a"]}, "page": 2})
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.merge_into_url("/search", {"filters": None})
+
+        QueryStringManager.generate_base64_query_string([1])
+
+        methods = QueryStringManager.metrics_stats()["methods"]
+
+        self.assertEqual(methods["merge_into_url"]["calls"], 2)
+        self.assertEqual(methods["merge_into_url"]["latency_seconds"]["count"], 2)
+        self.assertEqual(sum(methods["merge_into_url"]["errors"].values()), 1)
+        self.assertEqual(methods["generate_base64_query_string"]["calls"], 1)
+
+
+    def test_counts_base64_fallbacks_and_payloads(self):
+        """
+        Values that looked like base64 but were decoded in standard format, and the sizes of decoded base64
+        payloads, should be recorded
+        """
+
+        # "dHJ1" decodes to "tru", which is not JSON
+        self.assertEqual(QueryStringManager.parse("?word=dHJ1"), {"word": "dHJ1"})
+        QueryStringManager.parse(QueryStringManager.generate_base64_query_string({"key": "value"}))
+
+        stats = self.metrics.stats()
+        self.assertEqual(stats["base64_fallbacks"], 1)
+        self.assertEqual(stats["base64_payload_bytes"]["count"], 1)
+        self.assertEqual(stats["base64_payload_bytes"]["sum"], len('{"key": "value"}'))
+
+
+    def test_prometheus_export(self):
+        """
+        The Prometheus export should hold every metric with cumulative histogram buckets
+        """
+
+        QueryStringManager.parse("?a=1")
+
+        with self.assertRaises(ValueError):
+            QueryStringManager.parse("?a")
+
+        lines = self.metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE query_string_manager_calls_total counter", lines)
+        self.assertIn('query_string_manager_calls_total{method="parse"} 2', lines)
+        self.assertIn('query_string_manager_errors_total{method="parse",reason="malformatted"} 1', lines)
+        self.assertIn("# TYPE query_string_manager_latency_seconds histogram", lines)
+        self.assertIn('query_string_manager_latency_seconds_bucket{method="parse",le="+Inf"} 2', lines)
+        self.assertIn('query_string_manager_latency_seconds_count{method="parse"} 2', lines)
+        self.assertIn('query_string_manager_size_bytes_bucket{method="parse",le="16"} 2', lines)
+        self.assertIn("query_string_manager_base64_fallbacks_total 0", lines)
+        self.assertIn('query_string_manager_base64_payload_bytes_bucket{le="+Inf"} 0', lines)
+
+
+    def test_histogram_buckets(self):
+        """
+        Values should be counted in the first bucket whose upper bound they do not exceed
+        """
+
+        metrics = QueryStringMetrics()
+
+        for size in [16, 17, 2 ** 30]:
+            metrics.observe_payload(size)
+
+        payload = metrics.stats()["base64_payload_bytes"]
+        self.assertEqual(payload["buckets"][16], 1)
+        self.assertEqual(payload["buckets"][64], 2)
+        self.assertEqual(payload["buckets"][1048576], 2)
+        self.assertEqual(payload["count"], 3)